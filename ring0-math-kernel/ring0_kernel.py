@@ -128,6 +128,19 @@ class RingBus:
 
     def tx(self, source: str, target: str, method: str, **kwargs) -> Any:
         """TX: Transmit a message and wait for response (RPC style)"""
+        response_queue = self.tx_async(source, target, method, **kwargs)
+        
+        # Wait for response (timeout 5s)
+        try:
+            result = response_queue.get(timeout=5.0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        except queue.Empty:
+            raise TimeoutError(f"Ring {target} did not respond to {method}")
+
+    def tx_async(self, source: str, target: str, method: str, **kwargs) -> queue.Queue:
+        """TX without waiting: returns the queue the response (or exception) will arrive on"""
         if target not in self.queues:
             raise ValueError(f"Target ring '{target}' not registered")
             
@@ -148,15 +161,7 @@ class RingBus:
         }
         
         self.queues[target].put(envelope)
-        
-        # Wait for response (timeout 5s)
-        try:
-            result = response_queue.get(timeout=5.0)
-            if isinstance(result, Exception):
-                raise result
-            return result
-        except queue.Empty:
-            raise TimeoutError(f"Ring {target} did not respond to {method}")
+        return response_queue
 
     def _ring_listener(self, ring_name: str):
         """Background thread processing messages for a ring"""
@@ -6,9 +6,19 @@ COMMAND DISPATCH FULLY IMPLEMENTED
 COMPLETENESS: 100% (all opcodes working, command dispatch wired to kernel)
 """
 
+import hashlib
+import io
+import os
+import pickle
+import queue
+import struct
+import time
+import zlib
 from enum import IntEnum
-from dataclasses import dataclass
-from typing import List, Optional
+from collections import defaultdict
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Dict, Tuple, Callable
 from ring0_kernel import ReflectologyKernel, OmegaState, bus
 
 class OpCode(IntEnum):
@@ -18,7 +28,8 @@ class OpCode(IntEnum):
     AND = 0x30; OR = 0x31; XOR = 0x32; NOT = 0x33
     EQ = 0x40; NE = 0x41; LT = 0x42; GT = 0x43; LE = 0x44; GE = 0x45
     JMP = 0x50; JZ = 0x51; JNZ = 0x52; CALL = 0x53; RET = 0x54
-    LOAD = 0x60; STORE = 0x61; LOADG = 0x62; STOREG = 0x63
+    LOAD = 0x60; STORE = 0x61; LOADG = 0x62; STOREG = 0x63; LOADL = 0x64; STOREL = 0x65  # *L: current call frame
+    MOV = 0x70; LOADI = 0x71; SPILL = 0x72; RELOAD = 0x73  # register machine only
     COMMAND = 0xA0; AXIOM = 0xA0; ANALYSIS = 0xB0  # AXIOM is alias for COMMAND
 
 @dataclass
@@ -26,32 +37,274 @@ class Instruction:
     opcode: OpCode
     arg: int = 0
 
+NO_REG = -1
+
+@dataclass
+class RegInstruction:
+    """Three-address instruction for MadladRegisterVM: dst <- a op (b | imm)"""
+    opcode: OpCode
+    dst: int = 0
+    a: int = NO_REG
+    b: int = NO_REG
+    imm: int = 0
+
+# Binary ops shared by the register VM; the right operand is register b, or imm when b is NO_REG
+REG_BINOPS = {
+    OpCode.ADD: lambda a, b: a + b, OpCode.SUB: lambda a, b: a - b, OpCode.MUL: lambda a, b: a * b,
+    OpCode.DIV: lambda a, b: a // b if b != 0 else 0, OpCode.MOD: lambda a, b: a % b if b != 0 else 0,
+    OpCode.AND: lambda a, b: a & b, OpCode.OR: lambda a, b: a | b, OpCode.XOR: lambda a, b: a ^ b,
+    OpCode.EQ: lambda a, b: int(a == b), OpCode.NE: lambda a, b: int(a != b), OpCode.LT: lambda a, b: int(a < b),
+    OpCode.GT: lambda a, b: int(a > b), OpCode.LE: lambda a, b: int(a <= b), OpCode.GE: lambda a, b: int(a >= b),
+}
+
+# .mbc bytecode container: header | constant pool | packed code | symbol table.
+# header = magic, version, backend, n_consts, n_code, n_symbols, sha256(rest of file)
+MBC_MAGIC = b"MBC\x00"
+MBC_VERSION = 1
+MBC_HEADER = struct.Struct("<4sHHIII32s")
+MBC_BACKENDS = ("stack", "register")
+MBC_STACK_RECORD = struct.Struct("<BBxxi")      # opcode, flags, arg
+MBC_REGISTER_RECORD = struct.Struct("<BBhhhi")  # opcode, flags, dst, a, b, imm
+MBC_CONST_FLAG = 0x01                           # arg/imm is a constant-pool index
+MBC_SYMBOL_KINDS = ("function", "global")
+_INT32 = (-2**31, 2**31 - 1)
+_OPCODES = {int(op): op for op in OpCode}
+
+@dataclass
+class BytecodeImage:
+    """A loaded .mbc file"""
+    program: List
+    symbols: Dict[str, Dict[str, int]]
+    backend: str
+    content_hash: str
+
+def write_mbc(path: str, program: List, symbols: Optional[Dict[str, Dict[str, int]]] = None,
+              backend: str = "stack") -> str:
+    """Serialize a compiled program to a .mbc file; returns its content hash"""
+    consts: List[int] = []
+    const_index: Dict[int, int] = {}
+    def operand(v: int) -> Tuple[int, int]:
+        if _INT32[0] <= v <= _INT32[1]: return 0, v
+        if v not in const_index: const_index[v] = len(consts); consts.append(v)
+        return MBC_CONST_FLAG, const_index[v]
+    code = bytearray()
+    if backend == "register":
+        for ins in program:
+            flags, imm = operand(int(ins.imm))
+            code += MBC_REGISTER_RECORD.pack(int(ins.opcode), flags, ins.dst, ins.a, ins.b, imm)
+    else:
+        for ins in program:
+            flags, arg = operand(int(ins.arg))
+            code += MBC_STACK_RECORD.pack(int(ins.opcode), flags, arg)
+    pool = bytearray()
+    for v in consts:
+        raw = v.to_bytes((v.bit_length() + 8) // 8, "little", signed=True)
+        pool += struct.pack("<I", len(raw)) + raw
+    table = bytearray()
+    entries = [(kind, name, value) for kind in MBC_SYMBOL_KINDS
+               for name, value in ((symbols or {}).get(kind + "s") or {}).items()]
+    for kind, name, value in entries:
+        raw = name.encode()
+        table += struct.pack("<BiH", MBC_SYMBOL_KINDS.index(kind), value, len(raw)) + raw
+    body = bytes(pool + code + table)
+    digest = hashlib.sha256(body).digest()
+    header = MBC_HEADER.pack(MBC_MAGIC, MBC_VERSION, MBC_BACKENDS.index(backend), len(consts), len(program),
+                             len(entries), digest)
+    with open(path, "wb") as f: f.write(header + body)
+    return digest.hex()
+
+def read_mbc(path: str) -> BytecodeImage:
+    """Load a .mbc file without touching the compiler front end"""
+    with open(path, "rb") as f: data = f.read()
+    view = memoryview(data)
+    magic, version, backend, n_consts, n_code, n_symbols, digest = MBC_HEADER.unpack_from(view, 0)
+    if magic != MBC_MAGIC: raise ValueError(f"{path}: not a MADLAD bytecode file")
+    if version != MBC_VERSION: raise ValueError(f"{path}: unsupported .mbc version {version}")
+    pos = MBC_HEADER.size
+    if hashlib.sha256(view[pos:]).digest() != digest: raise ValueError(f"{path}: content hash mismatch")
+    consts = []
+    for _ in range(n_consts):
+        (length,) = struct.unpack_from("<I", view, pos); pos += 4
+        consts.append(int.from_bytes(view[pos:pos + length], "little", signed=True)); pos += length
+    opcodes = _OPCODES
+    if MBC_BACKENDS[backend] == "register":
+        end = pos + n_code * MBC_REGISTER_RECORD.size
+        program = [RegInstruction(opcodes[op], dst, a, b, consts[imm] if flags & MBC_CONST_FLAG else imm)
+                   for op, flags, dst, a, b, imm in MBC_REGISTER_RECORD.iter_unpack(view[pos:end])]
+    else:
+        end = pos + n_code * MBC_STACK_RECORD.size
+        program = [Instruction(opcodes[op], consts[arg] if flags & MBC_CONST_FLAG else arg)
+                   for op, flags, arg in MBC_STACK_RECORD.iter_unpack(view[pos:end])]
+    pos = end
+    symbols = {kind + "s": {} for kind in MBC_SYMBOL_KINDS}
+    for _ in range(n_symbols):
+        kind, value, length = struct.unpack_from("<BiH", view, pos); pos += 7
+        symbols[MBC_SYMBOL_KINDS[kind] + "s"][bytes(view[pos:pos + length]).decode()] = value; pos += length
+    return BytecodeImage(program, symbols, MBC_BACKENDS[backend], digest.hex())
+
+# Snapshot format: one or more records, each MAGIC + <version, kind, payload_len> + zlib(payload).
+# A full record replaces all state; incremental records only carry pages dirtied since the last record.
+# Omega is pickled so sets, tuples, complex values and non-str keys survive: restore only trusted files.
+SNAPSHOT_MAGIC = b"MVMS"
+SNAPSHOT_VERSION = 3
+SNAPSHOT_FULL, SNAPSHOT_INCREMENTAL = 0, 1
+PAGE_SHIFT = 8  # 256-word memory pages
+PAGE_SIZE = 1 << PAGE_SHIFT
+BUS_TIMEOUT = 5.0  # seconds, matches RingBus.tx
+
+def _write_varint(buf: io.BytesIO, value: int):
+    """Zigzag varint: small magnitudes take one byte, big ints stay exact"""
+    z = (value << 1) if value >= 0 else ((-value << 1) - 1)
+    while z >= 0x80:
+        buf.write(bytes((z & 0x7F | 0x80,))); z >>= 7
+    buf.write(bytes((z,)))
+
+def _read_varint(view: memoryview, pos: int) -> Tuple[int, int]:
+    z, shift = 0, 0
+    while True:
+        b = view[pos]; pos += 1
+        z |= (b & 0x7F) << shift; shift += 7
+        if b < 0x80: break
+    return (z >> 1) if not z & 1 else -((z + 1) >> 1), pos
+
+@dataclass
+class VMProfile:
+    """Per-opcode, per-pc and per-target counters collected by a profiled execute()"""
+    op_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    op_time_ns: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    pc_counts: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    pc_time_ns: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    target_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    target_time_ns: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    folded: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    instructions: int = 0
+    total_ns: int = 0
+    
+    def record(self, pc: int, instr: Instruction, elapsed_ns: int, frames: Tuple[str, ...]):
+        name = OpCode(instr.opcode).name
+        self.instructions += 1; self.total_ns += elapsed_ns
+        self.op_counts[name] += 1; self.op_time_ns[name] += elapsed_ns
+        self.pc_counts[pc] += 1; self.pc_time_ns[pc] += elapsed_ns
+        leaf = name
+        if instr.opcode in (OpCode.COMMAND, OpCode.ANALYSIS):
+            leaf = f"{name}:{instr.arg}"
+            self.target_counts[leaf] += 1; self.target_time_ns[leaf] += elapsed_ns
+        self.folded[";".join(frames + (leaf,))] += elapsed_ns
+    
+    def hotspots(self, top: int = 10) -> Dict[str, List[Tuple]]:
+        """Top entries by cumulative time: (key, count, time_ns)"""
+        def rank(counts, times):
+            return [(k, counts[k], times[k]) for k in sorted(times, key=times.get, reverse=True)[:top]]
+        return {
+            "opcodes": rank(self.op_counts, self.op_time_ns),
+            "pcs": rank(self.pc_counts, self.pc_time_ns),
+            "targets": rank(self.target_counts, self.target_time_ns),
+        }
+    
+    def report(self, top: int = 10) -> str:
+        """Human-readable hot-spot report"""
+        total = self.total_ns or 1
+        lines = [f"VM profile: {self.instructions} instructions, {self.total_ns / 1e6:.3f} ms"]
+        for section, rows in self.hotspots(top).items():
+            lines.append(f"-- {section} --")
+            for key, count, ns in rows:
+                lines.append(f"  {str(key):<16} {count:>10} {ns / 1e3:>12.1f} us {100 * ns / total:>6.1f}%")
+        return "\n".join(lines)
+    
+    def write_folded(self, path: str):
+        """Write flamegraph-compatible folded stacks (frame;frame;leaf weight_ns)"""
+        with open(path, "w") as f:
+            for stack, ns in sorted(self.folded.items()):
+                f.write(f"{stack} {ns}\n")
+
 class MadladVM:
     """Ring 1 VM with FULL command dispatch"""
     
-    def __init__(self, mem_size: int = 65536):
+    def __init__(self, mem_size: int = 65536, kernel: Optional[ReflectologyKernel] = None, register: bool = True):
         self.stack: List[int] = []
         self.memory = [0] * mem_size
         self.globals = {}
         self.pc = 0
         self.call_stack: List[int] = []
+        self.frames: List[Dict[int, int]] = [{}]  # locals per activation; frames[0] belongs to top-level code
         self.halted = False
         # Initialize via Bus (TX-RX)
         # We still keep a local kernel reference for initialization, but operations go through bus
-        self.kernel = ReflectologyKernel() 
+        self.kernel = kernel or ReflectologyKernel()
         self.omega = self.kernel.initialize()
         self.command_dispatch_count = 0
+        self.profile: Optional[VMProfile] = None
+        self._touched_pages = set()  # pages ever written, for full snapshots
+        self._dirty_pages = set()    # pages written since the last snapshot record
+        self._checkpoint_path: Optional[str] = None
+        self.symbols: Dict[str, Dict[str, int]] = {}
+        self.async_bus = False  # set by VMScheduler: bus calls yield instead of blocking
+        self.pending = None
         
         # Register VM with Bus
-        bus.register_ring("ring1", self)
+        if register: bus.register_ring("ring1", self)
     
-    def execute(self, program: List[Instruction]) -> int:
+    def execute(self, program: List[Instruction], profile: bool = False,
+                checkpoint_every: int = 0, checkpoint_path: Optional[str] = None) -> int:
+        if checkpoint_every and not checkpoint_path:
+            raise ValueError("checkpoint_every requires a checkpoint_path")
+        self.profile = None  # a profile only describes the run that collected it
+        if profile or checkpoint_every:
+            return self._execute_instrumented(program, profile, checkpoint_every, checkpoint_path)
         while not self.halted and self.pc < len(program):
             instr = program[self.pc]
             self.pc += 1
             self._exec_instr(instr)
         return self.stack[-1] if self.stack else 0
     
+    def load_bytecode(self, path: str) -> List[Instruction]:
+        """Load a precompiled .mbc program (see write_mbc); no lexing, parsing or optimization"""
+        image = read_mbc(path)
+        if image.backend != "stack": raise ValueError(f"{path} holds {image.backend} code; use MadladRegisterVM")
+        self.symbols = image.symbols
+        return image.program
+    
+    def execute_file(self, path: str, **kwargs) -> int:
+        return self.execute(self.load_bytecode(path), **kwargs)
+    
+    def run_slice(self, program: List[Instruction], budget: int) -> int:
+        """Execute at most budget instructions, stopping early on halt or an in-flight bus call"""
+        executed = 0
+        while executed < budget and not self.halted and self.pc < len(program) and self.pending is None:
+            instr = program[self.pc]
+            self.pc += 1
+            self._exec_instr(instr)
+            executed += 1
+        return executed
+    
+    def _execute_instrumented(self, program: List[Instruction], profile: bool,
+                              checkpoint_every: int, checkpoint_path: Optional[str]) -> int:
+        """Same loop as execute(), optionally timing into self.profile and checkpointing every N instructions"""
+        prof = self.profile = VMProfile() if profile else None
+        clock = time.perf_counter_ns
+        since_checkpoint = 0
+        while not self.halted and self.pc < len(program):
+            pc = self.pc
+            instr = program[pc]
+            frames = self._frames(program) if prof else ()
+            self.pc += 1
+            t0 = clock()
+            self._exec_instr(instr)
+            if prof: prof.record(pc, instr, clock() - t0, frames)
+            if checkpoint_every:
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    self.checkpoint(checkpoint_path); since_checkpoint = 0
+        return self.stack[-1] if self.stack else 0
+    
+    def _frames(self, program: List[Instruction]) -> Tuple[str, ...]:
+        """Call chain from call_stack: each return address follows the CALL naming its entry"""
+        frames = ["main"]
+        for ret in self.call_stack:
+            caller = program[ret - 1] if 0 < ret <= len(program) else None
+            frames.append(f"fn@{caller.arg}" if caller is not None and caller.opcode == OpCode.CALL else f"ret@{ret}")
+        return tuple(frames)
+    
     def _exec_instr(self, instr: Instruction):
         op = instr.opcode
         
@@ -100,10 +353,12 @@ class MadladVM:
             if self.stack and self.stack.pop() != 0: self.pc = instr.arg
         elif op == OpCode.CALL:
             self.call_stack.append(self.pc)
+            self.frames.append({})
             self.pc = instr.arg
         elif op == OpCode.RET:
             self.pc = self.call_stack.pop() if self.call_stack else len([])
             self.halted = not self.call_stack and not self.pc
+            if len(self.frames) > 1: self.frames.pop()
         
         # Memory
         elif op == OpCode.LOAD:
@@ -113,11 +368,17 @@ class MadladVM:
             if len(self.stack) >= 2:
                 val = self.stack.pop()
                 addr = self.stack.pop()
-                if 0 <= addr < len(self.memory): self.memory[addr] = val
+                if 0 <= addr < len(self.memory):
+                    self.memory[addr] = val
+                    self._dirty_pages.add(addr >> PAGE_SHIFT)
         elif op == OpCode.LOADG:
             self.stack.append(self.globals.get(instr.arg, 0))
         elif op == OpCode.STOREG:
             if self.stack: self.globals[instr.arg] = self.stack.pop()
+        elif op == OpCode.LOADL:
+            self.stack.append(self.frames[-1].get(instr.arg, 0))
+        elif op == OpCode.STOREL:
+            if self.stack: self.frames[-1][instr.arg] = self.stack.pop()
         
         # COMMAND DISPATCH (VIA TX-RX BUS)
         elif op == OpCode.COMMAND:
@@ -129,15 +390,7 @@ class MadladVM:
             self.omega.data["_command_call"] = command_id
             
             # Apply command through TX-RX Bus (Ring 1 -> Ring 0)
-            try:
-                self.omega = bus.tx("ring1", "ring0", "applyCommand", commandId=command_id, state=self.omega)
-            except Exception as e:
-                print(f"VM Error calling Ring 0: {e}")
-                
-            # Extract result back to stack
-            result = self.omega.data.get("_loss", self.omega.data.get("_goodness", input_val))
-            if isinstance(result, (int, float)):
-                self.stack.append(int(result))
+            self._bus_call(self._complete_command, input_val, "ring0", "applyCommand", commandId=command_id, state=self.omega)
                 
         # ANALYSIS DISPATCH (VIA TX-RX BUS)
         elif op == OpCode.ANALYSIS:
@@ -147,36 +400,386 @@ class MadladVM:
                 if len(self.stack) >= 2:
                     k = self.stack.pop()
                     n = self.stack.pop()
-                    try:
-                        res = bus.tx("ring1", "ring3", "bidirectionalBinomial", n=n, k=k)
-                        self.stack.append(int(res.value))
-                    except Exception as e:
-                        print(f"VM Error calling Ring 3: {e}")
-                        self.stack.append(0)
+                    self._bus_call(self._complete_analysis, None, "ring3", "bidirectionalBinomial", n=n, k=k)
             # 2: Gamma (pop z)
             elif func_id == 2:
                 if self.stack:
                     z = self.stack.pop()
-                    try:
-                        res = bus.tx("ring1", "ring3", "gamma", z=float(z))
-                        self.stack.append(int(res.value))
-                    except Exception as e:
-                        print(f"VM Error calling Ring 3: {e}")
-                        self.stack.append(0)
+                    self._bus_call(self._complete_analysis, None, "ring3", "gamma", z=float(z))
+    
+    def _bus_call(self, complete, ctx, target: str, method: str, **kwargs):
+        """Blocking bus.tx, or with async_bus an in-flight call the scheduler polls via _poll_pending()"""
+        if self.async_bus:
+            try:
+                self.pending = (bus.tx_async("ring1", target, method, **kwargs), complete, ctx, target, method,
+                                time.time() + BUS_TIMEOUT)
+            except Exception as e:
+                complete(e, ctx)
+            return
+        try:
+            result = bus.tx("ring1", target, method, **kwargs)
+        except Exception as e:
+            result = e
+        complete(result, ctx)
+    
+    def _poll_pending(self, block: bool = False) -> bool:
+        """Complete the in-flight bus call if its response has arrived; True once nothing is pending"""
+        if self.pending is None: return True
+        response_queue, complete, ctx, target, method, deadline = self.pending
+        try:
+            result = response_queue.get(timeout=max(0.0, deadline - time.time())) if block else response_queue.get_nowait()
+        except queue.Empty:
+            if not block and time.time() < deadline: return False
+            result = TimeoutError(f"Ring {target} did not respond to {method}")
+        self.pending = None
+        complete(result, ctx)
+        return True
+    
+    def _complete_command(self, result, input_val: int):
+        value = self._command_value(result, input_val)
+        if value is not None: self.stack.append(value)
+    
+    def _complete_analysis(self, result, _ctx):
+        self.stack.append(self._analysis_value(result))
+    
+    def _command_value(self, result, input_val: int) -> Optional[int]:
+        if isinstance(result, Exception): print(f"VM Error calling Ring 0: {result}")
+        else: self.omega = result
+        # Extract result back to stack
+        value = self.omega.data.get("_loss", self.omega.data.get("_goodness", input_val))
+        return int(value) if isinstance(value, (int, float)) else None
+    
+    def _analysis_value(self, result) -> int:
+        try:
+            if isinstance(result, Exception): raise result
+            return int(result.value)
+        except Exception as e:
+            print(f"VM Error calling Ring 3: {e}")
+            return 0
     
     def _binop(self, fn):
         if len(self.stack) >= 2:
             b, a = self.stack.pop(), self.stack.pop()
             self.stack.append(fn(a, b))
     
+    # === Snapshot / Restore ===
+    
+    def snapshot(self, path: str, incremental: bool = False) -> int:
+        """Write pc, stacks, globals, call frames, touched pages and omega to path; returns bytes written.
+        Incremental snapshots append a record holding only pages dirtied since the previous record."""
+        self._touched_pages |= self._dirty_pages
+        pages = self._dirty_pages if incremental else self._touched_pages
+        buf = io.BytesIO()
+        for v in (self.pc, int(self.halted), self.command_dispatch_count, len(self.memory)): _write_varint(buf, v)
+        for seq in (self.stack, self.call_stack):
+            _write_varint(buf, len(seq))
+            for v in seq: _write_varint(buf, int(v))
+        _write_varint(buf, len(self.globals))
+        for k, v in self.globals.items(): _write_varint(buf, k); _write_varint(buf, int(v))
+        _write_varint(buf, len(self.frames))
+        for frame in self.frames:
+            _write_varint(buf, len(frame))
+            for k, v in frame.items(): _write_varint(buf, k); _write_varint(buf, int(v))
+        _write_varint(buf, len(pages))
+        for page in sorted(pages):
+            _write_varint(buf, page)
+            for v in self.memory[page << PAGE_SHIFT:(page + 1) << PAGE_SHIFT]: _write_varint(buf, int(v))
+        omega = pickle.dumps(self._omega_to_dict())
+        _write_varint(buf, len(omega)); buf.write(omega)
+        
+        payload = zlib.compress(buf.getvalue())
+        kind = SNAPSHOT_INCREMENTAL if incremental else SNAPSHOT_FULL
+        record = SNAPSHOT_MAGIC + struct.pack("<BBI", SNAPSHOT_VERSION, kind, len(payload)) + payload
+        with open(path, "ab" if incremental else "wb") as f: f.write(record)
+        self._dirty_pages = set()
+        return len(record)
+    
+    def restore(self, path: str):
+        """Replay every record in a snapshot file (one full record followed by incrementals).
+        The omega section is unpickled, so the file must be trusted."""
+        with open(path, "rb") as f: data = f.read()
+        view, pos, header = memoryview(data), 0, struct.Struct("<BBI")
+        while pos < len(data):
+            if data[pos:pos + 4] != SNAPSHOT_MAGIC: raise ValueError(f"Bad snapshot record at offset {pos}")
+            version, kind, length = header.unpack_from(data, pos + 4)
+            if version != SNAPSHOT_VERSION: raise ValueError(f"Unsupported snapshot version {version}")
+            pos += 4 + header.size
+            if pos == 4 + header.size and kind != SNAPSHOT_FULL: raise ValueError("Snapshot does not start with a full record")
+            self._apply_snapshot(zlib.decompress(view[pos:pos + length]), kind)
+            pos += length
+        self._touched_pages |= self._dirty_pages
+        self._dirty_pages = set()
+    
+    def checkpoint(self, path: str) -> int:
+        """Full snapshot on the first checkpoint to path, dirty-page increments afterwards"""
+        incremental = self._checkpoint_path == path and os.path.exists(path)
+        self._checkpoint_path = path
+        return self.snapshot(path, incremental=incremental)
+    
+    def _apply_snapshot(self, payload: bytes, kind: int):
+        view, pos = memoryview(payload), 0
+        def read():
+            nonlocal pos
+            v, pos = _read_varint(view, pos)
+            return v
+        self.pc, halted, self.command_dispatch_count, mem_size = read(), read(), read(), read()
+        self.halted = bool(halted)
+        self.stack = [read() for _ in range(read())]
+        self.call_stack = [read() for _ in range(read())]
+        self.globals = {}
+        for _ in range(read()):
+            k = read(); self.globals[k] = read()
+        self.frames = []
+        for _ in range(read()):
+            frame = {}
+            for _ in range(read()):
+                k = read(); frame[k] = read()
+            self.frames.append(frame)
+        if kind == SNAPSHOT_FULL:
+            self.memory = [0] * mem_size
+            self._touched_pages = set()
+        for _ in range(read()):
+            page = read(); base = page << PAGE_SHIFT
+            self.memory[base:base + PAGE_SIZE] = [read() for _ in range(min(PAGE_SIZE, mem_size - base))]
+            self._dirty_pages.add(page)
+        omega_len = read()
+        self.omega = self._omega_from_dict(pickle.loads(view[pos:pos + omega_len]))
+    
+    def _omega_to_dict(self) -> Dict:
+        o = self.omega
+        return {"id": o.id, "timestamp": o.timestamp, "data": o.data, "interfaces_satisfied": o.interfaces_satisfied,
+                "cost": o.cost, "entropy": o.entropy, "dimension": o.dimension,
+                "eigenvalues": list(o.eigenvalues), "fractal_dimension": o.fractal_dimension,
+                "checksum": o.checksum()}
+    
+    def _omega_from_dict(self, d: Dict) -> OmegaState:
+        omega = OmegaState(id=d["id"], timestamp=d["timestamp"], data=d["data"],
+                           interfaces_satisfied=d["interfaces_satisfied"], cost=d["cost"], entropy=d["entropy"],
+                           dimension=d["dimension"], eigenvalues=d["eigenvalues"],
+                           fractal_dimension=d["fractal_dimension"])
+        if omega.checksum() != d["checksum"]:
+            raise ValueError(f"Snapshot omega checksum mismatch (expected {d['checksum'][:16]})")
+        return omega
+    
     def dump_state(self):
-        return {
+        state = {
             "stack": self.stack.copy(),
             "pc": self.pc,
             "halted": self.halted,
             "command_dispatches": self.command_dispatch_count,
             "omega_checksum": self.omega.checksum()[:16]
         }
+        if self.profile: state["profile"] = {"instructions": self.profile.instructions,
+                                             "total_ns": self.profile.total_ns,
+                                             "hotspots": self.profile.hotspots(5)}
+        return state
+
+class MadladRegisterVM(MadladVM):
+    """Register-machine variant of the Ring 1 VM.
+    
+    Executes RegInstruction code produced by ring2's RegisterCodeGenerator.
+    r0 holds the program result; CALL saves the register file and spill
+    slots, RET restores them and writes the return value into CALL's dst.
+    COMMAND/ANALYSIS go through the same RingBus dispatch as the stack VM.
+    Profiling and snapshots cover only the stack VM's state: execute()
+    rejects profile and checkpoint options with ValueError, and
+    snapshot()/restore() raise TypeError.
+    """
+    
+    def __init__(self, mem_size: int = 65536, num_regs: int = 16,
+                 kernel: Optional[ReflectologyKernel] = None, register: bool = True):
+        super().__init__(mem_size, kernel=kernel, register=register)
+        self.regs: List[int] = [0] * num_regs
+        self.spills: Dict[int, int] = {}
+        self.call_stack: List[Tuple] = []  # (return pc, saved regs, saved spills, dst)
+    
+    def execute(self, program: List[RegInstruction], profile: bool = False,
+                checkpoint_every: int = 0, checkpoint_path: Optional[str] = None) -> int:
+        if profile or checkpoint_every or checkpoint_path:
+            raise ValueError("MadladRegisterVM does not support profile or checkpoint runs; use MadladVM")
+        regs, binops = self.regs, REG_BINOPS
+        while not self.halted and self.pc < len(program):
+            ins = program[self.pc]
+            self.pc += 1
+            op = ins.opcode
+            fn = binops.get(op)
+            if fn is not None: regs[ins.dst] = fn(regs[ins.a], regs[ins.b] if ins.b != NO_REG else ins.imm)
+            elif op == OpCode.LOADI: regs[ins.dst] = ins.imm
+            elif op == OpCode.MOV: regs[ins.dst] = regs[ins.a]
+            elif op == OpCode.JZ:
+                if regs[ins.a] == 0: self.pc = ins.imm
+            elif op == OpCode.JNZ:
+                if regs[ins.a] != 0: self.pc = ins.imm
+            elif op == OpCode.JMP: self.pc = ins.imm
+            elif op == OpCode.LOADG: regs[ins.dst] = self.globals.get(ins.imm, 0)
+            elif op == OpCode.STOREG: self.globals[ins.imm] = regs[ins.a]
+            elif op == OpCode.NEG: regs[ins.dst] = -regs[ins.a]
+            elif op == OpCode.NOT: regs[ins.dst] = ~regs[ins.a]
+            elif op == OpCode.RELOAD: regs[ins.dst] = self.spills.get(ins.imm, 0)
+            elif op == OpCode.SPILL: self.spills[ins.imm] = regs[ins.a]
+            elif op == OpCode.CALL:
+                self.call_stack.append((self.pc, regs[:], self.spills, ins.dst))
+                self.spills = {}
+                self.pc = ins.imm
+            elif op == OpCode.RET:
+                value = regs[ins.a] if ins.a != NO_REG else 0
+                if not self.call_stack: self.halted = True; continue
+                self.pc, saved, self.spills, dst = self.call_stack.pop()
+                regs[:] = saved
+                regs[dst] = value
+            elif op == OpCode.LOAD:
+                addr = regs[ins.a]
+                regs[ins.dst] = self.memory[addr] if 0 <= addr < len(self.memory) else 0
+            elif op == OpCode.STORE:
+                addr = regs[ins.a]
+                if 0 <= addr < len(self.memory):
+                    self.memory[addr] = regs[ins.b]
+                    self._dirty_pages.add(addr >> PAGE_SHIFT)
+            elif op == OpCode.COMMAND:
+                self.command_dispatch_count += 1
+                input_val = regs[ins.a] if ins.a != NO_REG else 0
+                self.omega.data["_vm_input"] = input_val
+                self.omega.data["_command_call"] = ins.imm
+                self._bus_call(self._complete_reg_command, (ins.dst, input_val), "ring0", "applyCommand",
+                               commandId=ins.imm, state=self.omega)
+            elif op == OpCode.ANALYSIS:
+                # 1: Bidirectional Binomial (a=n, b=k); 2: Gamma (a=z)
+                if ins.imm == 1:
+                    self._bus_call(self._complete_reg_analysis, ins.dst, "ring3", "bidirectionalBinomial",
+                                   n=regs[ins.a], k=regs[ins.b])
+                elif ins.imm == 2:
+                    self._bus_call(self._complete_reg_analysis, ins.dst, "ring3", "gamma", z=float(regs[ins.a]))
+            elif op == OpCode.HALT: self.halted = True
+        return regs[0]
+    
+    def load_bytecode(self, path: str) -> List[RegInstruction]:
+        image = read_mbc(path)
+        if image.backend != "register": raise ValueError(f"{path} holds {image.backend} code; use MadladVM")
+        self.symbols = image.symbols
+        return image.program
+    
+    def snapshot(self, path: str, incremental: bool = False) -> int:
+        raise TypeError("MadladRegisterVM state (registers, spills, call stack) has no snapshot format")
+    
+    def restore(self, path: str):
+        raise TypeError("MadladRegisterVM state (registers, spills, call stack) has no snapshot format")
+    
+    def _complete_reg_command(self, result, ctx):
+        dst, input_val = ctx
+        value = self._command_value(result, input_val)
+        self.regs[dst] = input_val if value is None else value
+    
+    def _complete_reg_analysis(self, result, dst: int):
+        self.regs[dst] = self._analysis_value(result)
+    
+    def dump_state(self):
+        state = super().dump_state()
+        state["registers"] = self.regs.copy()
+        return state
+
+@dataclass
+class VMJobResult:
+    """Outcome and stats of one program run by VMScheduler"""
+    job_id: int
+    result: int
+    instructions: int
+    slices: int
+    bus_waits: int
+    wall_time: float
+    state: Dict
+    error: Optional[str] = None
+
+@dataclass
+class _VMJob:
+    job_id: int
+    program: List[Instruction]
+    vm: Optional[MadladVM] = None
+    instructions: int = 0
+    slices: int = 0
+    bus_waits: int = 0
+    started: float = 0.0
+
+class VMScheduler:
+    """Round-robin time slicing of many MadladVM programs.
+    
+    Each VM runs for at most slice_budget instructions per turn; a VM with a
+    RingBus call in flight gives up its turn until the response arrives.
+    At most max_active VMs are alive at once, so thousands of submitted
+    programs never hold thousands of 64K memory arrays.
+    """
+    
+    def __init__(self, slice_budget: int = 1000, mem_size: int = 65536, max_active: int = 64):
+        self.slice_budget, self.mem_size, self.max_active = slice_budget, mem_size, max_active
+        self.jobs: List[_VMJob] = []
+        self._kernel: Optional[ReflectologyKernel] = None
+    
+    def submit(self, program: List[Instruction]) -> int:
+        self.jobs.append(_VMJob(len(self.jobs), program))
+        return self.jobs[-1].job_id
+    
+    def run(self, processes: int = 0, initializer: Optional[Callable] = None) -> List[VMJobResult]:
+        """Run every submitted job cooperatively in this thread, or across a process pool when processes > 1.
+        initializer runs once per worker process (e.g. to register ring3 on the worker's bus)."""
+        jobs, self.jobs = self.jobs, []
+        if processes and processes > 1 and len(jobs) > 1:
+            return self._run_pool(jobs, processes, initializer)
+        return self._run_cooperative(jobs)
+    
+    def _new_vm(self) -> MadladVM:
+        # One shared kernel per scheduler; VMs don't replace the bus "ring1" handler
+        if self._kernel is None: self._kernel = ReflectologyKernel()
+        vm = MadladVM(self.mem_size, kernel=self._kernel, register=False)
+        vm.async_bus = True
+        return vm
+    
+    def _run_cooperative(self, jobs: List[_VMJob]) -> List[VMJobResult]:
+        waiting, active, results = list(reversed(jobs)), [], []
+        while waiting or active:
+            while waiting and len(active) < self.max_active:
+                job = waiting.pop(); job.vm = self._new_vm(); job.started = time.time()
+                active.append(job)
+            progressed = False
+            for job in list(active):
+                vm = job.vm
+                try:
+                    if not vm._poll_pending():
+                        continue
+                    executed = vm.run_slice(job.program, self.slice_budget)
+                    job.instructions += executed; job.slices += 1
+                    progressed = progressed or executed > 0
+                    if vm.pending is not None:
+                        job.bus_waits += 1
+                    elif vm.halted or vm.pc >= len(job.program):
+                        results.append(self._finish(job)); active.remove(job); progressed = True
+                except Exception as e:
+                    results.append(self._finish(job, error=str(e))); active.remove(job); progressed = True
+            if not progressed and active:
+                time.sleep(0.0005)  # everyone is waiting on the bus
+        results.sort(key=lambda r: r.job_id)
+        return results
+    
+    def _finish(self, job: _VMJob, error: Optional[str] = None) -> VMJobResult:
+        vm = job.vm
+        result = VMJobResult(job.job_id, vm.stack[-1] if vm.stack else 0, job.instructions, job.slices,
+                             job.bus_waits, time.time() - job.started, vm.dump_state(), error)
+        job.vm = None
+        return result
+    
+    def _run_pool(self, jobs: List[_VMJob], processes: int, initializer: Optional[Callable]) -> List[VMJobResult]:
+        chunks = [[(j.job_id, j.program) for j in jobs[i::processes]] for i in range(processes)]
+        results = []
+        with ProcessPoolExecutor(max_workers=processes, initializer=initializer) as pool:
+            futures = [pool.submit(_run_scheduler_chunk, chunk, self.slice_budget, self.mem_size, self.max_active)
+                       for chunk in chunks if chunk]
+            for fut in as_completed(futures): results.extend(fut.result())
+        results.sort(key=lambda r: r.job_id)
+        return results
+
+def _run_scheduler_chunk(chunk, slice_budget: int, mem_size: int, max_active: int) -> List[VMJobResult]:
+    """Process-pool worker: cooperative scheduling of one chunk, keeping the caller's job ids"""
+    scheduler = VMScheduler(slice_budget, mem_size, max_active)
+    jobs = [_VMJob(job_id, program) for job_id, program in chunk]
+    return scheduler._run_cooperative(jobs)
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -195,8 +798,9 @@ if __name__ == "__main__":
         Instruction(OpCode.HALT)
     ]
     
-    result = vm.execute(program)
+    result = vm.execute(program, profile=True)
     print(f"✓ Program executed, result: {result}")
+    print(vm.profile.report(top=3))
     print(f"✓ Command dispatches: {vm.command_dispatch_count}")
     print(f"✓ Omega checksum: {vm.omega.checksum()[:16]}...")
     print(f"✓ Stack/memory/globals all working")
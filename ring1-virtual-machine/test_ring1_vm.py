@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Ring 1 VM tests: profiled runs, and snapshot/restore round trips.
+
+Run: python test_ring1_vm.py   (or pytest)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+rings_root = Path(__file__).resolve().parent.parent
+for ring in ['ring0-math-kernel', 'ring1-virtual-machine']:
+    sys.path.insert(0, str(rings_root / ring))
+
+from ring1_vm import MadladVM, Instruction, OpCode, PAGE_SIZE
+
+PROGRAM = [Instruction(OpCode.PUSH, 6), Instruction(OpCode.PUSH, 7), Instruction(OpCode.MUL),
+           Instruction(OpCode.STOREG, 0), Instruction(OpCode.LOADG, 0)]
+
+def test_profile_covers_only_its_run():
+    vm = MadladVM(register=False)
+    assert vm.execute(PROGRAM, profile=True) == 42
+    assert vm.dump_state()["profile"]["instructions"] == len(PROGRAM)
+    vm.pc = 0
+    assert vm.execute(PROGRAM) == 42
+    assert vm.profile is None and "profile" not in vm.dump_state()
+    print("✅ an unprofiled run drops the previous run's profile")
+
+def vm_state(vm):
+    return (vm.pc, vm.halted, vm.stack, vm.call_stack, vm.globals, vm.frames, vm.memory, vm.omega.data,
+            vm.omega.eigenvalues, vm.omega.checksum())
+
+def stores(*pairs):
+    """STORE each (addr, value): the VM only tracks pages written through STORE"""
+    return [Instruction(op, arg) for addr, value in pairs
+            for op, arg in ((OpCode.PUSH, addr), (OpCode.PUSH, value), (OpCode.STORE, 0))]
+
+def test_snapshot_round_trip():
+    vm = MadladVM(mem_size=4 * PAGE_SIZE, register=False)
+    vm.execute(PROGRAM + stores((5, -7), (3 * PAGE_SIZE + 1, 2**65)) + [Instruction(OpCode.STOREL, 3)])
+    vm.frames[0][4] = 2**70
+    vm.omega.data.update({"seen": {1, 2, 3}, "pair": (4, 5), "by_id": {7: "int key"}, "z": 1 + 2j, "nested": {"s": {"a"}}})
+    vm.omega.eigenvalues = [0.5 - 1j]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vm.snap")
+        vm.snapshot(path)
+        restored = MadladVM(mem_size=4 * PAGE_SIZE, register=False)
+        restored.restore(path)
+        assert vm_state(restored) == vm_state(vm)
+        vm.pc = 0
+        vm.execute(stores((PAGE_SIZE, 9)))
+        vm.omega.data["seen"].add(4)
+        vm.snapshot(path, incremental=True)
+        restored.restore(path)
+        assert vm_state(restored) == vm_state(vm) and restored.memory[PAGE_SIZE] == 9
+        vm._omega_to_dict = lambda: {**MadladVM._omega_to_dict(vm), "checksum": "0" * 64}
+        vm.snapshot(path)
+        try: MadladVM(register=False).restore(path)
+        except ValueError: pass
+        else: raise AssertionError("restore accepted an omega checksum mismatch")
+    print("✅ snapshot/restore round-trips stacks, frames, pages and non-JSON omega data")
+
+if __name__ == "__main__":
+    test_profile_covers_only_its_run()
+    test_snapshot_round_trip()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark and Regression Harness for the ring2 → ring1 Toolchain
+
+For every program in the corpus (hand-written files in benchmarks/ plus
+generated stress programs) this measures:
+1. Compile throughput (source chars/sec and tokens/sec, cache bypassed)
+2. VM throughput (executed instructions/sec on the stack VM)
+3. Deterministic counters (bytecode size, executed instructions, result)
+
+The run fails when a program's result changes, when a counter grows by
+more than the threshold, or when a throughput drops by more than the
+threshold. Counters are compared against the committed
+benchmarks/baseline-O<level>.json. Timings depend on the machine, so they
+are compared only against benchmarks/timings-O<level>.json. That file is
+not committed: the first run on a machine records it.
+
+Usage:
+    python benchmark_toolchain.py                   # compare with the -O1 baseline and local timings
+    python benchmark_toolchain.py --update          # record new counters and local timings
+    python benchmark_toolchain.py --threshold 0.4   # tolerate 40% regressions
+    python benchmark_toolchain.py -O2 --only arith_loop recursion
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ring2_compiler import MadladCompiler, CompilationCache, Lexer, Optimizer
+from ring1_vm import MadladVM
+from ring0_kernel import ReflectologyKernel
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+BASELINE_PATTERN = os.path.join(CORPUS_DIR, "baseline-O{level}.json")  # committed: deterministic counters
+TIMINGS_PATTERN = os.path.join(CORPUS_DIR, "timings-O{level}.json")    # machine-local, git-ignored
+BASELINE_VERSION = 2
+
+# Metrics where higher is better (throughput) and where lower is better (work done)
+THROUGHPUT_METRICS = ("compile_chars_per_sec", "compile_tokens_per_sec", "vm_instructions_per_sec")
+COUNTER_METRICS = ("instructions", "executed")
+BASELINE_METRICS = COUNTER_METRICS + ("result",)
+VM_MIN_EXECUTED = 1000  # shorter runs measure call overhead, so their instructions/sec is not compared
+
+
+# =============================================================================
+# CORPUS
+# =============================================================================
+
+def gen_straight_line(n: int = 1500) -> str:
+    """Large straight-line code: n dependent lets, no control flow"""
+    lines = ["let v0 = 1"]
+    for i in range(1, n):
+        lines.append(f"let v{i} = (v{i - 1} * {i % 7 + 1} + {i}) % 1000003 - v{i // 2}")
+    lines.append(f"print(v{n - 1})")
+    return "\n".join(lines)
+
+
+def gen_functions(n: int = 150) -> str:
+    """Many small functions, each calling the previous one"""
+    lines = ["fn f0(x) { return x + 1 }"]
+    for i in range(1, n):
+        lines.append(f"fn f{i}(x) {{ let y = x * 2 - {i}\n return f{i - 1}(y % 97) + {i % 5} }}")
+    lines.append("let acc = 0")
+    lines.append("let k = 0")
+    lines.append(f"while (k < 20) {{ acc = acc + f{n - 1}(k)\n k = k + 1 }}")
+    lines.append("print(acc)")
+    return "\n".join(lines)
+
+
+def gen_deep_expression(depth: int = 60) -> str:
+    """One deeply nested arithmetic expression (parser recursion, folding)"""
+    expr = "x"
+    for i in range(depth):
+        expr = f"({expr} {'+-*'[i % 3]} {i % 9 + 1})"
+    return f"let x = 3\nlet y = {expr} % 1000003\nprint(y)"
+
+
+GENERATORS = {
+    "straight_line": gen_straight_line,
+    "functions": gen_functions,
+    "deep_expression": gen_deep_expression,
+}
+
+
+def load_corpus() -> Dict[str, str]:
+    """Hand-written benchmarks/*.madlad programs followed by the generated ones"""
+    corpus = {}
+    for fname in sorted(os.listdir(CORPUS_DIR)):
+        if fname.endswith(".madlad"):
+            with open(os.path.join(CORPUS_DIR, fname)) as f: corpus[fname[:-len(".madlad")]] = f.read()
+    for name, gen in GENERATORS.items(): corpus[name] = gen()
+    return corpus
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def best_time(fn: Callable[[], None], repeat: int = 5, min_time: float = 0.1) -> float:
+    """Fastest of at least repeat calls, calling again until min_time seconds have been spent
+    so that millisecond-scale programs get as many samples as they need to settle"""
+    times, spent = [], 0.0
+    while len(times) < repeat or spent < min_time:
+        start = time.perf_counter(); fn(); elapsed = time.perf_counter() - start
+        times.append(elapsed); spent += elapsed
+    return min(times)
+
+
+def benchmark_program(source: str, kernel: ReflectologyKernel, compiler: MadladCompiler,
+                      repeat: int = 5) -> Dict[str, float]:
+    """Best-of-repeat timings for one program; a fresh cache per compile keeps it cold"""
+    tokens = len(Lexer(source).tokenize())
+    compiler.cache = CompilationCache()
+    code = compiler.compile(source)
+    vm = MadladVM(kernel=kernel, register=False)
+    executed = vm.run_slice(code, sys.maxsize)
+    result = vm.stack[-1] if vm.stack else 0
+    
+    def compile_cold():
+        compiler.cache = CompilationCache()
+        compiler.compile(source)
+    
+    def run():
+        MadladVM(kernel=kernel, register=False).run_slice(code, sys.maxsize)
+    
+    compile_s, run_s = best_time(compile_cold, repeat), best_time(run, repeat)
+    return {
+        "chars": len(source),
+        "tokens": tokens,
+        "instructions": len(code),
+        "executed": executed,
+        "result": result,
+        "compile_ms": round(compile_s * 1000, 3),
+        "run_ms": round(run_s * 1000, 3),
+        "compile_chars_per_sec": round(len(source) / compile_s, 1),
+        "compile_tokens_per_sec": round(tokens / compile_s, 1),
+        "vm_instructions_per_sec": round(executed / run_s, 1) if run_s else 0.0,
+    }
+
+
+def run_suite(opt_level: int = 1, repeat: int = 5, only: Tuple[str, ...] = ()) -> Dict:
+    kernel = ReflectologyKernel()
+    compiler = MadladCompiler(opt_level=opt_level)
+    results = {}
+    for name, source in load_corpus().items():
+        if only and name not in only: continue
+        results[name] = benchmark_program(source, kernel, compiler, repeat)
+    return {
+        "version": BASELINE_VERSION,
+        "opt_level": opt_level,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "programs": results,
+    }
+
+
+# =============================================================================
+# REGRESSION CHECK
+# =============================================================================
+
+def split_results(current: Dict) -> Tuple[Dict, Dict]:
+    """The committed baseline (counters and results only) and the machine-local timings of a run"""
+    def keep(metrics):
+        return {**{k: v for k, v in current.items() if k != "programs"},
+                "programs": {name: {m: r[m] for m in metrics} for name, r in current["programs"].items()}}
+    return keep(BASELINE_METRICS), keep(("executed",) + THROUGHPUT_METRICS)
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.3, timings: Dict = None) -> List[str]:
+    """Regression messages; empty when current is within threshold of baseline's counters and,
+    when given, of the timings recorded earlier on this machine"""
+    failures = []
+    for reference in (baseline, timings or {}):
+        if reference and reference.get("opt_level") != current["opt_level"]:
+            failures.append(f"reference was recorded at -O{reference.get('opt_level')}, this run is -O{current['opt_level']}")
+    if failures: return failures
+    for name, now in current["programs"].items():
+        then = baseline["programs"].get(name)
+        if then is not None:
+            if now["result"] != then["result"]:
+                failures.append(f"{name}: result {now['result']} != baseline {then['result']}")
+            for metric in COUNTER_METRICS:
+                if then[metric] and now[metric] > then[metric] * (1 + threshold):
+                    failures.append(f"{name}: {metric} {now[metric]} > baseline {then[metric]} "
+                                    f"({100 * (now[metric] / then[metric] - 1):+.1f}%)")
+        then = (timings or {}).get("programs", {}).get(name)
+        if then is None: continue
+        for metric in THROUGHPUT_METRICS:
+            if metric == "vm_instructions_per_sec" and then["executed"] < VM_MIN_EXECUTED: continue
+            if then[metric] and now[metric] < then[metric] * (1 - threshold):
+                failures.append(f"{name}: {metric} {now[metric]:,.0f} < local timing {then[metric]:,.0f} "
+                                f"({100 * (now[metric] / then[metric] - 1):+.1f}%)")
+    return failures
+
+
+def load_json(path: str) -> Optional[Dict]:
+    if not os.path.exists(path): return None
+    with open(path) as f: return json.load(f)
+
+
+def write_json(path: str, data: Dict):
+    with open(path, "w") as f: json.dump(data, f, indent=2); f.write("\n")
+
+
+def print_table(current: Dict, timings: Dict = None):
+    print(f"{'program':<18} {'instrs':>7} {'executed':>9} {'compile ms':>11} {'chars/s':>12} "
+          f"{'VM instr/s':>12} {'vs base':>8}")
+    for name, r in current["programs"].items():
+        then = (timings or {}).get("programs", {}).get(name)
+        delta = f"{100 * (r['vm_instructions_per_sec'] / then['vm_instructions_per_sec'] - 1):+.1f}%" \
+            if then and then["vm_instructions_per_sec"] else "-"
+        print(f"{name:<18} {r['instructions']:>7} {r['executed']:>9} {r['compile_ms']:>11.2f} "
+              f"{r['compile_chars_per_sec']:>12,.0f} {r['vm_instructions_per_sec']:>12,.0f} {delta:>8}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="ring2 → ring1 toolchain benchmarks")
+    ap.add_argument("--baseline", help="baseline JSON path (default benchmarks/baseline-O<level>.json)")
+    ap.add_argument("--update", action="store_true", help="write the counters baseline and the local timings")
+    ap.add_argument("--timings", help="local timings JSON path (default benchmarks/timings-O<level>.json)")
+    ap.add_argument("--threshold", type=float, default=0.3, help="allowed fractional regression (default 0.3)")
+    ap.add_argument("--repeat", type=int, default=5, help="timing repeats; the best is kept")
+    ap.add_argument("-O", dest="opt_level", type=int, default=1, choices=Optimizer.LEVELS)
+    ap.add_argument("--only", nargs="*", default=(), help="benchmark names to run")
+    ap.add_argument("--json", help="also write this run's results here")
+    args = ap.parse_args(argv)
+    args.baseline = args.baseline or BASELINE_PATTERN.format(level=args.opt_level)
+    args.timings = args.timings or TIMINGS_PATTERN.format(level=args.opt_level)
+
+    print("=" * 70)
+    print(f"RING2 → RING1 TOOLCHAIN BENCHMARKS (-O{args.opt_level}, best of {args.repeat})")
+    print("=" * 70)
+    current = run_suite(args.opt_level, args.repeat, tuple(args.only))
+    counters, local = split_results(current)
+    baseline = None if args.update else load_json(args.baseline)
+    timings = None if args.update else load_json(args.timings)
+    print_table(current, timings)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(current, f, indent=2)
+    if args.update or timings is None:
+        write_json(args.timings, local)
+        print(f"\n✓ Local timings written to {args.timings}")
+    if args.update:
+        write_json(args.baseline, counters)
+        print(f"✓ Baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update to record one")
+        return 0
+    failures = compare(current, baseline, args.threshold, timings)
+    if failures:
+        print(f"\n✗ {len(failures)} regression(s) past {args.threshold:.0%}:")
+        for line in failures: print(f"  {line}")
+        return 1
+    against = os.path.basename(args.baseline) + (f" and {os.path.basename(args.timings)}" if timings else "")
+    print(f"\n✅ No regressions past {args.threshold:.0%} against {against}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,19 @@ VARIABLES, FUNCTIONS, CONTROL FLOW, OPTIMIZATION IMPLEMENTED
 COMPLETENESS: 100% (lexer, parser, AST, codegen, optimizer)
 """
 
-from dataclasses import dataclass
+import ast as pyast
+import hashlib
+import os
+import re
+import struct
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace, asdict
 from enum import Enum, auto
-from typing import List, Optional, Dict, Any
-from ring1_vm import OpCode, Instruction
-from ring0_kernel import bus
+from typing import List, Optional, Dict, Any, Set, Tuple, NamedTuple, Iterator, Callable, Union
+from ring1_vm import OpCode, Instruction, RegInstruction, NO_REG, REG_BINOPS, MBC_BACKENDS, BytecodeImage, write_mbc, read_mbc
+from ring0_kernel import bus, ReflectologyKernel, OmegaState
 
 class TokenType(Enum):
     NUMBER = auto(); IDENT = auto(); STRING = auto()
@@ -20,11 +28,10 @@ class TokenType(Enum):
     LPAREN = auto(); RPAREN = auto(); LBRACE = auto(); RBRACE = auto()
     COMMA = auto(); SEMICOLON = auto(); COLON = auto()
     LET = auto(); FN = auto(); IF = auto(); ELSE = auto(); WHILE = auto(); FOR = auto(); RETURN = auto()
-    COMMAND = auto(); PRINT = auto()
+    COMMAND = auto(); PRINT = auto(); MODULE = auto(); IMPORT = auto()
     EOF = auto()
 
-@dataclass
-class Token:
+class Token(NamedTuple):
     type: TokenType
     value: Any
     line: int = 1
@@ -32,56 +39,69 @@ class Token:
 KEYWORDS = {
     "let": TokenType.LET, "fn": TokenType.FN, "if": TokenType.IF, "else": TokenType.ELSE,
     "while": TokenType.WHILE, "for": TokenType.FOR, "return": TokenType.RETURN,
-    "command": TokenType.COMMAND, "print": TokenType.PRINT
+    "command": TokenType.COMMAND, "print": TokenType.PRINT, "module": TokenType.MODULE, "import": TokenType.IMPORT
+}
+
+OPERATORS = {
+    "==": TokenType.EQ, "!=": TokenType.NE, "<=": TokenType.LE, ">=": TokenType.GE, "&&": TokenType.AND, "||": TokenType.OR,
+    '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.STAR, '/': TokenType.SLASH, '%': TokenType.PERCENT,
+    '<': TokenType.LT, '>': TokenType.GT, '=': TokenType.ASSIGN, '!': TokenType.NOT,
+    '(': TokenType.LPAREN, ')': TokenType.RPAREN, '{': TokenType.LBRACE, '}': TokenType.RBRACE,
+    ',': TokenType.COMMA, ';': TokenType.SEMICOLON, ':': TokenType.COLON
 }
 
+# One master pattern; alternatives are tried in order, so two-char operators precede single chars.
+# Characters outside every class lex as EOF tokens, which stops the parser as before.
+TOKEN_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in (
+    ("WS", r"[ \t\r\n]+"),
+    ("COMMENT", r"#[^\n]*"),
+    ("NUMBER", r"\d[\d.]*"),
+    ("IDENT", r"[^\W\d]\w*"),
+    ("STRING", r'"[^"]*"?'),
+    ("OP", r"==|!=|<=|>=|&&|\|\||."),
+)))
+
 class Lexer:
     def __init__(self, source: str):
         self.source, self.pos, self.line = source, 0, 1
     
     def tokenize(self) -> List[Token]:
-        tokens = []
-        while self.pos < len(self.source):
-            c = self.source[self.pos]
-            if c in ' \t\r': self.pos += 1
-            elif c == '\n': self.pos += 1; self.line += 1
-            elif c == '#':
-                while self.pos < len(self.source) and self.source[self.pos] != '\n': self.pos += 1
-            elif c.isdigit(): tokens.append(self._number())
-            elif c.isalpha() or c == '_': tokens.append(self._ident())
-            elif c == '"': tokens.append(self._string())
-            else: tokens.append(self._operator())
+        tokens: List[Token] = []
+        self.pos += self._scan(self.source[self.pos:], True, tokens)
         tokens.append(Token(TokenType.EOF, None, self.line))
         return tokens
     
-    def _number(self) -> Token:
-        start = self.pos
-        while self.pos < len(self.source) and (self.source[self.pos].isdigit() or self.source[self.pos] == '.'): self.pos += 1
-        return Token(TokenType.NUMBER, float(self.source[start:self.pos]) if '.' in self.source[start:self.pos] else int(self.source[start:self.pos]), self.line)
+    @staticmethod
+    def tokenize_stream(fileobj, chunk_size: int = 1 << 16) -> Iterator[Token]:
+        """Lex a text file object chunk by chunk; a token touching the chunk end waits for more input"""
+        lexer, carry = Lexer(""), ""
+        while True:
+            chunk = fileobj.read(chunk_size)
+            text, final = carry + chunk, not chunk
+            tokens: List[Token] = []
+            used = lexer._scan(text, final, tokens)
+            yield from tokens
+            carry = text[used:]
+            if final: break
+        yield Token(TokenType.EOF, None, lexer.line)
     
-    def _ident(self) -> Token:
-        start = self.pos
-        while self.pos < len(self.source) and (self.source[self.pos].isalnum() or self.source[self.pos] == '_'): self.pos += 1
-        word = self.source[start:self.pos]
-        return Token(KEYWORDS.get(word, TokenType.IDENT), word, self.line)
-    
-    def _string(self) -> Token:
-        self.pos += 1; start = self.pos
-        while self.pos < len(self.source) and self.source[self.pos] != '"': self.pos += 1
-        val = self.source[start:self.pos]; self.pos += 1
-        return Token(TokenType.STRING, val, self.line)
-    
-    def _operator(self) -> Token:
-        c = self.source[self.pos]; self.pos += 1
-        if self.pos < len(self.source):
-            nc = c + self.source[self.pos]
-            ops2 = {"==": TokenType.EQ, "!=": TokenType.NE, "<=": TokenType.LE, ">=": TokenType.GE, "&&": TokenType.AND, "||": TokenType.OR}
-            if nc in ops2: self.pos += 1; return Token(ops2[nc], nc, self.line)
-        ops1 = {'+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.STAR, '/': TokenType.SLASH, '%': TokenType.PERCENT,
-                '<': TokenType.LT, '>': TokenType.GT, '=': TokenType.ASSIGN, '!': TokenType.NOT,
-                '(': TokenType.LPAREN, ')': TokenType.RPAREN, '{': TokenType.LBRACE, '}': TokenType.RBRACE,
-                ',': TokenType.COMMA, ';': TokenType.SEMICOLON, ':': TokenType.COLON}
-        return Token(ops1.get(c, TokenType.EOF), c, self.line)
+    def _scan(self, text: str, final: bool, tokens: List[Token]) -> int:
+        """Append tokens for text, returning how many characters were consumed"""
+        line, consumed, end = self.line, 0, len(text)
+        keywords, operators, append = KEYWORDS, OPERATORS, tokens.append
+        for m in TOKEN_RE.finditer(text):
+            if not final and m.end() == end: break
+            consumed = m.end()
+            kind, value = m.lastgroup, m.group()
+            if kind == "WS": line += value.count("\n")
+            elif kind == "IDENT": append(Token(keywords.get(value, TokenType.IDENT), value, line))
+            elif kind == "NUMBER": append(Token(TokenType.NUMBER, float(value) if '.' in value else int(value), line))
+            elif kind == "OP": append(Token(operators.get(value, TokenType.EOF), value, line))
+            elif kind == "STRING":
+                append(Token(TokenType.STRING, value[1:-1] if len(value) > 1 and value[-1] == '"' else value[1:], line))
+                line += value.count("\n")
+        self.line = line
+        return consumed
 
 # AST Nodes
 @dataclass
@@ -118,16 +138,82 @@ class CommandCall(ASTNode): command_id: int; arg: Optional[ASTNode]
 class PrintStmt(ASTNode): value: ASTNode
 @dataclass
 class Block(ASTNode): statements: List[ASTNode]
+@dataclass
+class ModuleDecl(ASTNode): name: str
+@dataclass
+class ImportDecl(ASTNode): name: str
+
+def _children(node: ASTNode):
+    """Direct AST children of a node (fields holding nodes or lists of nodes)"""
+    for f in fields(node):
+        v = getattr(node, f.name)
+        if isinstance(v, ASTNode): yield v
+        elif isinstance(v, list):
+            for x in v:
+                if isinstance(x, ASTNode): yield x
+
+BINOP_OPCODES = {'+': OpCode.ADD, '-': OpCode.SUB, '*': OpCode.MUL, '/': OpCode.DIV, '%': OpCode.MOD,
+                 '==': OpCode.EQ, '!=': OpCode.NE, '<': OpCode.LT, '>': OpCode.GT, '<=': OpCode.LE, '>=': OpCode.GE,
+                 '&&': OpCode.AND, '||': OpCode.OR}
+
+class Diagnostic(NamedTuple):
+    line: int
+    message: str
+    def __str__(self) -> str: return f"line {self.line}: {self.message}"
+
+# Tokens a panic-mode parser may resume at: every statement keyword begins a fresh statement
+SYNC_TOKENS = frozenset({TokenType.LET, TokenType.FN, TokenType.IF, TokenType.WHILE, TokenType.FOR, TokenType.RETURN,
+                         TokenType.COMMAND, TokenType.PRINT, TokenType.MODULE, TokenType.IMPORT})
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens, self.pos = tokens, 0
+    """Recursive-descent parser. By default the first syntax error raises; with
+    recover=True it is recorded in `errors`, the parser skips to the next
+    statement boundary (panic mode) and carries on, so a single pass reports
+    every error alongside the partial AST of the statements that did parse."""
+    def __init__(self, tokens: List[Token], recover: bool = False):
+        self.tokens, self.pos, self.recover = tokens, 0, recover
+        self.errors: List[Diagnostic] = []
     
     def parse(self) -> List[ASTNode]:
         stmts = []
-        while not self._at_end(): stmts.append(self._statement())
+        while not self._done():
+            node = self._recovering_statement()
+            if node is not None: stmts.append(node)
         return stmts
     
+    def _done(self) -> bool:
+        """End of input. When recovering, stray characters (lexed as EOF mid-stream) are reported and skipped"""
+        while self.recover and self._at_end() and self.pos < len(self.tokens) - 1:
+            t = self._advance(); self.errors.append(Diagnostic(t.line, f"Unexpected character {t.value!r}"))
+        return self._at_end()
+    
+    def _recovering_statement(self) -> Optional[ASTNode]:
+        if not self.recover: return self._statement()
+        start = self.pos
+        try: return self._statement()
+        except SyntaxError as e:
+            line = self._cur().line
+            self.errors.append(Diagnostic(line, str(e).rsplit(" at line ", 1)[0]))
+            self._synchronize(start, line)
+            return None
+    
+    def _synchronize(self, start: int, line: int):
+        """Skip past the broken statement: stop before a statement keyword or '}', after a ';',
+        or at the first token on a later line than the error. A '{' met on the way is skipped
+        through its matching '}' so the body of a broken if/while/fn does not cascade.
+        Always consumes at least one token."""
+        if self.pos == start: self._advance()
+        depth = 0
+        while not self._at_end():
+            t = self._cur()
+            if depth == 0 and (t.type in SYNC_TOKENS or t.type == TokenType.RBRACE or t.line > line): return
+            self._advance()
+            if t.type == TokenType.LBRACE: depth += 1
+            elif t.type == TokenType.RBRACE:
+                depth -= 1
+                if depth == 0: return
+            elif t.type == TokenType.SEMICOLON and depth == 0: return
+    
     def _cur(self) -> Token: return self.tokens[self.pos]
     def _at_end(self) -> bool: return self._cur().type == TokenType.EOF
     def _advance(self) -> Token: t = self._cur(); self.pos += 1; return t
@@ -149,6 +235,8 @@ class Parser:
         if self._match(TokenType.COMMAND): return self._command_call()
         if self._match(TokenType.PRINT): return self._print_stmt()
         if self._match(TokenType.LBRACE): return self._block()
+        if self._match(TokenType.MODULE): return self._module_decl(ModuleDecl)
+        if self._match(TokenType.IMPORT): return self._module_decl(ImportDecl)
         return self._expr_stmt()
     
     def _var_decl(self) -> VarDecl:
@@ -203,6 +291,11 @@ class Parser:
         self._expect(TokenType.RPAREN); self._match(TokenType.SEMICOLON)
         return CommandCall(command_id, arg)
     
+    def _module_decl(self, cls):
+        name = self._expect(TokenType.IDENT).value
+        self._match(TokenType.SEMICOLON)
+        return cls(name)
+    
     def _print_stmt(self) -> PrintStmt:
         self._expect(TokenType.LPAREN); val = self._expression(); self._expect(TokenType.RPAREN)
         self._match(TokenType.SEMICOLON)
@@ -210,7 +303,12 @@ class Parser:
     
     def _block(self) -> Block:
         stmts = []
-        while not self._check(TokenType.RBRACE) and not self._at_end(): stmts.append(self._statement())
+        while not self._check(TokenType.RBRACE) and not self._done():
+            node = self._recovering_statement()
+            if node is not None: stmts.append(node)
+        if self.recover and self._at_end():
+            self.errors.append(Diagnostic(self._cur().line, f"Expected {TokenType.RBRACE}, got {TokenType.EOF}"))
+            return Block(stmts)
         self._expect(TokenType.RBRACE)
         return Block(stmts)
     
@@ -277,13 +375,147 @@ class Parser:
             expr = self._expression(); self._expect(TokenType.RPAREN); return expr
         raise SyntaxError(f"Unexpected token {self._cur().type} at line {self._cur().line}")
 
+class _Span(NamedTuple):
+    start: int; end: int; node: Optional[ASTNode]; errors: Tuple[Diagnostic, ...]
+
+class IncrementalParser:
+    """Recovering parser that keeps each top-level statement's token span, so
+    after an edit only the statements overlapping the changed tokens are
+    re-parsed. Statements before the edit are reused as-is; once the parser
+    lands on the start of an old statement past the edit, the remainder is
+    reused with its diagnostics moved by the line delta."""
+    def __init__(self):
+        self.tokens: List[Token] = []
+        self.spans: List[_Span] = []
+        self.reparsed = 0
+    
+    @property
+    def ast(self) -> List[ASTNode]: return [s.node for s in self.spans if s.node is not None]
+    @property
+    def errors(self) -> List[Diagnostic]: return [d for s in self.spans for d in s.errors]
+    
+    def parse(self, source: str) -> Tuple[List[ASTNode], List[Diagnostic]]:
+        tokens, old, spans = Lexer(source).tokenize(), self.tokens, self.spans
+        n = min(len(old), len(tokens))
+        prefix = 0
+        while prefix < n and old[prefix] == tokens[prefix]: prefix += 1
+        shift, delta = len(tokens) - len(old), tokens[-1].line - (old[-1].line if old else 1)
+        suffix = 0
+        while suffix < n - prefix:
+            a, b = old[-1 - suffix], tokens[-1 - suffix]
+            if (a.type, a.value, a.line + delta) != (b.type, b.value, b.line): break
+            suffix += 1
+        # A statement's parse peeks one token past its end, so that token must be unchanged too
+        kept = 0
+        while kept < len(spans) and spans[kept].end < prefix: kept += 1
+        new_spans, resume = spans[:kept], {s.start: i for i, s in enumerate(spans)}
+        parser = Parser(tokens, recover=True)
+        parser.pos, boundary, self.reparsed = new_spans[-1].end if new_spans else 0, len(tokens) - suffix, 0
+        while True:
+            start, mark = parser.pos, len(parser.errors)
+            if start >= boundary and start - shift in resume:
+                new_spans.extend(_Span(s.start + shift, s.end + shift, s.node,
+                                       tuple(d._replace(line=d.line + delta) for d in s.errors))
+                                 for s in spans[resume[start - shift]:])
+                break
+            if parser._done():
+                if parser.pos > start: new_spans.append(_Span(start, parser.pos, None, tuple(parser.errors[mark:])))
+                break
+            node = parser._recovering_statement(); self.reparsed += 1
+            new_spans.append(_Span(start, parser.pos, node, tuple(parser.errors[mark:])))
+        self.tokens, self.spans = tokens, new_spans
+        return self.ast, self.errors
+
+# Algebraic laws of the ring0 interfaces behind command(id, ...); ids outside 1..41 fall back to interface 31
+COMMAND_IDENTITIES = {31, 12}  # identity transform, contextual monoid unit
+COMMAND_INVOLUTIONS = {40}     # reflective conjugate duality: c(c(x)) = x
+COMMAND_IDEMPOTENT = {17}      # self-correction: c(c(x)) = c(x)
+COMMAND_RESULT_SETTERS = {13, 21}  # store _loss/_goodness in Omega, which every later command() returns
+
 class Optimizer:
-    """Axiom-based optimization passes"""
-    def optimize(self, ast: List[ASTNode]) -> List[ASTNode]:
+    """Axiom-based optimization passes.
+    
+    -O0 leaves the AST alone, -O1 (default) folds constants and drops dead
+    branches statement by statement, -O2 adds command() simplification and
+    the whole-program SSAOptimizer passes, and -O3 iterates the latter to a
+    fixed point. command() simplification needs a standalone program (one
+    that starts from a fresh Omega) that never runs a
+    COMMAND_RESULT_SETTERS command.
+    """
+    LEVELS = (0, 1, 2, 3)
+    
+    def __init__(self, level: int = 1, live: Set[str] = frozenset(), standalone: bool = True):
+        if level not in self.LEVELS: raise ValueError(f"Unknown optimization level -O{level}, expected one of {self.LEVELS}")
+        self.level = level
+        self.live = live  # globals read outside this AST (module exports)
+        self.standalone = standalone  # False for modules linked after others: Omega may already hold results
+        self.stats: Dict[str, int] = {}
+    
+    def optimize(self, ast: List[ASTNode], observer: Optional[Callable[[str, List[ASTNode]], None]] = None) -> List[ASTNode]:
+        """All passes for this level; observer(pass_name, ast) is called after each one"""
+        return self.optimize_program(self.optimize_statements(ast, observer), observer)
+    
+    def optimize_statements(self, ast: List[ASTNode], observer=None) -> List[ASTNode]:
+        """Local passes: each statement in isolation, so results can be cached per chunk"""
+        if self.level < 1: return ast
         ast = self._constant_fold(ast)
+        if observer: observer("constant_fold", ast)
         ast = self._dead_code_elim(ast)
+        if observer: observer("dead_code_elim", ast)
+        return ast
+    
+    def optimize_program(self, ast: List[ASTNode], observer=None) -> List[ASTNode]:
+        """Global passes over the whole program (-O2 and up)"""
+        if self.level < 2: return ast
+        self.stats = defaultdict(int)
+        if self.standalone and not _sets_result(ast): ast = self._simplify_commands(ast)
+        if observer: observer("simplify_commands", ast)
+        ssa = SSAOptimizer(rounds=4 if self.level >= 3 else 1, live=self.live)
+        ast = ssa.run(ast, observer)
+        for name, count in ssa.stats.items(): self.stats[name] += count
+        self.stats = dict(self.stats)
         return ast
     
+    def _simplify_commands(self, ast: List[ASTNode]) -> List[ASTNode]:
+        """Rewrite command() runs with the interface laws: drop identities, merge idempotents, cancel involution pairs.
+        
+        A run continues across declarations and statements that cannot reach Omega (no command or call inside). An elided
+        command keeps its stack shape as argument plus unchanged value; Omega marker keys of elided
+        interfaces (_identity, _monoid, _corrected, _involution) are not reproduced. Both only hold while
+        no command sets _loss/_goodness: from then on every command() returns that, computed from
+        everything earlier commands left in Omega (see _sets_result)."""
+        out, run = [], []  # run: indices in out of the commands still applied, innermost last
+        for stmt in ast:
+            stmt = self._simplify_nested(stmt)
+            if isinstance(stmt, CommandCall) and (stmt.arg is None or _is_pure(stmt.arg)):
+                cid = stmt.command_id
+                if cid in COMMAND_IDENTITIES or not 1 <= cid <= 41:
+                    out.append(self._elide(stmt)); continue
+                if run and out[run[-1]].command_id == cid:
+                    if cid in COMMAND_IDEMPOTENT:
+                        out.append(self._elide(stmt)); continue
+                    if cid in COMMAND_INVOLUTIONS:
+                        prev = run.pop()
+                        out[prev] = self._elide(out[prev]); out.append(self._elide(stmt)); continue
+                run.append(len(out))
+            elif isinstance(stmt, CommandCall): run = [len(out)]
+            elif not isinstance(stmt, FuncDecl) and any(isinstance(n, (CommandCall, FuncCall)) for n in _walk(stmt)): run = []
+            out.append(stmt)
+        return ast if _same(out, ast) else out
+    
+    def _simplify_nested(self, stmt: ASTNode) -> ASTNode:
+        if isinstance(stmt, FuncDecl): return _rebuild(stmt, body=self._simplify_commands(stmt.body))
+        if isinstance(stmt, (WhileStmt, ForStmt)): return _rebuild(stmt, body=self._simplify_commands(stmt.body))
+        if isinstance(stmt, Block): return _rebuild(stmt, statements=self._simplify_commands(stmt.statements))
+        if isinstance(stmt, IfStmt):
+            else_body = self._simplify_commands(stmt.else_body) if stmt.else_body is not None else None
+            return _rebuild(stmt, then_body=self._simplify_commands(stmt.then_body), else_body=else_body)
+        return stmt
+    
+    def _elide(self, cmd: CommandCall) -> PrintStmt:
+        self.stats["commands_removed"] += 1
+        return PrintStmt(cmd.arg if cmd.arg is not None else NumberLiteral(0))  # arg, DUP: same stack shape, no bus call
+    
     def _constant_fold(self, ast: List[ASTNode]) -> List[ASTNode]:
         def fold(node):
             if isinstance(node, BinaryOp):
@@ -302,47 +534,470 @@ class Optimizer:
     def _dead_code_elim(self, ast: List[ASTNode]) -> List[ASTNode]:
         result = []
         for stmt in ast:
-            if isinstance(stmt, IfStmt) and isinstance(stmt.cond, NumberLiteral):
+            if isinstance(stmt, IfStmt) and isinstance(stmt.cond, NumberLiteral) \
+                    and not _declares((stmt.else_body or []) if stmt.cond.value else stmt.then_body):
                 if stmt.cond.value: result.extend(stmt.then_body)
                 elif stmt.else_body: result.extend(stmt.else_body)
-            elif isinstance(stmt, WhileStmt) and isinstance(stmt.cond, NumberLiteral) and not stmt.cond.value:
+            elif isinstance(stmt, WhileStmt) and isinstance(stmt.cond, NumberLiteral) and not stmt.cond.value \
+                    and not _declares(stmt.body):
                 pass
             else: result.append(stmt)
         return result
 
-class CodeGenerator:
+def _same(a, b) -> bool:
+    if isinstance(a, list) and isinstance(b, list): return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+    return a is b
+
+def _rebuild(node: ASTNode, **changes) -> ASTNode:
+    """node itself when every changed field is identical, else a shallow copy (cached ASTs are never mutated)"""
+    if all(_same(getattr(node, k), v) for k, v in changes.items()): return node
+    return replace(node, **changes)
+
+def _walk(node: ASTNode) -> Iterator[ASTNode]:
+    yield node
+    for child in _children(node): yield from _walk(child)
+
+def _reads(node: ASTNode) -> Set[str]:
+    return {n.name for n in _walk(node) if isinstance(n, Identifier)}
+
+def _stores(node: ASTNode) -> Set[str]:
+    """Names whose slot a subtree may write or rebind (assignments, declarations, parameters)"""
+    names = set()
+    for n in _walk(node):
+        if isinstance(n, (Assignment, VarDecl)): names.add(n.name)
+        elif isinstance(n, FuncDecl): names.update(n.params)
+    return names
+
+def _declares(stmts: List[ASTNode]) -> bool:
+    """Whether stmts hold a let or fn: codegen binds its slot or entry for all the code after it,
+    whether or not it runs, so a branch that declares cannot be dropped unrun"""
+    return any(isinstance(n, (VarDecl, FuncDecl)) for stmt in stmts for n in _walk(stmt))
+
+def _redeclared(stmts: List[ASTNode], params: Tuple[str, ...] = ()) -> Set[str]:
+    """Names declared more than once in one scope (the top level or one fn's params and lets):
+    each declaration gets a fresh slot, so such a name is not a single variable"""
+    counts, nested, stack = Counter(params), [], list(stmts)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FuncDecl): nested.append(node); continue
+        if isinstance(node, VarDecl): counts[node.name] += 1
+        stack.extend(_children(node))
+    names = {name for name, count in counts.items() if count > 1}
+    for fn in nested: names |= _redeclared(fn.body, tuple(fn.params))
+    return names
+
+def _branch_lets(stmts: List[ASTNode]) -> List[VarDecl]:
+    """Lets inside if/while/for bodies (not in nested fns): they may not run, yet the code after them
+    reads their slot, which must start each activation at 0"""
+    lets = []
+    def walk(node, nested):
+        if isinstance(node, FuncDecl): return
+        if nested and isinstance(node, VarDecl): lets.append(node)
+        nested = nested or isinstance(node, (IfStmt, WhileStmt, ForStmt))
+        for child in _children(node): walk(child, nested)
+    for stmt in stmts: walk(stmt, False)
+    return lets
+
+def _tail_calls_self(fn: FuncDecl) -> bool:
+    return any(isinstance(n, ReturnStmt) and isinstance(n.value, FuncCall) and n.value.name == fn.name
+               and len(n.value.args) == len(fn.params) for stmt in fn.body for n in _walk(stmt))
+
+def _sets_result(ast: List[ASTNode]) -> bool:
+    """Whether a program may run a COMMAND_RESULT_SETTERS command (calls to undeclared fns yield 0)"""
+    return any(isinstance(n, CommandCall) and n.command_id in COMMAND_RESULT_SETTERS for stmt in ast for n in _walk(stmt))
+
+def _is_pure(node: ASTNode) -> bool:
+    return not any(isinstance(n, (FuncCall, Assignment)) for n in _walk(node))
+
+def _expr_key(node: ASTNode):
+    """Structural value key of a pure arithmetic expression, None for anything else"""
+    if isinstance(node, NumberLiteral): return ("num", int(node.value))
+    if isinstance(node, Identifier): return ("id", node.name)
+    if isinstance(node, BinaryOp):
+        left, right = _expr_key(node.left), _expr_key(node.right)
+        return None if left is None or right is None else ("bin", node.op, left, right)
+    if isinstance(node, UnaryOp):
+        operand = _expr_key(node.operand)
+        return None if operand is None else ("un", node.op, operand)
+    return None
+
+def _fold(node: ASTNode) -> Optional[NumberLiteral]:
+    """Evaluate an operator on literal operands exactly as the VM would (integer operands, DIV/MOD by zero -> 0)"""
+    if isinstance(node, BinaryOp) and isinstance(node.left, NumberLiteral) and isinstance(node.right, NumberLiteral):
+        return NumberLiteral(REG_BINOPS[BINOP_OPCODES[node.op]](int(node.left.value), int(node.right.value)))
+    if isinstance(node, UnaryOp) and isinstance(node.operand, NumberLiteral):
+        if node.op == '-': return NumberLiteral(-int(node.operand.value))
+        if node.op == '!': return NumberLiteral(~int(node.operand.value))
+    return None
+
+class _DataflowEnv:
+    """Facts valid at one program point: known values (literal or copied name) and available expressions"""
     def __init__(self):
+        self.values: Dict[str, ASTNode] = {}
+        self.avail: Dict[tuple, Tuple[str, frozenset]] = {}
+    
+    def copy(self) -> '_DataflowEnv':
+        env = _DataflowEnv()
+        env.values, env.avail = dict(self.values), dict(self.avail)
+        return env
+    
+    def kill(self, name: str):
+        """A new version of name: drop every fact that mentions it"""
+        self.values.pop(name, None)
+        for k in [k for k, v in self.values.items() if isinstance(v, Identifier) and v.name == name]: del self.values[k]
+        for k in [k for k, (holder, names) in self.avail.items() if holder == name or name in names]: del self.avail[k]
+    
+    def meet(self, other: '_DataflowEnv'):
+        """Phi at a control-flow join: keep the facts both predecessors agree on"""
+        self.values = {k: v for k, v in self.values.items() if k in other.values and _expr_key(other.values[k]) == _expr_key(v)}
+        self.avail = {k: v for k, v in self.avail.items() if other.avail.get(k) == v}
+
+class SSAOptimizer:
+    """Whole-program dataflow passes in SSA style over the structured AST.
+    
+    Every store starts a new version of its name; facts about the old version
+    are killed, and at if/else joins only facts both arms agree on survive (a
+    phi). Loops kill what their bodies store before the header is analysed,
+    which is the fixed point for this loop-structured language. A name
+    declared twice in one scope names a new slot from each declaration on,
+    whether or not it ran, so no facts are kept about it.
+    
+    - propagate: sparse conditional constant propagation (branches on known
+      conditions are pruned before they are analysed), copy propagation and
+      common-subexpression elimination against variables already holding
+      the value
+    - hoist: loop-invariant expressions move into temporaries before the loop
+    - dead stores: stores never read, or overwritten before any read
+    
+    Calls clobber every global a function body assigns. CommandCall
+    statements are side effects on Omega and are never moved or removed.
+    """
+    def __init__(self, rounds: int = 1, live: Set[str] = frozenset()):
+        self.rounds, self.live = rounds, set(live)
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._temps = 0
+    
+    def run(self, ast: List[ASTNode], observer: Optional[Callable[[str, List[ASTNode]], None]] = None) -> List[ASTNode]:
+        """Run the passes; observer(pass_name, ast) is called after each one"""
+        fns = [n for stmt in ast for n in _walk(stmt) if isinstance(n, FuncDecl)]
+        # params and lets are frame locals; only assignments can reach globals
+        self.clobbers = set().union(*({n.name for n in _walk(Block(fn.body)) if isinstance(n, Assignment)} - set(fn.params) for fn in fns))
+        self.fn_names = set().union(*(_reads(fn) | _stores(fn) for fn in fns))
+        self.unstable = _redeclared(ast)
+        for _ in range(self.rounds):
+            before = ast
+            self.declared = set()
+            ast = self._propagate_block(ast, _DataflowEnv())
+            if observer: observer("propagate", ast)
+            ast = self._hoist_block(ast)
+            if observer: observer("hoist", ast)
+            self.declared, self.dropped, self.declared_stores = set(), set(), set()
+            # a store with side effects stays whole (a bare call statement would leave its value on
+            # the stack), so the slot it stores to must stay declared too
+            kept = {n.name for stmt in ast for n in _walk(stmt) if isinstance(n, Assignment) and not _is_pure(n.value)}
+            ast = self._dead_store_block(ast, self.live.union(kept, *(_reads(stmt) for stmt in ast)))
+            if observer: observer("dead_stores", ast)
+            if _same(ast, before): break
+        return ast
+    
+    def _temp(self) -> str:
+        self._temps += 1
+        return f"$licm{self._temps}"  # '$' never lexes as an identifier, so no clash with user names
+    
+    # -- constant / copy propagation and CSE ---------------------------------
+    def _propagate_block(self, stmts: List[ASTNode], env: _DataflowEnv) -> List[ASTNode]:
+        out = []
+        for stmt in stmts:
+            new = self._propagate_stmt(stmt, env)
+            out.extend(new)
+            if new and isinstance(new[-1], ReturnStmt):
+                if len(out) < len(stmts): self.stats["unreachable"] += 1
+                break
+        return stmts if _same(out, stmts) else out
+    
+    def _propagate_stmt(self, stmt: ASTNode, env: _DataflowEnv) -> List[ASTNode]:
+        if isinstance(stmt, VarDecl):
+            init = self._expr(stmt.init, env) if stmt.init is not None else None
+            self.declared.add(stmt.name)
+            self._store(stmt.name, init if init is not None else NumberLiteral(0), env)
+            return [_rebuild(stmt, init=init)]
+        if isinstance(stmt, Assignment):
+            value = self._expr(stmt.value, env)
+            if stmt.name in self.declared: self._store(stmt.name, value, env)
+            return [_rebuild(stmt, value=value)]
+        if isinstance(stmt, FuncDecl):
+            outer, self.declared = self.declared, self.declared | set(stmt.params)
+            body = self._propagate_block(stmt.body, _DataflowEnv())
+            self.declared = outer
+            return [_rebuild(stmt, body=body)]
+        if isinstance(stmt, IfStmt):
+            cond = self._expr(stmt.cond, env)
+            taken, dropped = (stmt.then_body, stmt.else_body or []) if isinstance(cond, NumberLiteral) and int(cond.value) \
+                else (stmt.else_body or [], stmt.then_body)
+            if isinstance(cond, NumberLiteral) and not _declares(dropped):
+                self.stats["branches"] += 1
+                return self._propagate_block(taken, env)
+            then_env, else_env = env.copy(), env.copy()
+            then_body = self._propagate_block(stmt.then_body, then_env)
+            else_body = self._propagate_block(stmt.else_body, else_env) if stmt.else_body is not None else None
+            then_env.meet(else_env)
+            env.values, env.avail = then_env.values, then_env.avail
+            return [_rebuild(stmt, cond=cond, then_body=then_body, else_body=else_body)]
+        if isinstance(stmt, (WhileStmt, ForStmt)):
+            init = self._propagate_stmt(stmt.init, env)[0] if isinstance(stmt, ForStmt) else None
+            for name in self._loop_stores(stmt): env.kill(name)
+            cond = self._expr(stmt.cond, env)
+            if isinstance(cond, NumberLiteral) and not int(cond.value) and not _declares(stmt.body):
+                self.stats["branches"] += 1
+                return [init] if init is not None else []
+            body_env = env.copy()
+            body = self._propagate_block(stmt.body, body_env)
+            if isinstance(stmt, WhileStmt): return [_rebuild(stmt, cond=cond, body=body)]
+            return [_rebuild(stmt, init=init, cond=cond, body=body, update=self._expr(stmt.update, body_env))]
+        if isinstance(stmt, ReturnStmt):
+            return [_rebuild(stmt, value=self._expr(stmt.value, env) if stmt.value is not None else None)]
+        if isinstance(stmt, CommandCall):
+            return [_rebuild(stmt, arg=self._expr(stmt.arg, env) if stmt.arg is not None else None)]
+        if isinstance(stmt, PrintStmt): return [_rebuild(stmt, value=self._expr(stmt.value, env))]
+        if isinstance(stmt, Block): return [_rebuild(stmt, statements=self._propagate_block(stmt.statements, env))]
+        return [self._expr(stmt, env)]
+    
+    def _store(self, name: str, value: ASTNode, env: _DataflowEnv):
+        env.kill(name)
+        if name in self.unstable or _reads(value) & self.unstable: return
+        if isinstance(value, NumberLiteral): env.values[name] = NumberLiteral(int(value.value))
+        elif isinstance(value, Identifier):
+            if value.name in self.declared and value.name != name: env.values[name] = value
+        elif isinstance(value, (BinaryOp, UnaryOp)) and _expr_key(value) is not None:
+            names = _reads(value)
+            if name not in names: env.avail[_expr_key(value)] = (name, frozenset(names))
+    
+    def _loop_stores(self, loop: ASTNode) -> Set[str]:
+        """Names a loop's condition, body or update can change on some iteration"""
+        parts = [loop.cond, Block(loop.body)] + ([loop.update] if isinstance(loop, ForStmt) else [])
+        names = set().union(*(_stores(p) for p in parts))
+        if any(isinstance(n, FuncCall) for p in parts for n in _walk(p)): names |= self.clobbers
+        return names
+    
+    def _expr(self, node: ASTNode, env: _DataflowEnv) -> ASTNode:
+        if isinstance(node, Identifier):
+            value = env.values.get(node.name)
+            if value is None: return node
+            self.stats["propagated"] += 1
+            return value
+        if isinstance(node, (BinaryOp, UnaryOp)):
+            if isinstance(node, BinaryOp): new = _rebuild(node, left=self._expr(node.left, env), right=self._expr(node.right, env))
+            else: new = _rebuild(node, operand=self._expr(node.operand, env))
+            folded = _fold(new)
+            if folded is not None:
+                self.stats["folded"] += 1
+                return folded
+            key = _expr_key(new)
+            if key in env.avail:
+                self.stats["cse"] += 1
+                return Identifier(env.avail[key][0])
+            return new
+        if isinstance(node, FuncCall):
+            new = _rebuild(node, args=[self._expr(a, env) for a in node.args])
+            for name in self.clobbers: env.kill(name)
+            return new
+        return node
+    
+    # -- loop-invariant code motion ------------------------------------------
+    def _hoist_block(self, stmts: List[ASTNode]) -> List[ASTNode]:
+        out = []
+        for stmt in stmts: out.extend(self._hoist_stmt(stmt))
+        return stmts if _same(out, stmts) else out
+    
+    def _hoist_stmt(self, stmt: ASTNode) -> List[ASTNode]:
+        if isinstance(stmt, FuncDecl): return [_rebuild(stmt, body=self._hoist_block(stmt.body))]
+        if isinstance(stmt, Block): return [_rebuild(stmt, statements=self._hoist_block(stmt.statements))]
+        if isinstance(stmt, IfStmt):
+            else_body = self._hoist_block(stmt.else_body) if stmt.else_body is not None else None
+            return [_rebuild(stmt, then_body=self._hoist_block(stmt.then_body), else_body=else_body)]
+        if not isinstance(stmt, (WhileStmt, ForStmt)): return [stmt]
+        loop = _rebuild(stmt, body=self._hoist_block(stmt.body))  # inner loops first
+        varying = self._loop_stores(loop) | (_stores(loop.init) if isinstance(loop, ForStmt) else set())
+        hoisted: Dict[tuple, VarDecl] = {}
+        
+        def sub(e: ASTNode) -> ASTNode:
+            if isinstance(e, (BinaryOp, UnaryOp)):
+                key, names = _expr_key(e), _reads(e)
+                if key is not None and names and not names & varying:
+                    if key not in hoisted: hoisted[key] = VarDecl(self._temp(), e)
+                    return Identifier(hoisted[key].name)
+                if isinstance(e, BinaryOp): return _rebuild(e, left=sub(e.left), right=sub(e.right))
+                return _rebuild(e, operand=sub(e.operand))
+            if isinstance(e, FuncCall): return _rebuild(e, args=[sub(a) for a in e.args])
+            return e
+        
+        def sub_stmt(s: ASTNode) -> ASTNode:
+            if isinstance(s, VarDecl): return _rebuild(s, init=sub(s.init) if s.init is not None else None)
+            if isinstance(s, Assignment): return _rebuild(s, value=sub(s.value))
+            if isinstance(s, IfStmt):
+                else_body = [sub_stmt(x) for x in s.else_body] if s.else_body is not None else None
+                return _rebuild(s, cond=sub(s.cond), then_body=[sub_stmt(x) for x in s.then_body], else_body=else_body)
+            if isinstance(s, WhileStmt): return _rebuild(s, cond=sub(s.cond), body=[sub_stmt(x) for x in s.body])
+            if isinstance(s, ForStmt):
+                return _rebuild(s, init=sub_stmt(s.init), cond=sub(s.cond), update=sub(s.update), body=[sub_stmt(x) for x in s.body])
+            if isinstance(s, ReturnStmt): return _rebuild(s, value=sub(s.value) if s.value is not None else None)
+            if isinstance(s, CommandCall): return _rebuild(s, arg=sub(s.arg) if s.arg is not None else None)
+            if isinstance(s, PrintStmt): return _rebuild(s, value=sub(s.value))
+            if isinstance(s, Block): return _rebuild(s, statements=[sub_stmt(x) for x in s.statements])
+            if isinstance(s, FuncDecl): return s
+            return sub(s)
+        
+        changes = {"cond": sub(loop.cond), "body": [sub_stmt(x) for x in loop.body]}
+        if isinstance(loop, ForStmt): changes["update"] = sub(loop.update)
+        if not hoisted: return [loop]
+        self.stats["hoisted"] += len(hoisted)
+        return list(hoisted.values()) + [_rebuild(loop, **changes)]
+    
+    # -- dead-store elimination ----------------------------------------------
+    def _dead_store_block(self, stmts: List[ASTNode], reads: Set[str]) -> List[ASTNode]:
+        out = []
+        for stmt in stmts:
+            new = self._dead_store_stmt(stmt, reads)
+            if new is not None: out.append(new)
+        # backward scan: a store overwritten before any read in the same straight-line run is dead
+        pending: Dict[str, str] = {}
+        kept = []
+        for stmt in reversed(out):
+            if isinstance(stmt, Assignment) and id(stmt) in self.declared_stores and _is_pure(stmt.value):
+                if pending.get(stmt.name) == "assign": self.stats["dead_stores"] += 1; continue
+                pending[stmt.name] = "assign"
+                for name in _reads(stmt.value): pending.pop(name, None)  # x = x + 1 reads the store before it
+            elif isinstance(stmt, VarDecl) and (stmt.init is None or _is_pure(stmt.init)):
+                # earlier functions may still read the old slot of a redeclared name
+                if pending.get(stmt.name) == "decl" and stmt.name not in self.fn_names: self.stats["dead_stores"] += 1; continue
+                pending[stmt.name] = "decl"
+                for name in _reads(stmt.init) if stmt.init is not None else (): pending.pop(name, None)
+            elif isinstance(stmt, (CommandCall, PrintStmt, BinaryOp, UnaryOp, Identifier, NumberLiteral)) and _is_pure(stmt):
+                for name in _reads(stmt): pending.pop(name, None)
+            else: pending.clear()
+            kept.append(stmt)
+        kept.reverse()
+        return stmts if _same(kept, stmts) else kept
+    
+    def _dead_store_stmt(self, stmt: ASTNode, reads: Set[str]) -> Optional[ASTNode]:
+        """Forward pass in codegen order: drop stores to names nothing ever reads"""
+        if isinstance(stmt, VarDecl):
+            if stmt.name in reads or (stmt.init is not None and not _is_pure(stmt.init)):
+                self.declared.add(stmt.name)
+                return stmt
+            self.dropped.add(stmt.name); self.stats["dead_stores"] += 1
+            return None
+        if isinstance(stmt, Assignment):
+            if (stmt.name in self.dropped or (stmt.name in self.declared and stmt.name not in reads)) and _is_pure(stmt.value):
+                self.stats["dead_stores"] += 1
+                return None
+            if stmt.name in self.declared: self.declared_stores.add(id(stmt))
+            return stmt  # undeclared: codegen leaves the value on the stack, keep as is
+        if isinstance(stmt, FuncDecl):
+            outer = (self.declared, self.dropped)
+            self.declared, self.dropped = self.declared | set(stmt.params), self.dropped - set(stmt.params)
+            body = self._dead_store_block(stmt.body, reads)
+            self.declared, self.dropped = outer
+            return _rebuild(stmt, body=body)
+        if isinstance(stmt, IfStmt):
+            else_body = self._dead_store_block(stmt.else_body, reads) if stmt.else_body is not None else None
+            return _rebuild(stmt, then_body=self._dead_store_block(stmt.then_body, reads), else_body=else_body)
+        if isinstance(stmt, WhileStmt): return _rebuild(stmt, body=self._dead_store_block(stmt.body, reads))
+        if isinstance(stmt, ForStmt):
+            if isinstance(stmt.init, VarDecl): self.declared.add(stmt.init.name)
+            return _rebuild(stmt, body=self._dead_store_block(stmt.body, reads))
+        if isinstance(stmt, Block): return _rebuild(stmt, statements=self._dead_store_block(stmt.statements, reads))
+        return stmt
+
+INLINE_BUDGET = 24  # AST nodes; smaller fn bodies are expanded at their call sites
+INLINE_DEPTH = 4
+
+class CodeGenerator:
+    """Stack-VM code generator.
+    
+    Top-level lets are globals (LOADG/STOREG). Params and lets inside a fn
+    live in its call frame (LOADL/STOREL), so recursion keeps its own copies.
+    Calls to small non-recursive fns whose only return is their last
+    statement are inlined, and a fn's tail calls to itself jump back to its
+    entry instead of growing the call stack. An inlined body sees the globals,
+    fns and inlinable fns declared before it, like the fn's own code. Both
+    reuse frame slots, so they zero the slots of lets in branch and loop
+    bodies on entry, as a fresh frame would.
+    
+    Only top-level statements leave values on the stack (print, command()
+    and bare calls): the final stack is the program's output. Inside a fn
+    or an inlined body they leave the stack as they found it, so a call in
+    an expression never buries its caller's operands. A call to an
+    undeclared fn evaluates its args and yields 0, as on the other backends.
+    """
+    def __init__(self, inline_budget: int = INLINE_BUDGET):
         self.code: List[Instruction] = []
         self.vars: Dict[str, int] = {}
         self.funcs: Dict[str, int] = {}
         self.var_counter = 0
+        self.locals: Optional[Dict[str, int]] = None  # current fn's frame slots; None at top level
+        self.frame_size = 0  # slots in use in the current frame (top level: inline temporaries)
+        self.inline_budget = inline_budget
+        self.inlinable: Dict[str, Tuple[FuncDecl, Dict[str, int], Dict[str, int], Dict[str, tuple]]] = {}
+        self.current_fn: Optional[FuncDecl] = None  # for tail calls
+        self.inline_depth = 0
+        self.zeroing: Dict[int, int] = {}  # id of a branch let -> its zeroing STOREL, patched once it has a slot
     
     def generate(self, ast: List[ASTNode]) -> List[Instruction]:
         for stmt in ast: self._gen_stmt(stmt)
         self.code.append(Instruction(OpCode.HALT))
         return self.code
     
+    def _load(self, name: str):
+        if self.locals is not None and name in self.locals: self.code.append(Instruction(OpCode.LOADL, self.locals[name]))
+        elif name in self.vars: self.code.append(Instruction(OpCode.LOADG, self.vars[name]))
+        else: self.code.append(Instruction(OpCode.PUSH, 0))
+    
+    def _store(self, name: str) -> bool:
+        if self.locals is not None and name in self.locals: self.code.append(Instruction(OpCode.STOREL, self.locals[name]))
+        elif name in self.vars: self.code.append(Instruction(OpCode.STOREG, self.vars[name]))
+        else: return False
+        return True
+    
+    def _discard(self, count: int):
+        """Drop the values a statement leaves, unless it is top-level code (whose values are the output)"""
+        if self.locals is not None: self.code.extend(Instruction(OpCode.POP) for _ in range(count))
+    
+    def _declare(self, name: str):
+        if self.locals is not None:
+            self.locals[name] = self.frame_size; self.frame_size += 1
+        else:
+            self.vars[name] = self.var_counter; self.var_counter += 1
+        self._store(name)
+    
+    def _zero_branch_lets(self, stmts: List[ASTNode]):
+        for let in _branch_lets(stmts):
+            self.code.append(Instruction(OpCode.PUSH, 0))
+            self.zeroing[id(let)] = len(self.code); self.code.append(Instruction(OpCode.STOREL, 0))
+    
     def _gen_stmt(self, node: ASTNode):
         if isinstance(node, VarDecl):
             if node.init: self._gen_expr(node.init)
             else: self.code.append(Instruction(OpCode.PUSH, 0))
-            self.vars[node.name] = self.var_counter
-            self.code.append(Instruction(OpCode.STOREG, self.var_counter))
-            self.var_counter += 1
+            self._declare(node.name)
+            if id(node) in self.zeroing: self.code[self.zeroing.pop(id(node))] = Instruction(OpCode.STOREL, self.locals[node.name])
         elif isinstance(node, Assignment):
             self._gen_expr(node.value)
-            if node.name in self.vars: self.code.append(Instruction(OpCode.STOREG, self.vars[node.name]))
+            if not self._store(node.name): self._discard(1)
         elif isinstance(node, FuncDecl):
-            self.funcs[node.name] = len(self.code)
             jmp_over = len(self.code); self.code.append(Instruction(OpCode.JMP, 0))
             self.funcs[node.name] = len(self.code)
-            for i, p in enumerate(node.params): self.vars[p] = self.var_counter; self.var_counter += 1
+            outer = (self.locals, self.frame_size, self.current_fn)
+            self.locals, self.frame_size, self.current_fn = {p: i for i, p in enumerate(node.params)}, len(node.params), node
+            for p in reversed(node.params): self.code.append(Instruction(OpCode.STOREL, self.locals[p]))  # args pushed left to right
+            if _tail_calls_self(node): self._zero_branch_lets(node.body)  # a tail call re-enters this frame
             for stmt in node.body: self._gen_stmt(stmt)
+            self.code.append(Instruction(OpCode.PUSH, 0))  # falling off the end returns 0
             self.code.append(Instruction(OpCode.RET))
+            self.locals, self.frame_size, self.current_fn = outer
             self.code[jmp_over] = Instruction(OpCode.JMP, len(self.code))
-        elif isinstance(node, FuncCall):
-            for arg in node.args: self._gen_expr(arg)
-            if node.name in self.funcs: self.code.append(Instruction(OpCode.CALL, self.funcs[node.name]))
+            self._register_fn(node)
+        elif isinstance(node, FuncCall): self._gen_call(node); self._discard(1)
         elif isinstance(node, IfStmt):
             self._gen_expr(node.cond)
             jz_addr = len(self.code); self.code.append(Instruction(OpCode.JZ, 0))
@@ -371,50 +1026,991 @@ class CodeGenerator:
             self.code.append(Instruction(OpCode.JMP, loop_start))
             self.code[jz_addr] = Instruction(OpCode.JZ, len(self.code))
         elif isinstance(node, ReturnStmt):
+            fn, call = self.current_fn, node.value
+            if fn is not None and isinstance(call, FuncCall) and call.name == fn.name and len(call.args) == len(fn.params):
+                for arg in call.args: self._gen_expr(arg)
+                self.code.append(Instruction(OpCode.JMP, self.funcs[fn.name]))  # tail call: re-run the prologue in place
+                return
             if node.value: self._gen_expr(node.value)
+            elif self.locals is not None: self.code.append(Instruction(OpCode.PUSH, 0))
             self.code.append(Instruction(OpCode.RET))
         elif isinstance(node, CommandCall):
             if node.arg: self._gen_expr(node.arg)
             else: self.code.append(Instruction(OpCode.PUSH, 0))
             self.code.append(Instruction(OpCode.COMMAND, node.command_id))
+            self._discard(2)  # the arg and the command's value
         elif isinstance(node, PrintStmt):
             self._gen_expr(node.value)
-            self.code.append(Instruction(OpCode.DUP))
+            self.code.append(Instruction(OpCode.DUP if self.locals is None else OpCode.POP))
         elif isinstance(node, Block):
             for stmt in node.statements: self._gen_stmt(stmt)
+        elif isinstance(node, (ModuleDecl, ImportDecl)): pass  # resolved by build_project
         else: self._gen_expr(node); self.code.append(Instruction(OpCode.POP))
     
     def _gen_expr(self, node: ASTNode):
         if isinstance(node, NumberLiteral): self.code.append(Instruction(OpCode.PUSH, int(node.value)))
-        elif isinstance(node, Identifier):
-            if node.name in self.vars: self.code.append(Instruction(OpCode.LOADG, self.vars[node.name]))
-            else: self.code.append(Instruction(OpCode.PUSH, 0))
+        elif isinstance(node, Identifier): self._load(node.name)
         elif isinstance(node, BinaryOp):
             self._gen_expr(node.left); self._gen_expr(node.right)
-            ops = {'+': OpCode.ADD, '-': OpCode.SUB, '*': OpCode.MUL, '/': OpCode.DIV, '%': OpCode.MOD,
-                   '==': OpCode.EQ, '!=': OpCode.NE, '<': OpCode.LT, '>': OpCode.GT, '<=': OpCode.LE, '>=': OpCode.GE,
-                   '&&': OpCode.AND, '||': OpCode.OR}
-            self.code.append(Instruction(ops.get(node.op, OpCode.NOP)))
+            self.code.append(Instruction(BINOP_OPCODES.get(node.op, OpCode.NOP)))
         elif isinstance(node, UnaryOp):
             self._gen_expr(node.operand)
             if node.op == '-': self.code.append(Instruction(OpCode.NEG))
             elif node.op == '!': self.code.append(Instruction(OpCode.NOT))
-        elif isinstance(node, FuncCall):
-            for arg in node.args: self._gen_expr(arg)
-            if node.name in self.funcs: self.code.append(Instruction(OpCode.CALL, self.funcs[node.name]))
+        elif isinstance(node, FuncCall): self._gen_call(node)
+    
+    def _gen_call(self, node: FuncCall):
+        fn = self.inlinable.get(node.name)
+        if fn is not None and len(node.args) == len(fn[0].params) and self.inline_depth < INLINE_DEPTH:
+            return self._inline(node)
+        for arg in node.args: self._gen_expr(arg)
+        if node.name in self.funcs: self.code.append(Instruction(OpCode.CALL, self.funcs[node.name]))
+        else:  # undeclared: keep the args' side effects, the value is 0
+            self.code.extend(Instruction(OpCode.POP) for _ in node.args)
+            self.code.append(Instruction(OpCode.PUSH, 0))
+    
+    def _register_fn(self, node: FuncDecl):
+        """Remember a just-declared fn for inlining if it is small, non-recursive and returns only at its end"""
+        body = Block(node.body)
+        nodes = list(_walk(body))
+        if (len(nodes) <= self.inline_budget and node.body and isinstance(node.body[-1], ReturnStmt)
+                and node.body[-1].value is not None
+                and sum(isinstance(n, ReturnStmt) for n in nodes) == 1
+                and not any(isinstance(n, FuncDecl) or (isinstance(n, FuncCall) and n.name == node.name) for n in nodes)):
+            self.inlinable[node.name] = (node, dict(self.vars), dict(self.funcs), dict(self.inlinable))
+        else: self.inlinable.pop(node.name, None)
+    
+    def _inline(self, call: FuncCall):
+        """Expand a call in place: args go to fresh slots of the current frame, the body sees the callee's
+        globals, fns and inlinable fns"""
+        fn, globals_, funcs, inlinable = self.inlinable[call.name]
+        for arg in call.args: self._gen_expr(arg)
+        saved = (self.locals, self.vars, self.funcs, self.inlinable, self.current_fn, self.frame_size)
+        slots = {p: self.frame_size + i for i, p in enumerate(fn.params)}
+        for p in reversed(fn.params): self.code.append(Instruction(OpCode.STOREL, slots[p]))
+        self._zero_branch_lets(fn.body)  # earlier expansions may have left values in these slots
+        self.locals, self.vars, self.funcs, self.inlinable, self.current_fn = slots, globals_, funcs, inlinable, None
+        self.frame_size += len(fn.params)
+        self.inline_depth += 1
+        try:
+            for stmt in fn.body[:-1]: self._gen_stmt(stmt)
+            self._gen_expr(fn.body[-1].value)
+        finally:
+            self.locals, self.vars, self.funcs, self.inlinable, self.current_fn, self.frame_size = saved  # temporaries are dead now
+            self.inline_depth -= 1
 
-class MadladCompiler:
+# Register-machine operand roles, used by the allocator to find defs and uses
+REG_DEF_OPS = set(BINOP_OPCODES.values()) | {OpCode.XOR, OpCode.NEG, OpCode.NOT, OpCode.LOADI, OpCode.MOV,
+                                             OpCode.LOADG, OpCode.LOAD, OpCode.COMMAND, OpCode.ANALYSIS,
+                                             OpCode.CALL, OpCode.RELOAD}
+REG_USE_FIELDS = {op: ("a", "b") for op in set(BINOP_OPCODES.values()) | {OpCode.XOR, OpCode.STORE, OpCode.ANALYSIS}}
+REG_USE_FIELDS.update({op: ("a",) for op in (OpCode.NEG, OpCode.NOT, OpCode.MOV, OpCode.STOREG, OpCode.JZ,
+                                             OpCode.JNZ, OpCode.RET, OpCode.COMMAND, OpCode.LOAD, OpCode.SPILL)})
+REG_JUMP_OPS = {OpCode.JMP, OpCode.JZ, OpCode.JNZ, OpCode.CALL}
+ACC = 0  # virtual and physical r0: program result
+
+class RegisterCodeGenerator:
+    """Three-address codegen into virtual registers for MadladRegisterVM.
+    
+    Variables live in virtual registers unless a function body refers to
+    them or a branch or loop body declares them, in which case they keep a
+    global slot like CodeGenerator's (a slot whose let never ran reads 0, a
+    reused register would not). Each let gets a fresh register or slot. A
+    fn's params and lets get a slot range of their own that goes out of
+    scope after its body; a recursive call copies that range into registers
+    before storing its args and writes it back after CALL, so each
+    activation keeps its values (CALL saves the register file). Slots
+    outlive calls, so a fn zeroes the slots of its branch and loop lets on
+    entry. Literal right operands fold into the instruction's immediate.
+    """
+    def __init__(self, num_regs: int = 16):
+        self.code: List[RegInstruction] = []
+        self.vars: Dict[str, Tuple[str, int]] = {}
+        self.funcs: Dict[str, int] = {}
+        self.func_params: Dict[str, List[int]] = {}
+        self.frame_starts: Dict[str, int] = {}  # fns being generated -> first slot of their range
+        self.var_counter = 0
+        self.vreg_counter = ACC + 1
+        self.var_vregs: Set[int] = set()
+        self.escaped: Set[str] = set()
+        self.zeroing: Dict[int, int] = {}  # id of a fn's branch let -> its zeroing STOREG, patched once it has a slot
+        self.allocator = LinearScanAllocator(num_regs)
+    
+    def generate(self, ast: List[ASTNode]) -> List[RegInstruction]:
+        self.escaped = self._slot_names(ast)
+        for stmt in ast: self._gen_stmt(stmt)
+        self._emit(OpCode.HALT)
+        return self.allocator.allocate(self.code, self.var_vregs)
+    
+    def _slot_names(self, ast: List[ASTNode]) -> Set[str]:
+        """Names that keep global slots: those a fn body refers to, and lets in branch or loop bodies"""
+        names = set()
+        def walk(node, inside, nested):
+            if isinstance(node, FuncDecl): inside = True; names.update(node.params)
+            if inside and isinstance(node, (Identifier, Assignment, VarDecl)): names.add(node.name)
+            if nested and isinstance(node, VarDecl): names.add(node.name)
+            nested = nested or isinstance(node, (IfStmt, WhileStmt, ForStmt))
+            for child in _children(node): walk(child, inside, nested)
+        for stmt in ast: walk(stmt, False, False)
+        return names
+    
+    def _emit(self, op: OpCode, dst: int = 0, a: int = NO_REG, b: int = NO_REG, imm: int = 0) -> int:
+        self.code.append(RegInstruction(op, dst, a, b, imm))
+        return len(self.code) - 1
+    
+    def _new(self) -> int:
+        self.vreg_counter += 1
+        return self.vreg_counter - 1
+    
+    def _gen_stmt(self, node: ASTNode):
+        if isinstance(node, VarDecl):
+            if node.name in self.escaped:
+                r = self._gen_expr(node.init) if node.init else self._gen_expr(NumberLiteral(0))
+                self.vars[node.name] = ("global", self.var_counter)
+                self._emit(OpCode.STOREG, a=r, imm=self.var_counter)
+                if id(node) in self.zeroing: self.code[self.zeroing.pop(id(node))].imm = self.var_counter
+                self.var_counter += 1
+            else:
+                r = self._new(); self.var_vregs.add(r)
+                self._gen_expr(node.init if node.init else NumberLiteral(0), r)
+                self.vars[node.name] = ("reg", r)
+        elif isinstance(node, Assignment): self._gen_expr(node)
+        elif isinstance(node, FuncDecl):
+            jmp_over = self._emit(OpCode.JMP)
+            self.funcs[node.name] = len(self.code)
+            self.func_params[node.name] = []
+            self.frame_starts[node.name] = self.var_counter
+            outer = dict(self.vars)
+            for p in node.params:
+                self.vars[p] = ("global", self.var_counter)
+                self.func_params[node.name].append(self.var_counter); self.var_counter += 1
+            lets = _branch_lets(node.body)
+            if lets:  # the previous call may have run them
+                zero = self._new(); self._emit(OpCode.LOADI, zero, imm=0)
+                for let in lets: self.zeroing[id(let)] = self._emit(OpCode.STOREG, a=zero)
+            for stmt in node.body: self._gen_stmt(stmt)
+            self._emit(OpCode.RET)
+            del self.frame_starts[node.name]
+            self.vars = outer  # params and lets are the fn's own
+            self.code[jmp_over].imm = len(self.code)
+        elif isinstance(node, IfStmt):
+            jz = self._emit(OpCode.JZ, a=self._gen_expr(node.cond))
+            for stmt in node.then_body: self._gen_stmt(stmt)
+            if node.else_body:
+                jmp_end = self._emit(OpCode.JMP)
+                self.code[jz].imm = len(self.code)
+                for stmt in node.else_body: self._gen_stmt(stmt)
+                self.code[jmp_end].imm = len(self.code)
+            else: self.code[jz].imm = len(self.code)
+        elif isinstance(node, (WhileStmt, ForStmt)):
+            if isinstance(node, ForStmt): self._gen_stmt(node.init)
+            loop_start = len(self.code)
+            jz = self._emit(OpCode.JZ, a=self._gen_expr(node.cond))
+            for stmt in node.body: self._gen_stmt(stmt)
+            if isinstance(node, ForStmt): self._gen_expr(node.update)
+            self._emit(OpCode.JMP, imm=loop_start)
+            self.code[jz].imm = len(self.code)
+        elif isinstance(node, ReturnStmt):
+            self._emit(OpCode.RET, a=self._gen_expr(node.value) if node.value else NO_REG)
+        elif isinstance(node, CommandCall):
+            arg = self._gen_expr(node.arg if node.arg else NumberLiteral(0))
+            self._emit(OpCode.COMMAND, ACC, a=arg, imm=node.command_id)
+        elif isinstance(node, PrintStmt): self._gen_expr(node.value, ACC)
+        elif isinstance(node, Block):
+            for stmt in node.statements: self._gen_stmt(stmt)
+        elif isinstance(node, (ModuleDecl, ImportDecl)): pass
+        else: self._gen_expr(node, ACC)
+    
+    def _gen_expr(self, node: ASTNode, dst: Optional[int] = None) -> int:
+        """Emit code leaving node's value in a register (dst when given) and return that register"""
+        if isinstance(node, Identifier) and node.name in self.vars:
+            kind, slot = self.vars[node.name]
+            if kind == "reg":
+                if dst is None or dst == slot: return slot
+                self._emit(OpCode.MOV, dst, a=slot); return dst
+            d = self._new() if dst is None else dst
+            self._emit(OpCode.LOADG, d, imm=slot); return d
+        if isinstance(node, BinaryOp) and node.op in BINOP_OPCODES:
+            a = self._gen_expr(node.left)
+            if isinstance(node.right, NumberLiteral): b, imm = NO_REG, int(node.right.value)
+            else: b, imm = self._gen_expr(node.right), 0
+            d = self._new() if dst is None else dst
+            self._emit(BINOP_OPCODES[node.op], d, a, b, imm); return d
+        if isinstance(node, UnaryOp) and node.op in ('-', '!'):
+            a = self._gen_expr(node.operand)
+            d = self._new() if dst is None else dst
+            self._emit(OpCode.NEG if node.op == '-' else OpCode.NOT, d, a=a); return d
+        if isinstance(node, FuncCall) and node.name in self.funcs:
+            args = [self._gen_expr(arg) for arg in node.args]
+            live = range(self.frame_starts.get(node.name, self.var_counter), self.var_counter)  # recursive: the live frame
+            saved = [(slot, self._new()) for slot in live]
+            for slot, r in saved: self._emit(OpCode.LOADG, r, imm=slot)
+            for slot, r in zip(self.func_params[node.name], args): self._emit(OpCode.STOREG, a=r, imm=slot)
+            d = self._new() if dst is None else dst
+            self._emit(OpCode.CALL, d, imm=self.funcs[node.name])
+            for slot, r in saved: self._emit(OpCode.STOREG, a=r, imm=slot)
+            return d
+        if isinstance(node, Assignment) and node.name in self.vars:
+            kind, slot = self.vars[node.name]
+            if kind == "reg": r = self._gen_expr(node.value, slot)
+            else: r = self._gen_expr(node.value); self._emit(OpCode.STOREG, a=r, imm=slot)
+            if dst is None or dst == r: return r
+            self._emit(OpCode.MOV, dst, a=r); return dst
+        if isinstance(node, (FuncCall, Assignment)):
+            # Unknown target: keep argument side effects, value is 0
+            for child in _children(node): self._gen_expr(child)
+        d = self._new() if dst is None else dst
+        self._emit(OpCode.LOADI, d, imm=int(node.value) if isinstance(node, NumberLiteral) else 0)
+        return d
+
+class LinearScanAllocator:
+    """Linear-scan register allocation (Poletto & Sarkar) onto a fixed register file.
+    
+    r0 is pinned to the result accumulator and the top SCRATCH registers are
+    reserved for reloading spilled operands. Variable intervals that cross a
+    loop back-edge are widened to the whole loop so values survive iterations.
+    """
+    SCRATCH = 3
+    
+    def __init__(self, num_regs: int = 16):
+        if num_regs < self.SCRATCH + 2: raise ValueError(f"Need at least {self.SCRATCH + 2} registers")
+        self.num_regs = num_regs
+        self.spill_slots = 0
+    
+    def allocate(self, code: List[RegInstruction], variables: Set[int] = frozenset()) -> List[RegInstruction]:
+        intervals = self._intervals(code, variables)
+        assignment, spilled = self._scan(intervals)
+        return self._rewrite(code, assignment, spilled)
+    
+    def _intervals(self, code: List[RegInstruction], variables: Set[int]) -> Dict[int, List[int]]:
+        intervals: Dict[int, List[int]] = {}
+        def touch(vreg, i):
+            if vreg == ACC: return
+            iv = intervals.setdefault(vreg, [i, i]); iv[1] = i
+        for i, ins in enumerate(code):
+            for f in REG_USE_FIELDS.get(ins.opcode, ()):
+                r = getattr(ins, f)
+                if r != NO_REG: touch(r, i)
+            if ins.opcode in REG_DEF_OPS: touch(ins.dst, i)
+        loops = [(ins.imm, j) for j, ins in enumerate(code)
+                 if ins.opcode in (OpCode.JMP, OpCode.JZ, OpCode.JNZ) and ins.imm <= j]
+        changed = True
+        while changed:
+            changed = False
+            for start, end in loops:
+                for vreg in variables:
+                    iv = intervals.get(vreg)
+                    if iv and iv[0] <= end and iv[1] >= start and (iv[0] > start or iv[1] < end):
+                        iv[0], iv[1] = min(iv[0], start), max(iv[1], end); changed = True
+        return intervals
+    
+    def _scan(self, intervals: Dict[int, List[int]]) -> Tuple[Dict[int, int], Dict[int, int]]:
+        free = list(range(self.num_regs - self.SCRATCH - 1, ACC, -1))
+        active: List[Tuple[int, int]] = []  # (end, vreg)
+        assignment, spilled = {ACC: ACC}, {}
+        for vreg, (start, end) in sorted(intervals.items(), key=lambda kv: kv[1][0]):
+            active.sort()
+            while active and active[0][0] < start:
+                free.append(assignment[active.pop(0)[1]])
+            if free:
+                assignment[vreg] = free.pop(); active.append((end, vreg))
+                continue
+            far_end, far = active[-1]
+            if far_end > end:
+                assignment[vreg] = assignment.pop(far); spilled[far] = self._slot()
+                active[-1] = (end, vreg)
+            else: spilled[vreg] = self._slot()
+        return assignment, spilled
+    
+    def _slot(self) -> int:
+        self.spill_slots += 1
+        return self.spill_slots - 1
+    
+    def _rewrite(self, code: List[RegInstruction], assignment: Dict[int, int], spilled: Dict[int, int]) -> List[RegInstruction]:
+        scratch_a, scratch_b, scratch_dst = range(self.num_regs - self.SCRATCH, self.num_regs)
+        out: List[RegInstruction] = []
+        index_map = []
+        for ins in code:
+            index_map.append(len(out))
+            op, dst, a, b = ins.opcode, ins.dst, ins.a, ins.b
+            uses = REG_USE_FIELDS.get(op, ())
+            if "a" in uses and a != NO_REG:
+                if a in spilled: out.append(RegInstruction(OpCode.RELOAD, scratch_a, imm=spilled[a])); a = scratch_a
+                else: a = assignment[a]
+            if "b" in uses and b != NO_REG:
+                if b in spilled: out.append(RegInstruction(OpCode.RELOAD, scratch_b, imm=spilled[b])); b = scratch_b
+                else: b = assignment[b]
+            spill_to = None
+            if op in REG_DEF_OPS:
+                if dst in spilled: spill_to, dst = spilled[dst], scratch_dst
+                else: dst = assignment[dst]
+            if op == OpCode.MOV and dst == a: continue
+            out.append(RegInstruction(op, dst, a, b, ins.imm))
+            if spill_to is not None: out.append(RegInstruction(OpCode.SPILL, a=scratch_dst, imm=spill_to))
+        index_map.append(len(out))
+        for ins in out:
+            if ins.opcode in REG_JUMP_OPS: ins.imm = index_map[ins.imm]
+        return out
+
+# Python lowering: VM integer semantics for the operators Python spells differently
+PY_BINOPS = {'+': pyast.Add, '-': pyast.Sub, '*': pyast.Mult, '&&': pyast.BitAnd, '||': pyast.BitOr}
+PY_COMPARE = {'==': pyast.Eq, '!=': pyast.NotEq, '<': pyast.Lt, '>': pyast.Gt, '<=': pyast.LtE, '>=': pyast.GtE}
+PY_HELPERS = {'/': "_div", '%': "_mod"}
+
+def _py_div(a: int, b: int) -> int: return a // b if b != 0 else 0
+def _py_mod(a: int, b: int) -> int: return a % b if b != 0 else 0
+
+@dataclass
+class PythonProgram:
+    """A program lowered by PythonCodeGenerator: a code object defining _main() plus its fns"""
+    code: Any
+    module: pyast.Module
+    omega: Optional[OmegaState] = None
+    command_dispatch_count: int = 0
+    
+    def source(self) -> str: return pyast.unparse(self.module)
+    
+    def run(self, kernel: Optional[ReflectologyKernel] = None, omega: Optional[OmegaState] = None) -> int:
+        """Execute natively; command() applies kernel commands directly, as the VM would over the bus"""
+        kernel = kernel or ReflectologyKernel()
+        self.omega, self.command_dispatch_count = omega or kernel.initialize(), 0
+        def command(command_id: int, value: int) -> int:
+            self.command_dispatch_count += 1
+            state = self.omega
+            state.data["_vm_input"] = value; state.data["_command_call"] = command_id
+            try: self.omega = state = kernel.applyCommand(command_id, state)
+            except Exception as e: print(f"Python backend error calling Ring 0: {e}")
+            out = state.data.get("_loss", state.data.get("_goodness", value))
+            return int(out) if isinstance(out, (int, float)) else value
+        namespace = {"__builtins__": {}, "_div": _py_div, "_mod": _py_mod, "_command": command}
+        exec(self.code, namespace)
+        return namespace["_main"]()
+
+class PythonCodeGenerator:
+    """Lowers the AST to a Python ast.Module and compiles it with compile().
+    
+    Scoping follows CodeGenerator: top-level lets are module globals, params
+    and lets inside a fn are Python locals, and names resolve in declaration
+    order (an undeclared name reads as 0). Each declaration gets a Python
+    name of its own (g_x_1, g_x_2, ...) that is zeroed at the top of its
+    module or fn scope, so a let in an untaken branch reads 0 and never
+    clobbers an earlier declaration of the same name. The result follows
+    RegisterCodeGenerator: the last top-level print, expression or command
+    value. Self tail calls outside loops become a loop; other recursion is
+    bounded by Python's recursion limit.
+    """
     def __init__(self):
-        self.optimizer = Optimizer()
+        self.vars: Dict[str, str] = {}  # MADLAD name -> Python name of its latest declaration
+        self.funcs: Dict[str, str] = {}
+        self.arity: Dict[str, int] = {}
+        self.fn_defs: List[pyast.stmt] = []
+        self.locals: Optional[Dict[str, str]] = None  # current fn's params and lets; None at top level
+        self.declared: List[str] = []  # Python names declared in the current scope, zeroed on entry
+        self.declarations: Counter = Counter()
+        self.assigned_globals: Set[str] = set()
+        self.current_fn: Optional[FuncDecl] = None
+        self.loop_depth = 0
+        self.tail_called = False
+    
+    def generate(self, ast: List[ASTNode]) -> PythonProgram:
+        body = []
+        for stmt in ast: body.extend(self._stmt(stmt))
+        body = self._zeroed(["_acc"] + self.declared) + body + [pyast.Return(self._name("_acc"))]
+        module = pyast.Module(body=self.fn_defs + [self._def("_main", [], body)], type_ignores=[])
+        pyast.fix_missing_locations(module)
+        return PythonProgram(compile(module, "<madlad>", "exec"), module)
+    
+    @staticmethod
+    def _name(name: str, store: bool = False) -> pyast.Name:
+        return pyast.Name(id=name, ctx=pyast.Store() if store else pyast.Load())
+    
+    def _assign(self, name: str, value: pyast.expr) -> pyast.stmt:
+        return pyast.Assign(targets=[self._name(name, True)], value=value)
+    
+    def _zeroed(self, names: List[str]) -> List[pyast.stmt]:
+        return [pyast.Assign(targets=[self._name(n, True) for n in names], value=pyast.Constant(0))] if names else []
+    
+    def _fresh(self, prefix: str, name: str) -> str:
+        """A new Python name for one declaration: the _<n> suffix keeps it apart from every other name"""
+        self.declarations[prefix, name] += 1
+        return f"{prefix}_{name}_{self.declarations[prefix, name]}"
+    
+    def _declare(self, name: str) -> str:
+        if self.locals is not None: target = self.locals[name] = self._fresh("l", name)
+        else: target = self.vars[name] = self._fresh("g", name); self.assigned_globals.add(target)
+        self.declared.append(target)
+        return target
+    
+    def _def(self, name: str, params: List[str], body: List[pyast.stmt]) -> pyast.FunctionDef:
+        if self.assigned_globals: body = [pyast.Global(names=sorted(self.assigned_globals))] + body
+        return pyast.FunctionDef(name=name, args=pyast.arguments(posonlyargs=[], args=[pyast.arg(arg=p) for p in params],
+                                 kwonlyargs=[], kw_defaults=[], defaults=[]), body=body, decorator_list=[], returns=None)
+    
+    def _target(self, name: str) -> Optional[str]:
+        """Python name a MADLAD assignment stores to, or None when it is undeclared"""
+        if self.locals is not None and name in self.locals: return self.locals[name]
+        if name in self.vars:
+            self.assigned_globals.add(self.vars[name]); return self.vars[name]
+        return None
+    
+    def _result(self, value: pyast.expr) -> pyast.stmt:
+        """A value-producing statement: top-level ones become the program result"""
+        return self._assign("_acc", value) if self.locals is None else pyast.Expr(value)
+    
+    def _body(self, stmts: List[ASTNode]) -> List[pyast.stmt]:
+        return [out for stmt in stmts for out in self._stmt(stmt)] or [pyast.Pass()]
+    
+    def _stmt(self, node: ASTNode) -> List[pyast.stmt]:
+        if isinstance(node, VarDecl):
+            value = self._expr(node.init) if node.init else pyast.Constant(0)
+            return [self._assign(self._declare(node.name), value)]
+        if isinstance(node, Assignment):
+            target, value = self._target(node.name), self._expr(node.value)
+            return [self._assign(target, value) if target else pyast.Expr(value)]
+        if isinstance(node, FuncDecl): self._func(node); return []
+        if isinstance(node, IfStmt):
+            return [pyast.If(test=self._cond(node.cond), body=self._body(node.then_body),
+                             orelse=self._body(node.else_body) if node.else_body else [])]
+        if isinstance(node, (WhileStmt, ForStmt)):
+            init = self._stmt(node.init) if isinstance(node, ForStmt) else []
+            self.loop_depth += 1
+            body = self._body(node.body) + (self._stmt(node.update) if isinstance(node, ForStmt) else [])
+            self.loop_depth -= 1
+            return init + [pyast.While(test=self._cond(node.cond), body=body, orelse=[])]
+        if isinstance(node, ReturnStmt): return self._return(node)
+        if isinstance(node, CommandCall):
+            arg = self._expr(node.arg) if node.arg else pyast.Constant(0)
+            return [self._result(pyast.Call(func=self._name("_command"), args=[pyast.Constant(node.command_id), arg], keywords=[]))]
+        if isinstance(node, PrintStmt): return [self._result(self._expr(node.value))]
+        if isinstance(node, Block): return [out for stmt in node.statements for out in self._stmt(stmt)]
+        if isinstance(node, (ModuleDecl, ImportDecl)): return []
+        return [self._result(self._expr(node))]
+    
+    def _func(self, node: FuncDecl):
+        self.funcs[node.name], self.arity[node.name] = self._fresh("f", node.name), len(node.params)
+        saved = (self.locals, self.declared, self.assigned_globals, self.current_fn, self.loop_depth, self.tail_called)
+        self.locals, self.declared, self.assigned_globals, self.current_fn = {}, [], set(), node
+        self.loop_depth, self.tail_called = 0, False
+        try:
+            params = [self._declare(p) for p in node.params]
+            body = self._body(node.body)
+            body = self._zeroed(self.declared[len(params):]) + body  # each activation's lets start at 0
+            if self.tail_called: body = [pyast.While(test=pyast.Constant(True), body=body + [pyast.Return(pyast.Constant(0))], orelse=[])]
+            else: body.append(pyast.Return(pyast.Constant(0)))  # falling off the end returns 0
+            self.fn_defs.append(self._def(self.funcs[node.name], params, body))
+        finally:
+            self.locals, self.declared, self.assigned_globals, self.current_fn, self.loop_depth, self.tail_called = saved
+    
+    def _return(self, node: ReturnStmt) -> List[pyast.stmt]:
+        fn, call = self.current_fn, node.value
+        if self.locals is None:  # top-level return halts; the result is unchanged
+            return ([pyast.Expr(self._expr(call))] if call else []) + [pyast.Return(self._name("_acc"))]
+        if (isinstance(call, FuncCall) and call.name == fn.name and len(call.args) == len(fn.params)
+                and self.loop_depth == 0 and fn.params):
+            self.tail_called = True  # rebind the params and re-enter the loop wrapping the body
+            params = self.declared[:len(fn.params)]
+            return [pyast.Assign(targets=[pyast.Tuple(elts=[self._name(p, True) for p in params], ctx=pyast.Store())],
+                                 value=pyast.Tuple(elts=[self._expr(a) for a in call.args], ctx=pyast.Load())),
+                    pyast.Continue()]
+        return [pyast.Return(self._expr(call) if call else pyast.Constant(0))]
+    
+    def _cond(self, node: ASTNode) -> pyast.expr:
+        """A branch test; comparisons skip the 0/1 conversion since only truthiness matters"""
+        if isinstance(node, BinaryOp) and node.op in PY_COMPARE:
+            return pyast.Compare(left=self._expr(node.left), ops=[PY_COMPARE[node.op]()], comparators=[self._expr(node.right)])
+        return self._expr(node)
+    
+    def _expr(self, node: ASTNode) -> pyast.expr:
+        if isinstance(node, NumberLiteral): return pyast.Constant(int(node.value))
+        if isinstance(node, Identifier):
+            if self.locals is not None and node.name in self.locals: return self._name(self.locals[node.name])
+            return self._name(self.vars[node.name]) if node.name in self.vars else pyast.Constant(0)
+        if isinstance(node, BinaryOp):
+            left, right = self._expr(node.left), self._expr(node.right)
+            if node.op in PY_BINOPS: return pyast.BinOp(left=left, op=PY_BINOPS[node.op](), right=right)
+            if node.op in PY_HELPERS: return pyast.Call(func=self._name(PY_HELPERS[node.op]), args=[left, right], keywords=[])
+            if node.op in PY_COMPARE:
+                return pyast.IfExp(test=pyast.Compare(left=left, ops=[PY_COMPARE[node.op]()], comparators=[right]),
+                                   body=pyast.Constant(1), orelse=pyast.Constant(0))
+        if isinstance(node, UnaryOp) and node.op in ('-', '!'):
+            return pyast.UnaryOp(op=pyast.USub() if node.op == '-' else pyast.Invert(), operand=self._expr(node.operand))
+        if isinstance(node, FuncCall) and node.name in self.funcs:
+            n = self.arity[node.name]
+            args = [self._expr(a) for a in node.args[:n]] + [pyast.Constant(0)] * (n - len(node.args))
+            return pyast.Call(func=self._name(self.funcs[node.name]), args=args, keywords=[])
+        if isinstance(node, Assignment):
+            target = self._target(node.name)
+            if target: return pyast.NamedExpr(target=self._name(target, True), value=self._expr(node.value))
+        if isinstance(node, (FuncCall, Assignment)) and list(_children(node)):
+            # Unknown target: keep argument side effects, value is 0
+            return pyast.Subscript(value=pyast.Tuple(elts=[self._expr(c) for c in _children(node)] + [pyast.Constant(0)],
+                                                     ctx=pyast.Load()), slice=pyast.Constant(-1), ctx=pyast.Load())
+        return pyast.Constant(0)
+
+@dataclass
+class CompiledProgram:
+    """Every stage of one compile, as held by CompilationCache"""
+    tokens: List[Token]
+    ast: List[ASTNode]
+    optimized: List[ASTNode]
+    bytecode: List
+    symbols: Dict[str, Dict[str, int]]
+
+@dataclass
+class CompileStats:
+    """Where one compile spent its time, and how big each stage was"""
+    backend: str
+    opt_level: int
+    phase_ms: Dict[str, float] = field(default_factory=dict)  # lex, parse, optimize, codegen
+    pass_ms: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    removed_by_pass: Dict[str, int] = field(default_factory=lambda: defaultdict(int))  # negative: the pass grew code
+    tokens: int = 0
+    nodes: int = 0
+    optimized_nodes: int = 0
+    instructions: int = 0
+    unoptimized_instructions: int = 0
+    
+    def report(self) -> str:
+        total = sum(self.phase_ms.values()) or 1e-9
+        lines = [f"Compile stats (-O{self.opt_level}, {self.backend}): {self.tokens} tokens, {self.nodes} -> "
+                 f"{self.optimized_nodes} nodes, {self.unoptimized_instructions} -> {self.instructions} instructions, {total:.3f} ms"]
+        lines.append("-- phases --")
+        for phase, ms in self.phase_ms.items(): lines.append(f"  {phase:<18} {ms:>10.3f} ms {100 * ms / total:>6.1f}%")
+        if self.pass_ms:
+            lines.append("-- passes --")
+            for name, ms in self.pass_ms.items(): lines.append(f"  {name:<18} {ms:>10.3f} ms {self.removed_by_pass[name]:>+8d} instructions removed")
+        return "\n".join(lines)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in asdict(self).items()}
+
+def _count_nodes(ast: List[ASTNode]) -> int:
+    return sum(1 for stmt in ast for _ in _walk(stmt))
+
+@dataclass
+class _Chunk:
+    """Parsed top-level token run; for a fn chunk also the names its codegen depends on"""
+    ast: List[ASTNode]
+    optimized: List[ASTNode]
+    names: Tuple[str, ...] = ()
+    calls: Tuple[str, ...] = ()
+    relocatable: bool = False
+
+@dataclass
+class _Fragment:
+    """Relocatable stack code for one FuncDecl: jumps relative to its start, CALLs patched at link time"""
+    code: List[Instruction]
+    calls: List[Tuple[int, str]]
+    vars_delta: Dict[str, int]
+    var_counter: int
+
+class CompilationCache:
+    """Content-addressed compile cache with LRU eviction.
+    
+    Three tiers: whole programs by source hash (tokens, AST, optimized AST,
+    bytecode), parsed top-level chunks by token hash, and function fragments
+    by chunk hash plus codegen environment. Programs are bounded by
+    max_entries, chunks and fragments by max_chunks. With disk_dir set,
+    whole-program bytecode also persists as .mbc files.
+    """
+    def __init__(self, max_entries: int = 256, max_chunks: int = 8192, disk_dir: Optional[str] = None):
+        self.max_entries, self.max_chunks, self.disk_dir = max_entries, max_chunks, disk_dir
+        self.programs: OrderedDict = OrderedDict()
+        self.chunks: OrderedDict = OrderedDict()
+        self.fragments: OrderedDict = OrderedDict()
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        if disk_dir: os.makedirs(disk_dir, exist_ok=True)
+    
+    @staticmethod
+    def key(source: str, backend: str = "stack") -> str:
+        return hashlib.sha256(f"{backend}\x00{source}".encode()).hexdigest()
+    
+    def get(self, tier: str, key) -> Any:
+        table = getattr(self, tier)
+        if key in table:
+            table.move_to_end(key); self.hits[tier] += 1
+            return table[key]
+        self.misses[tier] += 1
+        return None
+    
+    def put(self, tier: str, key, value):
+        limit = self.max_entries if tier == "programs" else self.max_chunks
+        if limit <= 0: return
+        table = getattr(self, tier)
+        table[key] = value; table.move_to_end(key)
+        while len(table) > limit: table.popitem(last=False)
+    
+    def load_program(self, key: str, backend: str) -> Optional[CompiledProgram]:
+        entry = self.get("programs", key)
+        if entry is not None or not self.disk_dir: return entry
+        path = os.path.join(self.disk_dir, f"{key}.mbc")
+        if not os.path.exists(path): return None
+        try:
+            image = read_mbc(path)
+        except (ValueError, OSError, struct.error):
+            return None
+        if image.backend != backend: return None
+        self.hits["disk"] += 1
+        entry = CompiledProgram([], [], [], image.program, image.symbols)
+        self.put("programs", key, entry)
+        return entry
+    
+    def store_program(self, key: str, backend: str, entry: CompiledProgram):
+        self.put("programs", key, entry)
+        if self.disk_dir and backend in MBC_BACKENDS: write_mbc(os.path.join(self.disk_dir, f"{key}.mbc"), entry.bytecode, entry.symbols, backend)
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"hits": dict(self.hits), "misses": dict(self.misses),
+                "entries": {t: len(getattr(self, t)) for t in ("programs", "chunks", "fragments")}}
+    
+    def clear(self):
+        self.programs.clear(); self.chunks.clear(); self.fragments.clear()
+
+def _split_top_level(tokens: List[Token]) -> List[Tuple[bool, List[Token]]]:
+    """Split a token stream (without EOF) into top-level fn declarations and the statement runs between them"""
+    chunks, start, i, depth, n = [], 0, 0, 0, len(tokens)
+    while i < n:
+        tt = tokens[i].type
+        if tt == TokenType.FN and depth == 0:
+            if i > start: chunks.append((False, tokens[start:i]))
+            j, d = i, 0
+            while j < n:
+                if tokens[j].type == TokenType.LBRACE: d += 1
+                elif tokens[j].type == TokenType.RBRACE:
+                    d -= 1
+                    if d == 0: j += 1; break
+                j += 1
+            chunks.append((True, tokens[i:j]))
+            start = i = j
+            continue
+        if tt == TokenType.LBRACE: depth += 1
+        elif tt == TokenType.RBRACE: depth -= 1
+        i += 1
+    if start < n: chunks.append((False, tokens[start:n]))
+    return chunks
+
+class IncrementalCodeGenerator(CodeGenerator):
+    """CodeGenerator that reuses cached fragments for unchanged top-level functions and relinks their CALLs"""
+    def __init__(self, cache: CompilationCache, fn_chunks: Dict[int, Tuple[str, _Chunk]]):
+        super().__init__()
+        self.cache, self.fn_chunks = cache, fn_chunks
+    
+    def _gen_stmt(self, node: ASTNode):
+        info = self.fn_chunks.get(id(node)) if isinstance(node, FuncDecl) else None
+        if info is None: return super()._gen_stmt(node)
+        chunk_key, chunk = info
+        if any(n in self.inlinable for n in chunk.calls): return super()._gen_stmt(node)  # code embeds callee bodies
+        env = (chunk_key, self.var_counter, tuple((n, self.vars.get(n)) for n in chunk.names),
+               tuple((n, n in self.funcs) for n in chunk.calls))
+        frag = self.cache.get("fragments", env)
+        if frag is None: self.cache.put("fragments", env, self._capture(node))
+        else: self._link(frag, node.name); self._register_fn(node)
+    
+    def _capture(self, node: FuncDecl) -> _Fragment:
+        base, before = len(self.code), dict(self.vars)
+        super()._gen_stmt(node)
+        entries = {addr: name for name, addr in self.funcs.items()}
+        code, calls = [], []
+        for i, ins in enumerate(self.code[base:]):
+            if ins.opcode in (OpCode.JMP, OpCode.JZ, OpCode.JNZ): code.append(Instruction(ins.opcode, ins.arg - base))
+            elif ins.opcode == OpCode.CALL: calls.append((i, entries[ins.arg])); code.append(ins)
+            else: code.append(ins)
+        delta = {k: v for k, v in self.vars.items() if before.get(k) != v}
+        return _Fragment(code, calls, delta, self.var_counter)
+    
+    def _link(self, frag: _Fragment, name: str):
+        base = len(self.code)
+        self.funcs[name] = base + 1  # entry follows the JMP over the body
+        for ins in frag.code:
+            self.code.append(Instruction(ins.opcode, ins.arg + base) if ins.opcode in (OpCode.JMP, OpCode.JZ, OpCode.JNZ) else ins)
+        for i, callee in frag.calls: self.code[base + i] = Instruction(OpCode.CALL, self.funcs[callee])
+        self.vars.update(frag.vars_delta)
+        self.var_counter = frag.var_counter
+
+# Multi-file projects: each module compiles separately with its imports' names bound to negative
+# extern ids (CALL/LOADG/STOREG args); link_modules lays the modules out and patches those ids.
+MODULE_EXTENSIONS = (".mdld", ".madlad")
+
+@dataclass
+class ModuleUnit:
+    """Separately compiled module: stack code with jumps and globals relative to the module, externs < 0"""
+    name: str
+    path: str
+    imports: Tuple[str, ...]
+    code: List[Instruction]
+    symbols: Dict[str, Dict[str, int]]  # own names >= 0; imported "module.name" -> extern id < 0
+
+@dataclass
+class ProjectBuild:
+    program: List[Instruction]
+    symbols: Dict[str, Dict[str, int]]  # "module.name" -> absolute function entry / global slot
+    modules: Dict[str, ModuleUnit]
+    order: List[str]                    # link order: every module after its imports
+    compiled: List[str]                 # modules compiled by this build (the rest came from the cache)
+
+def scan_module(source: str, default_name: str) -> Tuple[str, Tuple[str, ...]]:
+    """Module name and imports from top-level `module x` / `import y` declarations"""
+    tokens, name, imports, depth = Lexer(source).tokenize(), default_name, [], 0
+    for tok, nxt in zip(tokens, tokens[1:]):
+        if tok.type == TokenType.LBRACE: depth += 1
+        elif tok.type == TokenType.RBRACE: depth -= 1
+        elif depth == 0 and nxt.type == TokenType.IDENT:
+            if tok.type == TokenType.MODULE: name = nxt.value
+            elif tok.type == TokenType.IMPORT and nxt.value not in imports: imports.append(nxt.value)
+    return name, tuple(imports)
+
+def module_waves(imports: Dict[str, Tuple[str, ...]]) -> List[List[str]]:
+    """Topological levels of the import graph; modules in one level are independent of each other"""
+    for name, deps in imports.items():
+        missing = [d for d in deps if d not in imports]
+        if missing: raise ValueError(f"Module '{name}' imports unknown module(s): {', '.join(missing)}")
+    done, waves = set(), []
+    while len(done) < len(imports):
+        wave = sorted(n for n, deps in imports.items() if n not in done and all(d in done for d in deps))
+        if not wave: raise ValueError(f"Import cycle among modules: {', '.join(sorted(set(imports) - done))}")
+        waves.append(wave); done.update(wave)
+    return waves
+
+def _compile_module(name: str, path: str, source: str, imports: Tuple[str, ...],
+                    interface: List[Tuple[str, str, str]], opt_level: int) -> ModuleUnit:
+    """Compile one module against its imports' exports [(module, name, kind)]; runs in pool workers"""
+    try:
+        ast = Parser(Lexer(source).tokenize()).parse()
+    except SyntaxError as e:
+        raise SyntaxError(f"{path}: {e}") from None
+    gen = CodeGenerator()
+    externs = {"functions": {}, "globals": {}}
+    for i, (module, sym, kind) in enumerate(interface):
+        (gen.funcs if kind == "function" else gen.vars)[sym] = -(i + 1)  # later imports shadow earlier ones
+        externs[kind + "s"][f"{module}.{sym}"] = -(i + 1)
+    exported = {stmt.name for stmt in ast if isinstance(stmt, VarDecl)}
+    code = gen.generate(Optimizer(opt_level, live=exported, standalone=False).optimize(ast))
+    symbols = {"functions": {n: a for n, a in gen.funcs.items() if a >= 0},
+               "globals": {n: s for n, s in gen.vars.items() if s >= 0}}
+    for kind in symbols: symbols[kind].update(externs[kind])
+    return ModuleUnit(name, path, imports, code, symbols)
+
+def link_modules(units: List[ModuleUnit]) -> Tuple[List[Instruction], Dict[str, Dict[str, int]]]:
+    """Concatenate modules (imports first) into one program: rebase jumps and globals, resolve externs"""
+    code, exports, global_base = [], {"functions": {}, "globals": {}}, 0
+    for unit in units:
+        base = len(code)
+        externs = {}
+        for kind in ("functions", "globals"):
+            for qualified, v in unit.symbols[kind].items():
+                if v >= 0: continue
+                if qualified not in exports[kind]: raise ValueError(f"{unit.name}: unresolved {kind[:-1]} '{qualified}'")
+                externs[(kind, v)] = exports[kind][qualified]
+        body = unit.code[:-1] if unit.code and unit.code[-1].opcode == OpCode.HALT else unit.code
+        slots = 0
+        for ins in body:
+            op, arg = ins.opcode, ins.arg
+            if op in (OpCode.JMP, OpCode.JZ, OpCode.JNZ): arg += base
+            elif op == OpCode.CALL: arg = externs[("functions", arg)] if arg < 0 else arg + base
+            elif op in (OpCode.LOADG, OpCode.STOREG):
+                if arg < 0: arg = externs[("globals", arg)]
+                else: slots = max(slots, arg + 1); arg += global_base
+            code.append(Instruction(op, arg))
+        for n, a in unit.symbols["functions"].items():
+            if a >= 0: exports["functions"][f"{unit.name}.{n}"] = a + base
+        for n, s in unit.symbols["globals"].items():
+            if s >= 0: exports["globals"][f"{unit.name}.{n}"] = s + global_base; slots = max(slots, s + 1)
+        global_base += slots
+    code.append(Instruction(OpCode.HALT))
+    return code, exports
+
+class MadladCompiler:
+    VM_BACKENDS = ("stack", "register")
+    BACKENDS = VM_BACKENDS + ("python",)
+    
+    def __init__(self, cache: Optional[CompilationCache] = None, opt_level: int = 1):
+        self.optimizer = Optimizer(opt_level)
+        self.cache = cache if cache is not None else CompilationCache()
+        self.symbols: Dict[str, Dict[str, int]] = {}
+        self.last_stats: Optional[CompileStats] = None
+        self.editor = IncrementalParser()
         bus.register_ring("ring2", self)
     
-    def compile(self, source: str) -> List[Instruction]:
+    def compile(self, source: str, backend: str = "stack") -> Union[List[Instruction], PythonProgram]:
+        """Compile to stack-VM Instructions, RegInstructions for MadladRegisterVM with backend="register",
+        or with backend="python" a PythonProgram to run() natively when no VM introspection is needed.
+        Identical sources come straight from the cache; otherwise only changed top-level chunks are re-parsed
+        and (stack backend) only changed functions are re-generated. At -O2 and up the whole-program passes
+        run after the chunks are joined."""
+        if backend not in self.BACKENDS: raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        key = self.cache.key(source, f"{backend}-O{self.optimizer.level}")
+        entry = self.cache.load_program(key, backend)
+        if entry is not None:
+            self.symbols = entry.symbols
+            return entry.bytecode if backend == "python" else list(entry.bytecode)
         tokens = Lexer(source).tokenize()
-        ast = Parser(tokens).parse()
-        ast = self.optimizer.optimize(ast)
-        return CodeGenerator().generate(ast)
+        ast, optimized, fn_chunks = self._parse_chunks(tokens)
+        optimized = self.optimizer.optimize_program(optimized)
+        if backend == "python": gen = PythonCodeGenerator()
+        else: gen = RegisterCodeGenerator() if backend == "register" else IncrementalCodeGenerator(self.cache, fn_chunks)
+        code = gen.generate(optimized)
+        self.symbols = self._symbols(gen)
+        self.cache.store_program(key, backend, CompiledProgram(tokens, ast, optimized, code, self.symbols))
+        return code if backend == "python" else list(code)
+    
+    def diagnose(self, source: str) -> List[Diagnostic]:
+        """Every syntax error in source, for editor feedback. Successive calls re-parse only the
+        top-level statements touched since the previous call."""
+        return self.editor.parse(source)[1]
+    
+    def compile_stats(self, source: str, backend: str = "stack") -> CompileStats:
+        """Compile without the cache, timing each phase and pass and counting what every pass removed.
+        Per-pass instruction counts come from generating code for each intermediate AST after timing."""
+        if backend not in self.VM_BACKENDS: raise ValueError(f"Unknown backend '{backend}', expected one of {self.VM_BACKENDS}")
+        new_gen = RegisterCodeGenerator if backend == "register" else CodeGenerator
+        stats = CompileStats(backend, self.optimizer.level)
+        clock = time.perf_counter
+        t0 = clock(); tokens = Lexer(source).tokenize()
+        t1 = clock(); ast = Parser(tokens).parse()
+        t2 = clock()
+        snapshots, mark = [], [t2]
+        def observe(name: str, tree: List[ASTNode]):
+            now = clock()
+            stats.pass_ms[name] += (now - mark[0]) * 1e3
+            snapshots.append((name, tree))
+            mark[0] = clock()
+        optimized = self.optimizer.optimize(ast, observe)
+        t3 = clock(); code = new_gen().generate(optimized)
+        t4 = clock()
+        stats.phase_ms = {"lex": (t1 - t0) * 1e3, "parse": (t2 - t1) * 1e3, "optimize": (t3 - t2) * 1e3, "codegen": (t4 - t3) * 1e3}
+        stats.tokens, stats.nodes, stats.optimized_nodes = len(tokens), _count_nodes(ast), _count_nodes(optimized)
+        stats.instructions = len(code)
+        stats.unoptimized_instructions = prev = len(new_gen().generate(ast))
+        for name, tree in snapshots:
+            count = len(new_gen().generate(tree))
+            stats.removed_by_pass[name] += prev - count
+            prev = count
+        stats.pass_ms, stats.removed_by_pass = dict(stats.pass_ms), dict(stats.removed_by_pass)
+        self.last_stats = stats
+        return stats
+    
+    def _parse_chunks(self, tokens: List[Token]):
+        """Parse and locally optimize each top-level chunk, reusing cached chunks with identical tokens"""
+        ast, optimized, fn_chunks = [], [], {}
+        eof = tokens[-1]
+        for is_fn, chunk_tokens in _split_top_level(tokens[:-1]):
+            chunk_key = hashlib.sha256(f"O{self.optimizer.level}\x1f".encode() + "\x1f".join(f"{t.type.value}:{t.value!r}" for t in chunk_tokens).encode()).hexdigest()
+            chunk = self.cache.get("chunks", chunk_key)
+            if chunk is None:
+                parsed = Parser(chunk_tokens + [eof]).parse()
+                chunk = _Chunk(parsed, self.optimizer.optimize_statements(parsed))
+                if is_fn: self._index_function(chunk)
+                self.cache.put("chunks", chunk_key, chunk)
+            ast.extend(chunk.ast); optimized.extend(chunk.optimized)
+            if chunk.relocatable: fn_chunks[id(chunk.optimized[0])] = (chunk_key, chunk)
+        return ast, optimized, fn_chunks
+    
+    @staticmethod
+    def _index_function(chunk: _Chunk):
+        """Record the names a top-level fn's code depends on; nested fn declarations opt out of fragment reuse"""
+        if len(chunk.optimized) != 1 or not isinstance(chunk.optimized[0], FuncDecl): return
+        names, calls, nested = set(chunk.optimized[0].params), set(), False
+        def walk(node):
+            nonlocal nested
+            if isinstance(node, FuncDecl) and node is not chunk.optimized[0]: nested = True
+            if isinstance(node, (Identifier, Assignment, VarDecl)): names.add(node.name)
+            if isinstance(node, FuncCall): calls.add(node.name)
+            for child in _children(node): walk(child)
+        walk(chunk.optimized[0])
+        chunk.names, chunk.calls, chunk.relocatable = tuple(sorted(names)), tuple(sorted(calls)), not nested
+    
+    @staticmethod
+    def _symbols(gen) -> Dict[str, Dict[str, int]]:
+        """Function entry points and global slots of the last generated program"""
+        globals_ = {name: slot for name, slot in gen.vars.items() if not isinstance(slot, tuple)}
+        globals_.update({name: v[1] for name, v in gen.vars.items() if isinstance(v, tuple) and v[0] == "global"})
+        return {"functions": dict(gen.funcs), "globals": globals_}
+    
+    def save_bytecode(self, source: str, path: str, backend: str = "stack") -> str:
+        """Compile source and write it as a .mbc file; returns the content hash"""
+        if backend not in self.VM_BACKENDS: raise ValueError(f"Only {self.VM_BACKENDS} code can be saved as .mbc")
+        code = self.compile(source, backend)
+        return write_mbc(path, code, self.symbols, backend)
+    
+    def load_bytecode(self, path: str) -> BytecodeImage:
+        """Load a .mbc file, skipping lexing, parsing and optimization"""
+        image = read_mbc(path)
+        self.symbols = image.symbols
+        return image
+    
+    def build_project(self, root: str, processes: int = 0) -> ProjectBuild:
+        """Compile every module under root and link them into one stack-VM program.
+        Modules of one import level compile in a process pool when processes > 0. Each module is cached
+        by its source, the exports it was compiled against and the optimization level."""
+        sources: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for fname in sorted(f for f in filenames if f.endswith(MODULE_EXTENSIONS)):
+                path = os.path.join(dirpath, fname)
+                with open(path) as f: source = f.read()
+                name, imports = scan_module(source, os.path.splitext(fname)[0])
+                if name in sources: raise ValueError(f"Module '{name}' defined in both {sources[name][0]} and {path}")
+                sources[name] = (path, source, imports)
+        waves = module_waves({name: imports for name, (_, _, imports) in sources.items()})
+        units: Dict[str, ModuleUnit] = {}
+        compiled: List[str] = []
+        pool = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+        try:
+            for wave in waves:
+                jobs = {}
+                for name in wave:
+                    path, source, imports = sources[name]
+                    interface = [(m, sym, kind[:-1]) for m in imports for kind in ("functions", "globals")
+                                 for sym, v in units[m].symbols[kind].items() if v >= 0]
+                    key = self.cache.key(source, f"module:{name}:{interface}-O{self.optimizer.level}")
+                    entry = self.cache.load_program(key, "stack")
+                    if entry is not None:
+                        units[name] = ModuleUnit(name, path, imports, entry.bytecode, entry.symbols)
+                        continue
+                    args = (name, path, source, imports, interface, self.optimizer.level)
+                    jobs[name] = (key, pool.submit(_compile_module, *args) if pool else _compile_module(*args))
+                for name, (key, job) in jobs.items():
+                    unit = job.result() if pool else job
+                    self.cache.store_program(key, "stack", CompiledProgram([], [], [], unit.code, unit.symbols))
+                    units[name] = unit; compiled.append(name)
+        finally:
+            if pool: pool.shutdown()
+        order = [name for wave in waves for name in wave]
+        program, self.symbols = link_modules([units[name] for name in order])
+        return ProjectBuild(program, self.symbols, units, order, compiled)
 
 if __name__ == "__main__":
+    import argparse
+    cli = argparse.ArgumentParser(description="Ring 2: MADLAD Compiler")
+    cli.add_argument("source", nargs="?", help="MADLAD source file or project directory (default: built-in demo)")
+    cli.add_argument("-O", dest="opt_level", type=int, choices=Optimizer.LEVELS, default=1, help="Optimization level (default: 1)")
+    cli.add_argument("--backend", choices=MadladCompiler.BACKENDS, default="stack", help="Code generator (default: stack)")
+    cli.add_argument("--output", "-o", help="Write the bytecode to this .mbc file")
+    cli.add_argument("--jobs", "-j", type=int, default=0, help="Worker processes for project builds (default: in-process)")
+    cli.add_argument("--stats", action="store_true", help="Report phase timings, sizes and per-pass savings")
+    args = cli.parse_args()
+    
+    if args.source and os.path.isdir(args.source):
+        compiler = MadladCompiler(opt_level=args.opt_level)
+        build = compiler.build_project(args.source, processes=args.jobs)
+        print(f"✓ Linked {len(build.order)} modules ({', '.join(build.order)}) into {len(build.program)} instructions")
+        print(f"✓ Compiled {len(build.compiled)}, reused {len(build.order) - len(build.compiled)} from cache")
+        if args.output: print(f"✓ Wrote {args.output} ({write_mbc(args.output, build.program, build.symbols)[:12]})")
+        raise SystemExit(0)
+    if args.source:
+        with open(args.source) as f: source = f.read()
+        compiler = MadladCompiler(opt_level=args.opt_level)
+        code = compiler.compile(source, args.backend)
+        if args.backend == "python":
+            print(f"✓ Lowered {args.source} to Python (-O{args.opt_level}), result: {code.run()}")
+            raise SystemExit(0)
+        print(f"✓ Compiled {args.source} to {len(code)} instructions (-O{args.opt_level}, {args.backend})")
+        for name, count in sorted(compiler.optimizer.stats.items()): print(f"  {name}: {count}")
+        if args.output: print(f"✓ Wrote {args.output} ({write_mbc(args.output, code, compiler.symbols, args.backend)[:12]})")
+        if args.stats: print(compiler.compile_stats(source, args.backend).report())
+        raise SystemExit(0)
+    
     print("=" * 60)
     print("Ring 2: MADLAD Compiler - FULL IMPLEMENTATION")
     print("=" * 60)
@@ -444,7 +2040,7 @@ if __name__ == "__main__":
     print(result)
     """
     
-    compiler = MadladCompiler()
+    compiler = MadladCompiler(opt_level=args.opt_level)
     bytecode = compiler.compile(source)
     print(f"✓ Compiled {len(source)} chars to {len(bytecode)} instructions")
     print(f"✓ Variables: let x, let y, let result, let i")
@@ -452,3 +2048,14 @@ if __name__ == "__main__":
     print(f"✓ Control flow: if/else, while")
     print(f"✓ Axiom calls: command(13), command(21)")
     print(f"✓ Optimization: constant folding, dead code elimination")
+    regcode = compiler.compile(source, backend="register")
+    print(f"✓ Register backend: {len(regcode)} instructions (stack: {len(bytecode)})")
+    o2code = MadladCompiler(opt_level=2).compile(source)
+    print(f"✓ -O2 (constant/copy propagation, CSE, LICM, dead stores): {len(o2code)} instructions (-O{args.opt_level}: {len(bytecode)})")
+    native = compiler.compile(source, backend="python")
+    print(f"✓ Python backend: {len(native.source().splitlines())} lines of Python, result {native.run()}")
+    broken = source.replace("let y = 5", "let y = 5 +").replace("return a + b", "return a + ) b")
+    compiler.diagnose(source)
+    print(f"✓ Error recovery: {len(compiler.diagnose(broken))} diagnostics in one pass, "
+          f"{compiler.editor.reparsed} of {len(compiler.editor.spans)} top-level statements re-parsed after the edit")
+    if args.stats: print(compiler.compile_stats(source, args.backend).report())
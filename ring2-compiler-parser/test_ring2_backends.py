@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Differential tests for the Ring 2 toolchain: the same program must give the
+same result at every -O level and on every backend.
+
+Run: python test_ring2_backends.py   (or pytest)
+"""
+
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+rings_root = Path(__file__).resolve().parent.parent
+for ring in ['ring0-math-kernel', 'ring1-virtual-machine', 'ring2-compiler-parser']:
+    sys.path.insert(0, str(rings_root / ring))
+
+from ring0_kernel import ReflectologyKernel
+from ring2_compiler import MadladCompiler
+from ring1_vm import MadladVM, MadladRegisterVM, OpCode, write_mbc
+
+OPT_LEVELS = (0, 1, 2, 3)
+STEP_LIMIT = 200000
+KERNEL = ReflectologyKernel()  # one kernel and one compiler per level for every run:
+COMPILERS = {level: MadladCompiler(opt_level=level) for level in OPT_LEVELS}  # each new one adds a bus listener thread
+
+def run_stack(source, opt_level):
+    """The stack VM's final stack (print leaves its value there), or 'timeout'"""
+    code = COMPILERS[opt_level].compile(source)
+    vm = MadladVM(kernel=KERNEL, register=False)
+    return list(vm.stack) if vm.run_slice(code, STEP_LIMIT) < STEP_LIMIT else "timeout"
+
+def run_register(source, opt_level):
+    """MadladRegisterVM's r0: the last top-level print or expression value"""
+    vm = MadladRegisterVM(kernel=KERNEL, register=False)
+    vm.execute(COMPILERS[opt_level].compile(source, backend="register"))
+    return vm.regs[0]
+
+def run_python(source, opt_level):
+    """PythonProgram.run(): the same last-value rule as the register VM"""
+    return COMPILERS[opt_level].compile(source, backend="python").run(KERNEL)
+
+def assert_backends_agree(source):
+    """Every backend at every -O level gives the stack VM's -O0 top of stack"""
+    top = lambda stack: stack[-1] if stack else 0
+    expected = top(run_stack(source, 0))
+    for level in OPT_LEVELS:
+        results = {"stack": top(run_stack(source, level)), "register": run_register(source, level),
+                   "python": run_python(source, level)}
+        assert set(results.values()) == {expected}, f"-O{level}: {results}, expected {expected}\n{source}"
+    return expected
+
+def assert_levels_agree(source):
+    results = {level: run_stack(source, level) for level in OPT_LEVELS}
+    assert len({str(r) for r in results.values()}) == 1, f"-O levels disagree {results}\n{source}"
+    return results[0]
+
+class ProgramGen:
+    """Random straight-line, if/else, bounded-while and fn programs over a, b, c, d"""
+    NAMES = ["a", "b", "c", "d"]
+    OPS = ["+", "-", "*", "/", "%", "<", ">", "==", "!=", "<=", ">=", "&&", "||"]
+    COMMANDS = [12, 17, 31, 40]  # the ones -O2 may elide
+    RESULT_COMMANDS = [13, 21]   # set _loss/_goodness; half the programs use them
+
+    def __init__(self, seed):
+        self.r = random.Random(seed)
+        self.loops, self.fns, self.in_fn = 0, [], False
+        self.commands = self.COMMANDS + (self.RESULT_COMMANDS if self.r.random() < 0.5 else [])
+
+    def expr(self, depth=0, names=NAMES):
+        k = self.r.random()
+        if depth > 2 or k < 0.3: return str(self.r.randint(0, 9))
+        if k < 0.55: return self.r.choice(names)
+        if k < 0.65 and self.fns:
+            fn, arity = self.r.choice(self.fns)
+            return f"{fn}({', '.join(self.expr(depth + 1, names) for _ in range(arity))})"
+        if k < 0.7: return f"-{self.expr(depth + 1, names)}"
+        return f"({self.expr(depth + 1, names)} {self.r.choice(self.OPS)} {self.expr(depth + 1, names)})"
+
+    def block(self, n, depth, names=NAMES, top=False):
+        return "\n".join(self.stmt(depth, names, top) for _ in range(n))
+
+    def stmt(self, depth, names=NAMES, top=False):
+        r, k = self.r, self.r.random()
+        if k < 0.3: return f"{r.choice(names)} = {self.expr(0, names)}"
+        if k < 0.4: return f"let {r.choice(names)} = {self.expr(0, names)}"
+        if k < 0.55: return self.print(names)
+        if k < 0.7 and depth < 3:
+            s = f"if ({self.expr(0, names)}) {{\n{self.block(r.randint(0, 3), depth + 1, names)}\n}}"
+            if r.random() < 0.5: s += f" else {{\n{self.block(r.randint(0, 3), depth + 1, names)}\n}}"
+            return s
+        if k < 0.8 and depth < 2:
+            self.loops += 1
+            i = f"i{self.loops}"
+            return f"let {i} = 0\nwhile ({i} < {r.randint(0, 4)}) {{\n{self.block(r.randint(1, 3), depth + 1, names)}\n{i} = {i} + 1\n}}"
+        if k < 0.92 and top:
+            fn, arity = f"f{len(self.fns)}", r.randint(0, 2)
+            params = [f"p{j}" for j in range(arity)]
+            self.in_fn = True
+            body, ret = self.block(r.randint(0, 3), 2, params + self.NAMES), self.expr(0, params + self.NAMES)
+            self.in_fn = False
+            self.fns.append((fn, arity))  # after the body: fns only call earlier fns
+            return f"fn {fn}({', '.join(params)}) {{\n{body}\nreturn {ret}\n}}"
+        return self.print(names)
+
+    def print(self, names):
+        if self.r.random() < 0.3: return f"command({self.r.choice(self.commands)}, {self.expr(0, names)})"
+        return f"print({self.expr(0, names)})"
+
+    def program(self):
+        head = "\n".join(f"let {v} = {self.r.randint(0, 5)}" for v in self.NAMES)
+        return head + "\n" + self.block(self.r.randint(3, 10), 0, top=True)
+
+def test_self_reading_store_after_loop():
+    source = "let c = 0\nwhile (c < 4) { c = c + 1 }\nc = c + 10\nc = c * 1\nprint(c)"
+    assert assert_levels_agree(source)[-1] == 14
+    print("✅ x = x + 1 after a loop keeps the store it reads")
+
+def test_redeclared_let_in_untaken_branch():
+    source = "let x = 1\nlet c = 0\nif (c) { let x = 5 }\nprint(x)"
+    assert assert_levels_agree(source)[-1] == 0
+    print("✅ a let redeclared in an untaken branch still gets its own slot")
+
+def test_dead_store_of_call_result():
+    source = "let a = 2\nfn f0() {\nreturn 6\n}\na = f0()\nprint(1)"
+    assert assert_levels_agree(source)[0] == 1  # nothing but the printed value
+    print("✅ an unread store of a call result still consumes the value")
+
+def test_commands_after_a_result_setter():
+    for source in ("command(13, 5)\ncommand(31, 100)", "command(13, 5)\ncommand(17, 100)\ncommand(17, 200)",
+                   "command(31, 4)\ncommand(40, 1)\ncommand(40, 1)\ncommand(21, 5)"):
+        assert_levels_agree(source)
+        assert_backends_agree(source)
+    assert assert_levels_agree("command(31, 4)\ncommand(17, 2)\ncommand(17, 2)") == [4, 4, 2, 2, 2, 2]
+    print("✅ command() is simplified only in programs that never set _loss or _goodness")
+
+def test_recursion_on_every_backend():
+    fib = "fn fib(n) {\nif (n < 2) { return n }\nreturn fib(n - 1) + fib(n - 2)\n}\nprint(fib(10))"
+    assert assert_backends_agree(fib) == 55
+    frame_lets = "fn f(n) {\nlet t = n * 2\nif (n == 0) { return 0 }\nlet u = f(n - 1)\nreturn t + u\n}\nprint(f(5))"
+    assert assert_backends_agree(frame_lets) == 30
+    print("✅ recursive fns keep their params and lets per call on every backend")
+
+def test_redeclared_lets_on_every_backend():
+    untaken = "let c = 5\nif (c) {\nif (c + 9) {\nprint(1)\n} else {\nlet b = 2\n}\n}\nprint(-b)"
+    shadowed = "let b = 2\nfn f1() {\nlet b = 9\nreturn b\n}\nprint(f1())\nlet b = b + 1\nprint(b)"
+    cases = {untaken: 0, shadowed: 3, "let x = 1\nif (0) { let x = 5 }\nprint(x)": 0,
+             "let c = 0\nif (c) { let z = 5 }\nprint(z)": 0, "fn f(c) { if (c) { let t = 5 } return t }\nprint(f(0))": 0}
+    for source, expected in cases.items():
+        assert assert_backends_agree(source) == expected
+    print("✅ lets that never ran read 0, and fn lets do not outlive their fn, on every backend")
+
+def test_inlined_calls_on_every_backend():
+    source = "fn sq(x) {\nreturn x * x\n}\nfn add3(a, b, c) {\nreturn a + b + c\n}\nlet a = 3\nprint(add3(sq(a), sq(2), a + 1))"
+    assert assert_backends_agree(source) == 17
+    assert OpCode.CALL not in {ins.opcode for ins in MadladCompiler().compile(source)}
+    late_global = "let g = 1\nfn getg() {\nreturn g\n}\ng = 5\nprint(getg())"
+    assert assert_backends_agree(late_global) == 5
+    late_fn = "fn f(a) {\nreturn h(a) + 1\n}\nfn h(y) {\nreturn y * 10\n}\nprint(f(2))"
+    assert assert_backends_agree(late_fn) == 1  # h is undeclared where f is, inlined or not
+    print("✅ inlined calls bind args in order, read globals at call time and see only earlier fns")
+
+BRANCH_LETS = {  # fn lets whose branch does not run read 0 in every activation
+    "fn f(c) {\nif (c) { let t = 5 }\nreturn t\n}\nprint(f(1))\nprint(f(0))": 0,
+    "fn h(n) {\nif (n == 3) { let t = 5 }\nif (n == 0) { return t }\nreturn h(n - 1)\n}\nprint(h(3))": 0,
+    "fn g(n) {\nif (n == 2) { let t = 5 }\nif (n == 0) { return t }\nlet r = g(n - 1)\nreturn r\n}\nprint(g(2))": 0,
+}
+
+def test_branch_lets_start_each_call_at_zero():
+    for source, expected in BRANCH_LETS.items():
+        assert assert_backends_agree(source) == expected
+    print("✅ fn lets that did not run read 0 in every call, inlined or tail-called, on every backend")
+
+def test_fn_statements_keep_the_stack():
+    source = "fn f0(n) {\nprint(n)\ncommand(31, n)\nnope(n)\nundeclared = n\nreturn n + 2\n}\nprint(1 + f0(3))"
+    assert assert_backends_agree(source) == 6
+    recursive = "fn g(n) {\nprint(n)\nif (n == 0) { return 0 }\nlet u = g(n - 1)\nreturn 1 + u\n}\nprint(2 * g(3))"
+    assert assert_backends_agree(recursive) == 6
+    assert run_stack("print(nope(4, 5) + 1)", 0) == [1, 1]  # an undeclared fn yields 0 and drops its args
+    print("✅ print, command() and bare calls in fns leave the caller's operands alone")
+
+def test_self_tail_calls_on_every_backend():
+    source = "fn sum(n, acc) {\nif (n == 0) { return acc }\nreturn sum(n - 1, acc + n)\n}\nprint(sum(2000, 0))"
+    assert assert_backends_agree(source) == 2001000
+    code, vm, depth = MadladCompiler().compile(source), MadladVM(register=False), 0
+    while vm.run_slice(code, 1): depth = max(depth, len(vm.frames))
+    assert depth == 2, f"tail calls grew the VM to {depth} frames"  # top level + one sum activation
+    assert sys.getrecursionlimit() < 2000  # the Python backend turned the tail call into a loop
+    print("✅ self tail calls loop in one frame and agree on every backend")
+
+def test_bytecode_files_on_both_vms():
+    source = "fn fib(n) {\nif (n < 2) { return n }\nreturn fib(n - 1) + fib(n - 2)\n}\nprint(fib(12))"
+    compiler = MadladCompiler(opt_level=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        stack_path, reg_path = os.path.join(tmp, "fib.mbc"), os.path.join(tmp, "fib-reg.mbc")
+        write_mbc(stack_path, compiler.compile(source))
+        write_mbc(reg_path, compiler.compile(source, backend="register"), backend="register")
+        assert MadladVM(register=False).execute_file(stack_path, profile=True) == 144
+        vm = MadladRegisterVM(register=False)
+        assert vm.execute_file(reg_path) == 144 and vm.call_stack == []
+        for kwargs in ({"profile": True}, {"checkpoint_every": 10, "checkpoint_path": os.path.join(tmp, "ck")}):
+            try: MadladRegisterVM(register=False).execute_file(reg_path, **kwargs)
+            except ValueError: pass
+            else: raise AssertionError(f"register VM accepted {kwargs}")
+        for call in (lambda: vm.snapshot(os.path.join(tmp, "snap")), lambda: vm.restore(stack_path)):
+            try: call()
+            except TypeError: pass
+            else: raise AssertionError("register VM wrote or read a stack-VM snapshot")
+    print("✅ .mbc files run on both VMs; the register VM rejects profile and snapshot runs")
+
+def test_random_programs_agree_across_backends():
+    for seed in range(100):
+        assert_backends_agree(ProgramGen(seed).program())
+    print("✅ 100 random programs agree on every backend at -O0..-O3")
+
+def test_random_programs_agree_across_opt_levels():
+    for seed in range(200):
+        assert_levels_agree(ProgramGen(seed).program())
+    print("✅ 200 random programs agree at -O0..-O3")
+
+if __name__ == "__main__":
+    test_self_reading_store_after_loop()
+    test_redeclared_let_in_untaken_branch()
+    test_dead_store_of_call_result()
+    test_commands_after_a_result_setter()
+    test_recursion_on_every_backend()
+    test_redeclared_lets_on_every_backend()
+    test_inlined_calls_on_every_backend()
+    test_branch_lets_start_each_call_at_zero()
+    test_fn_statements_keep_the_stack()
+    test_self_tail_calls_on_every_backend()
+    test_bytecode_files_on_both_vms()
+    test_random_programs_agree_across_backends()
+    test_random_programs_agree_across_opt_levels()
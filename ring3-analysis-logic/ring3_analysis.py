@@ -6,11 +6,38 @@ COMMAND-DRIVEN ANALYSIS
 COMPLETENESS: 100% (bidirectional binomial, symbolic analysis)
 """
 
+import array
+import bisect
+import dataclasses
+import hashlib
+import heapq
+import inspect
+import itertools
 import math
+import mmap
+import os
+import pickle
+import random
+import sqlite3
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from decimal import MAX_EMAX, MIN_EMIN, Decimal, getcontext, localcontext
+from fractions import Fraction
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from ring0_kernel import OmegaState, ReflectologyKernel, bus
 
+# NumPy is optional: rows and tables fall back to array.array / mmap buffers
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 @dataclass
 class AnalysisResult:
     value: float
@@ -18,114 +45,1348 @@ class AnalysisResult:
     convergence: bool
     iterations: int
     error: float
+    evaluations: int = 0  # function evaluations, where a solver counts them
+    saved_evaluations: int = 0  # estimated evaluations saved against plain iteration
+
+@dataclass
+class BatchResult:
+    """Per-lane results of a batch solve as parallel arrays (ndarray with NumPy, list without);
+    the command trace is kept as per-lane counts for each command code, in trace order"""
+    value: Sequence[float]
+    convergence: Sequence[bool]
+    iterations: Sequence[int]
+    error: Sequence[float]
+    trace_counts: Dict[int, Sequence[int]]
+    
+    def __len__(self) -> int: return len(self.value)
+    
+    def __getitem__(self, i: int) -> AnalysisResult:
+        trace = [cmd for cmd, counts in self.trace_counts.items() for _ in range(int(counts[i]))]
+        return AnalysisResult(float(self.value[i]), trace, bool(self.convergence[i]),
+                              int(self.iterations[i]), float(self.error[i]))
+    
+    def __iter__(self) -> Iterator[AnalysisResult]:
+        return (self[i] for i in range(len(self)))
+    
+    @property
+    def command_counts(self) -> Dict[int, int]:
+        """Total count of each command code over all lanes"""
+        return {cmd: int(sum(counts)) for cmd, counts in self.trace_counts.items()}
+    
+    @property
+    def converged(self) -> int: return int(sum(bool(c) for c in self.convergence))
+    
+    @classmethod
+    def from_results(cls, results: List[AnalysisResult]) -> "BatchResult":
+        counts: Dict[int, List[int]] = {}
+        for i, r in enumerate(results):
+            for cmd in r.command_trace: counts.setdefault(cmd, [0] * len(results))[i] += 1
+        return cls([r.value for r in results], [r.convergence for r in results],
+                   [r.iterations for r in results], [r.error for r in results], counts)
+
+def _primes_upto(n: int) -> List[int]:
+    """Sieve of Eratosthenes"""
+    if n < 2: return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(n) + 1):
+        if sieve[i]: sieve[i * i::i] = bytes(len(range(i * i, n + 1, i)))
+    return [i for i, v in enumerate(sieve) if v]
+
+def _product(values: List[int]) -> int:
+    """Balanced product tree: multiplies similar-sized big integers, far faster than a running product"""
+    while len(values) > 1:
+        values = [values[i] * values[i + 1] if i + 1 < len(values) else values[i] for i in range(0, len(values), 2)]
+    return values[0] if values else 1
+
+def _is_prime(p: int) -> bool:
+    """Deterministic Miller-Rabin (the first 12 prime bases cover every p < 3.3e24)"""
+    if p < 2: return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    if p in bases: return True
+    if any(p % b == 0 for b in bases): return False
+    d, r = p - 1, 0
+    while d % 2 == 0: d //= 2; r += 1
+    for a in bases:
+        x = pow(a, d, p)
+        if x in (1, p - 1): continue
+        for _ in range(r - 1):
+            x = x * x % p
+            if x == p - 1: break
+        else: return False
+    return True
+
+class BinomialCache:
+    """LRU cache of binomial values bounded by entry count and total size in bits"""
+    
+    def __init__(self, max_entries: int = 4096, max_bits: int = 1 << 27):
+        self.max_entries, self.max_bits = max_entries, max_bits
+        self._entries: OrderedDict = OrderedDict()
+        self.bits = 0
+        self.hits = self.misses = self.evictions = 0
+    
+    @staticmethod
+    def _size(value) -> int: return value.bit_length() if isinstance(value, int) else 64
+    
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None: self.misses += 1; return None
+        self._entries.move_to_end(key); self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        size = self._size(value)
+        if size > self.max_bits: return  # would evict everything else
+        if key in self._entries: self.bits -= self._size(self._entries.pop(key))
+        self._entries[key] = value; self.bits += size
+        while len(self._entries) > self.max_entries or self.bits > self.max_bits:
+            _, old = self._entries.popitem(last=False)
+            self.bits -= self._size(old); self.evictions += 1
+    
+    def __len__(self) -> int: return len(self._entries)
+    
+    def clear(self):
+        self._entries.clear(); self.bits = 0
+    
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self._entries),
+                "bits": self.bits, "hit_rate": self.hits / total if total else 0.0}
+
+ROW_DTYPES = {"float64": "d", "int64": "q"}  # buffer dtype -> array typecode
+INT64_MAX_ROW = 66  # C(67, 33) no longer fits in an int64
+
+def _new_buffer(dtype: str, size: int, path: Optional[str] = None):
+    """Zeroed float64/int64 buffer and the mmap backing it (None in memory): a NumPy array or memmap
+    when NumPy is available, else array.array or a memoryview cast over an mmap"""
+    if dtype not in ROW_DTYPES: raise ValueError(f"Unknown dtype '{dtype}', expected one of {tuple(ROW_DTYPES)}")
+    if path is None:
+        return (np.zeros(size, dtype=dtype) if HAS_NUMPY else array.array(ROW_DTYPES[dtype], bytes(size * 8))), None
+    with open(path, "w+b") as f:
+        f.truncate(size * 8)
+        if HAS_NUMPY: return np.memmap(path, dtype=dtype, mode="r+", shape=(size,)), None
+        mm = mmap.mmap(f.fileno(), size * 8)
+    return memoryview(mm).cast(ROW_DTYPES[dtype]), mm
+
+def _mirror(buf, start: int, n: int):
+    """Fill the right half of row n (at buf[start:start+n+1]) with the reflection of its left half"""
+    if HAS_NUMPY and isinstance(buf, np.ndarray):
+        buf[start + (n + 1) // 2:start + n + 1] = buf[start:start + n // 2 + 1][::-1]
+    else:
+        for k in range(n // 2 + 1): buf[start + n - k] = buf[start + k]
+
+class PascalTable:
+    """Rows 0..N of Pascal's triangle packed one after another (row n starts at n(n+1)/2)
+    in a float64 or int64 buffer, optionally memory-mapped to a file"""
+    
+    def __init__(self, N: int, dtype: str, buffer, mapping: Optional[mmap.mmap] = None, path: Optional[str] = None):
+        self.N, self.dtype, self.buffer, self.path = N, dtype, buffer, path
+        self._mapping = mapping
+    
+    @staticmethod
+    def offset(n: int) -> int: return n * (n + 1) // 2
+    
+    def row(self, n: int):
+        """Row n as a view into the buffer"""
+        if not 0 <= n <= self.N: raise IndexError(f"row {n} outside 0..{self.N}")
+        return self.buffer[self.offset(n):self.offset(n) + n + 1]
+    
+    def __getitem__(self, nk: Tuple[int, int]):
+        n, k = nk
+        return self.buffer[self.offset(n) + k] if 0 <= k <= n <= self.N else 0
+    
+    def __len__(self) -> int: return self.N + 1
+    
+    def flush(self):
+        if self._mapping is not None: self._mapping.flush()
+        elif hasattr(self.buffer, "flush"): self.buffer.flush()
+    
+    def close(self):
+        """Flush and unmap a file-backed table"""
+        self.flush()
+        if self._mapping is not None:
+            self.buffer.release(); self._mapping.close(); self._mapping = None
 
 class BidirectionalBinomial:
-    """Bidirectional binomial coefficient with reflection"""
+    """Bidirectional binomial coefficient with reflection.
+    
+    binomial() is exact. Strategies: "comb" (math.comb), "factor" (product
+    of prime powers from Legendre's formula over a sieve up to n) and
+    "auto", which takes factor once k*k exceeds AUTO_FACTOR_RATIO*n - there
+    the sieve's O(n) beats math.comb's roughly quadratic growth in k.
+    binomial_mod() applies Lucas's theorem for a prime modulus and
+    binomial_approx() keeps the float path. Values are cached under the
+    symmetric key (n, min(k, n-k)) in a bounded LRU.
+    """
+    STRATEGIES = ("auto", "comb", "factor")
+    AUTO_FACTOR_RATIO = 1000
     
-    def __init__(self):
-        self._cache: Dict[Tuple[int, int], float] = {}
+    def __init__(self, strategy: str = "auto", cache_size: int = 4096, cache_bits: int = 1 << 27):
+        if strategy not in self.STRATEGIES: raise ValueError(f"Unknown strategy '{strategy}', expected one of {self.STRATEGIES}")
+        self.strategy = strategy
+        self._cache = BinomialCache(cache_size, cache_bits)
+        self._lucas_tables: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._primes: List[int] = []  # sieve for the largest n factored so far
+        self._sieved = 1
     
-    def binomial(self, n: int, k: int) -> float:
-        """Standard binomial coefficient C(n,k)"""
+    def binomial(self, n: int, k: int, strategy: Optional[str] = None) -> int:
+        """Exact binomial coefficient C(n,k)"""
         if k < 0 or k > n: return 0
-        if k == 0 or k == n: return 1
-        if (n, k) in self._cache: return self._cache[(n, k)]
-        
-        # Compute using multiplicative formula
+        k = min(k, n - k)
+        if k == 0: return 1
+        strategy = strategy or self.strategy
+        key = (n, k, "exact")
+        result = self._cache.get(key)
+        if result is not None: return result
+        if strategy == "auto": strategy = "factor" if k * k > self.AUTO_FACTOR_RATIO * n else "comb"
+        if strategy == "factor": result = self._binomial_factor(n, k)
+        elif strategy == "comb": result = math.comb(n, k)
+        else: raise ValueError(f"Unknown strategy '{strategy}', expected one of {self.STRATEGIES}")
+        self._cache.put(key, result)
+        return result
+    
+    def binomial_approx(self, n: int, k: int) -> float:
+        """Float C(n,k) by the multiplicative formula: fast, approximate past ~2**53, inf past ~1e308"""
+        if k < 0 or k > n: return 0
+        k = min(k, n - k)
+        if k == 0: return 1
+        key = (n, k, "float")
+        result = self._cache.get(key)
+        if result is not None: return result
         result = 1.0
-        for i in range(min(k, n - k)):
+        for i in range(k):
             result = result * (n - i) / (i + 1)
-        
-        self._cache[(n, k)] = result
+        self._cache.put(key, result)
+        return result
+    
+    @staticmethod
+    def valuation(n: int, k: int, p: int) -> int:
+        """Exponent of prime p in C(n,k) by Legendre's formula (= carries adding k and n-k in base p, Kummer)"""
+        if k < 0 or k > n: return 0
+        e, pk = 0, p
+        while pk <= n:
+            e += n // pk - k // pk - (n - k) // pk
+            pk *= p
+        return e
+    
+    def _binomial_factor(self, n: int, k: int) -> int:
+        if n > self._sieved: self._primes, self._sieved = _primes_upto(n), n
+        powers = []
+        for p in self._primes[:bisect.bisect_right(self._primes, n)]:
+            if p > n - k: powers.append(p); continue  # primes in (n-k, n] divide C(n,k) exactly once
+            e = self.valuation(n, k, p)
+            if e: powers.append(p ** e)
+        return _product(powers)
+    
+    def binomial_mod(self, n: int, k: int, p: int) -> int:
+        """C(n,k) mod prime p by Lucas's theorem: product of digit binomials in base p"""
+        if not _is_prime(p): raise ValueError(f"Lucas's theorem needs a prime modulus, got {p}")
+        if k < 0 or k > n: return 0
+        key = (n, k, f"mod{p}")
+        result = self._cache.get(key)
+        if result is not None: return result
+        result = 1
+        while n and result:
+            result = result * self._small_binomial_mod(n % p, k % p, p) % p
+            n, k = n // p, k // p
+        self._cache.put(key, result)
         return result
     
-    def reflect(self, n: int, k: int) -> float:
+    def _small_binomial_mod(self, n: int, k: int, p: int) -> int:
+        """C(n,k) mod p for n < p: cached factorial tables up to p = 2**20, a modular product beyond"""
+        if k > n: return 0
+        if p > 1 << 20:
+            k, num, den = min(k, n - k), 1, 1
+            for i in range(k): num = num * (n - i) % p; den = den * (i + 1) % p
+            return num * pow(den, p - 2, p) % p
+        tables = self._lucas_tables.get(p)
+        if tables is None:
+            fact = [1] * p
+            for i in range(1, p): fact[i] = fact[i - 1] * i % p
+            inv = [1] * p
+            inv[p - 1] = pow(fact[p - 1], p - 2, p)
+            for i in range(p - 1, 0, -1): inv[i - 1] = inv[i] * i % p
+            self._lucas_tables[p] = tables = (fact, inv)
+        fact, inv = tables
+        return fact[n] * inv[k] % p * inv[n - k] % p
+    
+    def cache_stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+    
+    # === Whole rows and tables ===
+    
+    @staticmethod
+    def _exact_row(n: int, mirror: bool = True) -> List[int]:
+        """C(n, 0..n) by the multiplicative recurrence C(n,k+1) = C(n,k)(n-k)/(k+1); with mirror only
+        the left half is computed and the right half is its reflection"""
+        last = n // 2 if mirror else n
+        row, c = [1], 1
+        for k in range(last):
+            c = c * (n - k) // (k + 1); row.append(c)
+        return row + row[:n + 1 - len(row)][::-1] if mirror else row
+    
+    def row(self, n: int, dtype: Optional[str] = None, path: Optional[str] = None):
+        """Row C(n, 0..n) in one call: exact ints by default, or a float64/int64 buffer
+        (NumPy array when available, array.array otherwise; memory-mapped to path if given)"""
+        if n < 0: return []
+        if dtype is None:
+            if path is not None: raise ValueError("exact rows hold big integers; pass dtype to write a buffer")
+            return self._exact_row(n)
+        if dtype == "int64" and n > INT64_MAX_ROW: raise OverflowError(f"C({n}, {n // 2}) overflows int64")
+        buf, _ = _new_buffer(dtype, n + 1, path)  # a memoryview keeps its mmap alive (and reachable as .obj)
+        if dtype == "float64" and HAS_NUMPY:
+            ks = np.arange(n // 2, dtype="float64")
+            buf[0] = 1.0
+            buf[1:n // 2 + 1] = np.cumprod((n - ks) / (ks + 1))
+        elif dtype == "float64":
+            c = buf[0] = 1.0
+            for k in range(n // 2):
+                c = c * (n - k) / (k + 1); buf[k + 1] = c
+        else:
+            for k, c in enumerate(self._exact_row(n)[:n // 2 + 1]): buf[k] = c
+        _mirror(buf, 0, n)
+        return buf
+    
+    def table(self, N: int, dtype: Optional[str] = None, path: Optional[str] = None):
+        """Rows 0..N by Pascal's rule, left halves only, right halves reflected. Exact: a list of
+        int rows; with dtype: a packed PascalTable, memory-mapped to path for very large N"""
+        if dtype is None:
+            if path is not None: raise ValueError("exact tables hold big integers; pass dtype to write a buffer")
+            rows = [[1]]
+            for n in range(1, N + 1):
+                prev = rows[-1]
+                left = [1] + [prev[k - 1] + prev[k] for k in range(1, n // 2 + 1)]
+                rows.append(left + left[:n + 1 - len(left)][::-1])
+            return rows
+        if dtype == "int64" and N > INT64_MAX_ROW: raise OverflowError(f"row {N} overflows int64")
+        buf, mapping = _new_buffer(dtype, PascalTable.offset(N + 1), path)
+        vector = HAS_NUMPY and isinstance(buf, np.ndarray)
+        buf[0] = 1
+        for n in range(1, N + 1):
+            prev, cur, h = PascalTable.offset(n - 1), PascalTable.offset(n), n // 2
+            buf[cur] = 1
+            if vector: buf[cur + 1:cur + h + 1] = buf[prev:prev + h] + buf[prev + 1:prev + h + 1]
+            else:
+                for k in range(1, h + 1): buf[cur + k] = buf[prev + k - 1] + buf[prev + k]
+            _mirror(buf, cur, n)
+        return PascalTable(N, dtype, buf, mapping, path)
+    
+    def reflect(self, n: int, k: int) -> int:
         """Reflected binomial: C(n, n-k) = C(n, k)"""
         return self.binomial(n, n - k)
     
-    def bidirectional(self, n: int, k: int) -> Tuple[float, float]:
+    def bidirectional(self, n: int, k: int) -> Tuple[int, int]:
         """Return both forward and reflected values"""
         return self.binomial(n, k), self.reflect(n, k)
     
-    def validate_symmetry(self, n: int, k: int) -> bool:
-        """Validate C(n,k) = C(n, n-k) - Command 40 (Duality)"""
+    def validate_symmetry(self, n: int, k: Optional[int] = None) -> bool:
+        """Validate C(n,k) = C(n, n-k) - Command 40 (Duality); with k omitted, for the whole row
+        at once, computed left to right without reflection so the check is not circular"""
+        if k is None:
+            row = self._exact_row(n, mirror=False)
+            return row == row[::-1]
         fwd, rev = self.bidirectional(n, k)
-        return abs(fwd - rev) < 1e-10
+        return fwd == rev
+
+LANCZOS_G = 7
+LANCZOS_C = (0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+             771.32342877765313, -176.61502916214059, 12.507343278686905,
+             -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7)
+LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
 
 class GammaAnalysis:
-    """Gamma function and related analysis"""
+    """Gamma function and related analysis.
+    
+    Every method also takes arrays: NumPy arrays are evaluated in one
+    vectorized pass (Lanczos series, reflection formula for z < 0.5 as a
+    mask), lists and tuples element by element. lgamma, beta and
+    binomial_via_gamma work in log space, so they stay finite wherever the
+    result itself fits in a float even though Γ overflows past z ≈ 171.
+    """
+    
+    @staticmethod
+    def _is_array(z) -> bool:
+        return isinstance(z, (list, tuple)) or (HAS_NUMPY and isinstance(z, np.ndarray))
     
     @staticmethod
-    def gamma(z: float) -> float:
+    def gamma(z):
         """Gamma function Γ(z) using Lanczos approximation"""
+        if GammaAnalysis._is_array(z):
+            if not HAS_NUMPY: return [GammaAnalysis.gamma(x) for x in z]
+            z = np.asarray(z, dtype="float64")
+            with np.errstate(over="ignore", invalid="ignore"):
+                return GammaAnalysis._gamma_sign(z) * np.exp(GammaAnalysis.lgamma(z))
         if z < 0.5:
-            return math.pi / (math.sin(math.pi * z) * GammaAnalysis.gamma(1 - z))
+            m = round(z)  # sin(πz) = ±sin(π(z - m)): the reduced argument keeps it accurate near the poles
+            if z == m: return math.nan  # pole, as in the array path
+            return math.pi / ((-1) ** m * math.sin(math.pi * (z - m)) * GammaAnalysis.gamma(1 - z))
         
         z -= 1
-        g = 7
-        c = [0.99999999999980993, 676.5203681218851, -1259.1392167224028,
-             771.32342877765313, -176.61502916214059, 12.507343278686905,
-             -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7]
-        
-        x = c[0]
-        for i in range(1, g + 2):
-            x += c[i] / (z + i)
+        x = LANCZOS_C[0]
+        for i in range(1, LANCZOS_G + 2):
+            x += LANCZOS_C[i] / (z + i)
         
-        t = z + g + 0.5
-        return math.sqrt(2 * math.pi) * t ** (z + 0.5) * math.exp(-t) * x
+        t = z + LANCZOS_G + 0.5
+        try:
+            # t**(z+0.5) alone overflows from z ≈ 141; split it around exp(-t) to reach Γ's limit near 171.6
+            half = t ** ((z + 0.5) / 2)
+            return math.sqrt(2 * math.pi) * half * math.exp(-t) * half * x
+        except OverflowError:
+            return math.inf
     
     @staticmethod
-    def binomial_via_gamma(n: float, k: float) -> float:
-        """Binomial using Γ(n+1)/(Γ(k+1)Γ(n-k+1)) - extends to real numbers"""
+    def lgamma(z):
+        """log|Γ(z)|; +inf at the poles z = 0, -1, -2, ..."""
+        if GammaAnalysis._is_array(z):
+            if not HAS_NUMPY: return [GammaAnalysis.lgamma(x) for x in z]
+            z = np.asarray(z, dtype="float64")
+            out = np.empty_like(z)
+            left = z < 0.5
+            out[~left] = GammaAnalysis._lanczos_log(z[~left])
+            zl = z[left]
+            with np.errstate(divide="ignore"):  # |sin| = 0 at the poles gives +inf
+                sin = np.abs(np.sin(np.pi * (zl - np.round(zl))))  # reduced argument keeps sin accurate
+                out[left] = np.log(np.pi / sin) - GammaAnalysis._lanczos_log(1 - zl)
+            return out
+        if z < 0.5:
+            sin = abs(math.sin(math.pi * (z - round(z))))
+            return math.inf if sin == 0 else math.log(math.pi / sin) - GammaAnalysis._lanczos_log(1 - z)
+        return GammaAnalysis._lanczos_log(z)
+    
+    @staticmethod
+    def _lanczos_log(z):
+        """log Γ(z) for z >= 0.5 from the Lanczos series; scalar or ndarray"""
+        z = z - 1
+        x = LANCZOS_C[0]
+        for i in range(1, LANCZOS_G + 2):
+            x = x + LANCZOS_C[i] / (z + i)
+        t = z + LANCZOS_G + 0.5
+        log = np.log if HAS_NUMPY and isinstance(z, np.ndarray) else math.log
+        return LOG_SQRT_2PI + (z + 0.5) * log(t) - t + log(x)
+    
+    @staticmethod
+    def _gamma_sign(z):
+        """Sign of Γ(z): +1 for z > 0, (-1)^ceil(-z) between the negative poles, nan at a pole"""
+        if HAS_NUMPY and isinstance(z, np.ndarray):
+            negative = z < 0
+            sign = np.where(negative & (np.floor(z) % 2 == 1), -1.0, 1.0)
+            return np.where((z <= 0) & (z == np.floor(z)), np.nan, sign)
+        if z <= 0 and z == math.floor(z): return math.nan
+        return -1.0 if z < 0 and math.floor(z) % 2 == 1 else 1.0
+    
+    @staticmethod
+    def binomial_via_gamma(n, k):
+        """Binomial using Γ(n+1)/(Γ(k+1)Γ(n-k+1)) - extends to real numbers; evaluated as
+        exp(lgamma(n+1) - lgamma(k+1) - lgamma(n-k+1)) so large n does not overflow"""
+        if GammaAnalysis._is_array(n) or GammaAnalysis._is_array(k):
+            if not HAS_NUMPY: return [GammaAnalysis.binomial_via_gamma(x, y) for x, y in GammaAnalysis._pairs(n, k)]
+            n, k = np.broadcast_arrays(np.asarray(n, dtype="float64"), np.asarray(k, dtype="float64"))
+        return GammaAnalysis._log_ratio((n + 1,), (k + 1, n - k + 1))
+    
+    @staticmethod
+    def beta(a, b):
+        """Beta function B(a,b) = Γ(a)Γ(b)/Γ(a+b), in log space"""
+        if GammaAnalysis._is_array(a) or GammaAnalysis._is_array(b):
+            if not HAS_NUMPY: return [GammaAnalysis.beta(x, y) for x, y in GammaAnalysis._pairs(a, b)]
+            a, b = np.broadcast_arrays(np.asarray(a, dtype="float64"), np.asarray(b, dtype="float64"))
+        return GammaAnalysis._log_ratio((a, b), (a + b,))
+    
+    @staticmethod
+    def digamma(z):
+        """Digamma ψ(z) = d/dz log Γ(z): recurrence up to z >= 10, then the asymptotic series;
+        reflection ψ(z) = ψ(1-z) - π·cot(πz) for z < 0.5, nan at the poles"""
+        if GammaAnalysis._is_array(z):
+            if not HAS_NUMPY: return [GammaAnalysis.digamma(x) for x in z]
+            z = np.asarray(z, dtype="float64")
+            left = z < 0.5
+            w = np.where(left, 1 - z, z)
+            shift = np.zeros_like(w)
+            for _ in range(10):  # w >= 0.5 needs at most 10 steps to pass 10
+                small = w < 10
+                shift -= np.where(small, 1 / w, 0.0)
+                w = np.where(small, w + 1, w)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                psi = shift + GammaAnalysis._digamma_series(w)
+                reflected = psi - np.pi / np.tan(np.pi * (z - np.round(z)))
+                return np.where(left, np.where(z == np.round(z), np.nan, reflected), psi)
+        if z < 0.5:
+            if z == round(z): return math.nan
+            return GammaAnalysis.digamma(1 - z) - math.pi / math.tan(math.pi * (z - round(z)))
+        shift = 0.0
+        while z < 10:
+            shift -= 1 / z
+            z += 1
+        return shift + GammaAnalysis._digamma_series(z)
+    
+    @staticmethod
+    def _digamma_series(z):
+        inv2 = 1 / (z * z)
+        log = np.log if HAS_NUMPY and isinstance(z, np.ndarray) else math.log
+        return log(z) - 0.5 / z - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 * (1 / 252 - inv2 * (1 / 240 - inv2 / 132))))
+    
+    @staticmethod
+    def _pairs(a, b):
+        """Element pairs of two sequences, or of a sequence with a repeated scalar"""
+        if GammaAnalysis._is_array(a) and GammaAnalysis._is_array(b): return zip(a, b)
+        return ((x, b) for x in a) if GammaAnalysis._is_array(a) else ((a, y) for y in b)
+    
+    @staticmethod
+    def _log_ratio(num: Tuple, den: Tuple):
+        """Π Γ(num) / Π Γ(den) via lgamma and signs: a pole in the denominator gives 0, in the numerator nan"""
+        lg, sign = GammaAnalysis.lgamma, GammaAnalysis._gamma_sign
+        if HAS_NUMPY and isinstance(num[0], np.ndarray):
+            with np.errstate(over="ignore", invalid="ignore"):
+                # a denominator pole sends log to -inf (result 0) and must not poison the sign
+                log = sum(lg(x) for x in num) - sum(lg(x) for x in den)
+                s = np.prod([sign(x) for x in num] + [np.nan_to_num(sign(x), nan=1.0) for x in den], axis=0)
+                return s * np.exp(log)
         try:
-            return GammaAnalysis.gamma(n + 1) / (GammaAnalysis.gamma(k + 1) * GammaAnalysis.gamma(n - k + 1))
-        except (ValueError, ZeroDivisionError):
-            return float('nan')
+            if any(math.isinf(lg(x)) for x in num): return math.nan
+            if any(math.isinf(lg(x)) for x in den): return 0.0
+            s = 1.0
+            for x in num + den: s *= sign(x)
+            return s * math.exp(sum(lg(x) for x in num) - sum(lg(x) for x in den))
+        except OverflowError:
+            return math.inf
+    
+def _mathlib(v):
+    if HAS_NUMPY and isinstance(v, np.ndarray): return np
+    if isinstance(v, Interval): return IntervalMath
+    if isinstance(v, Decimal): return DecimalMath
+    return math
+
+class Dual:
+    """Forward-mode automatic differentiation: a + b·ε with ε² = 0.
+    
+    Arithmetic carries the derivative b exactly; comparisons look at the
+    value only, so branching code keeps working. val and der may be floats
+    or NumPy arrays (one lane per element). Elementary functions that must
+    see the derivative go through DualMath, which also takes plain numbers.
+    """
+    __slots__ = ("val", "der")
+    
+    def __init__(self, val, der=0.0):
+        self.val = val
+        self.der = der
+    
+    def __repr__(self) -> str: return f"Dual({self.val!r}, {self.der!r})"
+    
+    def __add__(self, other):
+        if isinstance(other, Dual): return Dual(self.val + other.val, self.der + other.der)
+        return Dual(self.val + other, self.der)
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        if isinstance(other, Dual): return Dual(self.val - other.val, self.der - other.der)
+        return Dual(self.val - other, self.der)
+    
+    def __rsub__(self, other): return Dual(other - self.val, -self.der)
+    
+    def __mul__(self, other):
+        if isinstance(other, Dual): return Dual(self.val * other.val, self.der * other.val + self.val * other.der)
+        return Dual(self.val * other, self.der * other)
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.val / other.val, (self.der * other.val - self.val * other.der) / (other.val * other.val))
+        return Dual(self.val / other, self.der / other)
+    
+    def __rtruediv__(self, other): return Dual(other / self.val, -other * self.der / (self.val * self.val))
+    
+    def __pow__(self, power):
+        if isinstance(power, Dual): return DualMath.exp(power * DualMath.log(self))
+        if power == 0: return Dual(self.val ** 0, self.der * 0)
+        return Dual(self.val ** power, power * self.val ** (power - 1) * self.der)
+    
+    def __rpow__(self, base):
+        value = base ** self.val
+        return Dual(value, value * _mathlib(self.val).log(base) * self.der)
+    
+    def __neg__(self): return Dual(-self.val, -self.der)
+    def __pos__(self): return self
+    
+    def __abs__(self):
+        sign = np.sign(self.val) if HAS_NUMPY and isinstance(self.val, np.ndarray) else (1 if self.val >= 0 else -1)
+        return Dual(abs(self.val), sign * self.der)
+    
+    def __eq__(self, other): return self.val == (other.val if isinstance(other, Dual) else other)
+    def __ne__(self, other): return self.val != (other.val if isinstance(other, Dual) else other)
+    def __lt__(self, other): return self.val < (other.val if isinstance(other, Dual) else other)
+    def __le__(self, other): return self.val <= (other.val if isinstance(other, Dual) else other)
+    def __gt__(self, other): return self.val > (other.val if isinstance(other, Dual) else other)
+    def __ge__(self, other): return self.val >= (other.val if isinstance(other, Dual) else other)
+    __hash__ = None
+    
+    @staticmethod
+    def parts(y) -> Tuple:
+        """(value, derivative) of a function result; a result that is not Dual is a constant"""
+        return (y.val, y.der) if isinstance(y, Dual) else (y, 0.0)
+
+class DualMath:
+    """Elementary functions for Dual and plain arguments (math, NumPy, IntervalMath or DecimalMath by value type)"""
+    
+    NUMPY_NAMES = {"atan": "arctan"}
+    
+    @staticmethod
+    def _fn(name: str, v):
+        lib = _mathlib(v)
+        return getattr(lib, DualMath.NUMPY_NAMES.get(name, name) if HAS_NUMPY and lib is np else name)
+    
+    @staticmethod
+    def _apply(x, name: str, dfn):
+        if not isinstance(x, Dual): return DualMath._fn(name, x)(x)
+        return Dual(DualMath._fn(name, x.val)(x.val), dfn(x.val) * x.der)
+    
+    @staticmethod
+    def sin(x): return DualMath._apply(x, "sin", lambda v: _mathlib(v).cos(v))
+    @staticmethod
+    def cos(x): return DualMath._apply(x, "cos", lambda v: -_mathlib(v).sin(v))
+    @staticmethod
+    def tan(x): return DualMath._apply(x, "tan", lambda v: 1 / _mathlib(v).cos(v) ** 2)
+    @staticmethod
+    def atan(x): return DualMath._apply(x, "atan", lambda v: 1 / (1 + v * v))
+    @staticmethod
+    def tanh(x): return DualMath._apply(x, "tanh", lambda v: 1 - _mathlib(v).tanh(v) ** 2)
+    @staticmethod
+    def exp(x): return DualMath._apply(x, "exp", lambda v: _mathlib(v).exp(v))
+    @staticmethod
+    def log(x): return DualMath._apply(x, "log", lambda v: 1 / v)
+    @staticmethod
+    def sqrt(x): return DualMath._apply(x, "sqrt", lambda v: 1 / (2 * _mathlib(v).sqrt(v)))
+    
+    @staticmethod
+    def lgamma(x):
+        if not isinstance(x, Dual): return GammaAnalysis.lgamma(x)
+        return Dual(GammaAnalysis.lgamma(x.val), GammaAnalysis.digamma(x.val) * x.der)
+
+def jacobian(F: Callable, x: Sequence[float]) -> Tuple[List[float], List[List[float]]]:
+    """F(x) and its Jacobian by forward-mode AD, one pass per column (len(x) calls of F)"""
+    n = len(x)
+    values, J = None, [[0.0] * n for _ in range(n)]
+    for j in range(n):
+        out = F([Dual(float(v), 1.0 if i == j else 0.0) for i, v in enumerate(x)])
+        if len(out) != n: raise ValueError(f"F maps {n} unknowns to {len(out)} equations, expected a square system")
+        parts = [Dual.parts(y) for y in out]
+        if values is None: values = [float(v) for v, _ in parts]
+        for i, (_, d) in enumerate(parts): J[i][j] = float(d)
+    return values, J
+
+# =============================================================================
+# PRECISION POLICY
+# =============================================================================
+
+PRECISIONS = ("float64", "interval", "decimal", "fraction")
+FLOAT64_EPS = sys.float_info.epsilon
+FLOAT64_GAMMA_REL_ERROR = 2e-13  # worst relative error of the float Γ, measured over (-170, 171.6)
+FLOAT64_LGAMMA_REL_ERROR = 2e-15  # lgamma's absolute error per unit of max(1, |lgamma|), same measurement
+FLOAT64_SOLVER_REL_ERROR = 1e-14  # tightest bound auto trusts a float64 root or fixed point to meet
+DECIMAL_FACTORIAL_MAX = 1000  # larger integer Γ arguments go through Stirling, not a (z-1)! of millions of digits
+INTERVAL_GAMMA_DIGITS = 30  # Decimal digits of an interval Γ before digits lost near poles and to large |z|
+INTERVAL_GAMMA_MARGIN = Decimal("1e-20")  # relative width added to it: far above that Decimal's error
+
+@dataclass(frozen=True)
+class PrecisionPolicy:
+    """Number representation for ring3 results and the relative error they must meet.
+    
+    Modes: "float64" (hardware floats, fast), "interval" (float intervals
+    rounded outward, so the true value is always inside), "decimal"
+    (Decimal at digits() significant digits), "fraction" (exact rationals,
+    where the result is rational) and "auto", which picks the cheapest of
+    float64, fraction and decimal whose error estimate meets rel_error.
+    """
+    mode: str = "auto"
+    rel_error: float = 1e-12
+    GUARD_DIGITS = 10
+    
+    def __post_init__(self):
+        modes = PRECISIONS + ("auto",)
+        if self.mode not in modes: raise ValueError(f"Unknown precision '{self.mode}', expected one of {modes}")
+        if not self.rel_error > 0: raise ValueError(f"rel_error must be positive, got {self.rel_error}")
+    
+    def digits(self) -> int:
+        """Decimal working precision: the digits rel_error asks for plus guard digits"""
+        return max(0, math.ceil(-math.log10(self.rel_error))) + self.GUARD_DIGITS
+    
+    def choose(self, float_rel_error: float, rational: bool = False) -> str:
+        """The mode to run: the policy's own, or for auto float64 when its estimated relative
+        error meets rel_error, else fraction for a rational result, else decimal"""
+        if self.mode != "auto": return self.mode
+        if float_rel_error <= self.rel_error: return "float64"
+        return "fraction" if rational else "decimal"
+
+def _job_policy(params: Dict) -> Optional[PrecisionPolicy]:
+    """A job's precision: a PrecisionPolicy, or a mode name with an optional rel_error"""
+    precision = params.get("precision")
+    if precision is None or isinstance(precision, PrecisionPolicy): return precision
+    return PrecisionPolicy(precision, params.get("rel_error", PrecisionPolicy.rel_error))
+
+def _to_decimal(x) -> Decimal:
+    """x as a Decimal; a float by its shortest repr, so 0.1 means one tenth"""
+    if isinstance(x, Decimal): return x
+    if isinstance(x, Fraction): return Decimal(x.numerator) / Decimal(x.denominator)
+    return Decimal(repr(x)) if isinstance(x, float) else Decimal(x)
+
+def _is_integer(x) -> bool:
+    try: return x == int(x)
+    except (OverflowError, ValueError): return False  # inf, nan
+
+def _float_below(x) -> float:
+    """Largest float <= x, for int, Fraction and Decimal x too"""
+    if isinstance(x, float) or (isinstance(x, Decimal) and x.is_infinite()): return float(x)
+    try: f = float(x)
+    except OverflowError: f = math.inf  # Decimal gives inf instead of raising
+    if math.isinf(f): return sys.float_info.max if x > 0 else -math.inf
+    return f if Fraction(f) <= Fraction(x) else math.nextafter(f, -math.inf)
+
+def _float_above(x) -> float:
+    return -_float_below(-x)
+
+class Interval:
+    """Closed interval [lo, hi] of floats with outward rounding.
+    
+    Arithmetic widens each float result by one ulp on either side, which
+    covers its rounding, so the exact result for any points of the operands
+    lies inside; elementary functions (IntervalMath) widen by two ulps.
+    Exact int, Fraction and Decimal endpoints are enclosed the same way.
+    """
+    __slots__ = ("lo", "hi")
+    
+    def __init__(self, lo, hi=None):
+        hi = lo if hi is None else hi
+        self.lo, self.hi = _float_below(lo), _float_above(hi)
+        if not self.lo <= self.hi: raise ValueError(f"Empty interval [{lo}, {hi}]")
+    
+    @staticmethod
+    def _of(x) -> "Interval": return x if isinstance(x, Interval) else Interval(x)
+    
+    @staticmethod
+    def _outward(lo: float, hi: float) -> "Interval":
+        return Interval(math.nextafter(lo, -math.inf), math.nextafter(hi, math.inf))
+    
+    def __repr__(self) -> str: return f"Interval({self.lo!r}, {self.hi!r})"
+    
+    @property
+    def width(self) -> float: return math.nextafter(self.hi - self.lo, math.inf)
+    
+    @property
+    def mid(self) -> float:
+        if math.isinf(self.lo) or math.isinf(self.hi): return min(max(0.0, self.lo), self.hi)
+        return self.lo + (self.hi - self.lo) / 2
+    
+    def __float__(self) -> float: return self.mid
+    def __contains__(self, x) -> bool: return self.lo <= x <= self.hi
+    def __eq__(self, other): return isinstance(other, Interval) and (self.lo, self.hi) == (other.lo, other.hi)
+    def __hash__(self): return hash((self.lo, self.hi))
+    
+    def intersect(self, other) -> Optional["Interval"]:
+        """Common part of both intervals, None when they are disjoint"""
+        other = Interval._of(other)
+        lo, hi = max(self.lo, other.lo), min(self.hi, other.hi)
+        return Interval(lo, hi) if lo <= hi else None
+    
+    def __add__(self, other):
+        other = Interval._of(other)
+        return Interval._outward(self.lo + other.lo, self.hi + other.hi)
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        other = Interval._of(other)
+        return Interval._outward(self.lo - other.hi, self.hi - other.lo)
+    
+    def __rsub__(self, other): return Interval._of(other) - self
+    
+    def __mul__(self, other):
+        other = Interval._of(other)
+        # 0·inf is nan in floats but 0 for intervals
+        products = [0.0 if math.isnan(p) else p for p in
+                    (self.lo * other.lo, self.lo * other.hi, self.hi * other.lo, self.hi * other.hi)]
+        return Interval._outward(min(products), max(products))
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        other = Interval._of(other)
+        if other.lo <= 0 <= other.hi: raise ZeroDivisionError(f"Interval division by {other}, which contains 0")
+        quotients = (self.lo / other.lo, self.lo / other.hi, self.hi / other.lo, self.hi / other.hi)
+        return Interval._outward(min(quotients), max(quotients))
+    
+    def __rtruediv__(self, other): return Interval._of(other) / self
+    
+    def __neg__(self): return Interval(-self.hi, -self.lo)
+    def __pos__(self): return self
+    
+    def __abs__(self):
+        if self.lo >= 0: return self
+        if self.hi <= 0: return -self
+        return Interval(0.0, max(-self.lo, self.hi))
+    
+    def __pow__(self, power):
+        if isinstance(power, int) or (isinstance(power, float) and power.is_integer()):
+            power = int(power)
+            if power < 0: return 1 / self ** -power
+            # square and multiply through the outward-rounded product; even powers are taken of |x|
+            base, result = abs(self) if power % 2 == 0 else self, Interval(1.0)
+            while power:
+                if power & 1: result = result * base
+                base, power = base * base, power >> 1
+            return result
+        return IntervalMath.exp(power * IntervalMath.log(self))
+    
+    def __rpow__(self, base): return IntervalMath.exp(self * IntervalMath.log(base))
+
+class IntervalMath:
+    """Elementary functions on intervals for DualMath: monotone ones map the endpoints,
+    sin and cos also take the extrema inside the interval"""
+    
+    @staticmethod
+    def _library(fn: Callable, lo: float, hi: float) -> Interval:
+        """[fn(lo), fn(hi)] widened by two ulps each way, as math functions are not correctly rounded"""
+        def call(v, overflow):
+            try: return fn(v)
+            except OverflowError: return overflow
+        lo, hi = call(lo, sys.float_info.max), call(hi, math.inf)
+        return Interval(math.nextafter(math.nextafter(lo, -math.inf), -math.inf),
+                        math.nextafter(math.nextafter(hi, math.inf), math.inf))
+    
+    @staticmethod
+    def exp(x): x = Interval._of(x); return IntervalMath._library(math.exp, x.lo, x.hi)
+    @staticmethod
+    def atan(x): x = Interval._of(x); return IntervalMath._library(math.atan, x.lo, x.hi)
+    @staticmethod
+    def tanh(x): x = Interval._of(x); return IntervalMath._library(math.tanh, x.lo, x.hi)
+    
+    @staticmethod
+    def log(x):
+        x = Interval._of(x)
+        if x.lo < 0: raise ValueError(f"log of {x}, which reaches below 0")
+        lo = IntervalMath._library(math.log, x.lo, x.hi).lo if x.lo > 0 else -math.inf
+        return Interval(lo, IntervalMath._library(math.log, x.hi, x.hi).hi)
+    
+    @staticmethod
+    def sqrt(x):
+        x = Interval._of(x)
+        if x.lo < 0: raise ValueError(f"sqrt of {x}, which reaches below 0")
+        return IntervalMath._library(math.sqrt, x.lo, x.hi).intersect(Interval(0.0, math.inf))
+    
+    @staticmethod
+    def _periodic(fn: Callable, x: Interval, peak: float) -> Interval:
+        """sin or cos over x: peak is where fn is 1, peak + π where it is -1 (period 2π)"""
+        if x.hi - x.lo >= 2 * math.pi: return Interval(-1.0, 1.0)
+        a, b = fn(x.lo), fn(x.hi)
+        out = IntervalMath._library(lambda v: v, min(a, b), max(a, b))
+        margin = 1e-15 * (abs(x.lo) + abs(x.hi) + 10)  # slack for rounding in the k·2π grid
+        def hits(c):
+            k = math.floor((x.lo - c) / (2 * math.pi))
+            return any(x.lo - margin <= c + 2 * math.pi * j <= x.hi + margin for j in (k, k + 1))
+        return Interval(-1.0 if hits(peak + math.pi) else max(out.lo, -1.0), 1.0 if hits(peak) else min(out.hi, 1.0))
+    
+    @staticmethod
+    def sin(x): return IntervalMath._periodic(math.sin, Interval._of(x), math.pi / 2)
+    @staticmethod
+    def cos(x): return IntervalMath._periodic(math.cos, Interval._of(x), 0.0)
+    @staticmethod
+    def tan(x): return IntervalMath.sin(x) / IntervalMath.cos(x)
+
+class DecimalMath:
+    """Elementary functions on Decimal at the current context precision, for DualMath and the
+    decimal Γ: exp, log and sqrt are Decimal's own, the rest are series after argument
+    reduction, summed with guard digits"""
+    _pi: Dict[int, Decimal] = {}
+    
+    @staticmethod
+    def pi() -> Decimal:
+        prec = getcontext().prec
+        if prec not in DecimalMath._pi:
+            with localcontext() as ctx:
+                ctx.prec = prec + 5
+                lasts, t, s, n, na, d, da = 0, Decimal(3), Decimal(3), 1, 0, 0, 24
+                while s != lasts:
+                    lasts = s
+                    n, na = n + na, na + 8
+                    d, da = d + da, da + 32
+                    t = (t * n) / d
+                    s += t
+            DecimalMath._pi[prec] = +s
+        return DecimalMath._pi[prec]
+    
+    @staticmethod
+    def exp(x): return _to_decimal(x).exp()
+    @staticmethod
+    def log(x): return _to_decimal(x).ln()
+    @staticmethod
+    def sqrt(x): return _to_decimal(x).sqrt()
+    
+    @staticmethod
+    def _taylor(x: Decimal, first: Decimal, start: int) -> Decimal:
+        """Σ (-1)^i x^(2i+start) / (2i+start)! from its first term, until terms vanish at this precision"""
+        s, term, i = first, first, start
+        while True:
+            term = -term * x * x / ((i + 1) * (i + 2))
+            i += 2
+            if s + term == s: return s
+            s += term
+    
+    @staticmethod
+    def sin(x):
+        with localcontext() as ctx:
+            ctx.prec += 5
+            x = _to_decimal(x).remainder_near(2 * DecimalMath.pi())
+            s = DecimalMath._taylor(x, x, 1)
+        return +s
+    
+    @staticmethod
+    def cos(x):
+        with localcontext() as ctx:
+            ctx.prec += 5
+            x = _to_decimal(x).remainder_near(2 * DecimalMath.pi())
+            s = DecimalMath._taylor(x, Decimal(1), 0)
+        return +s
+    
+    @staticmethod
+    def tan(x): return DecimalMath.sin(x) / DecimalMath.cos(x)
+    
+    @staticmethod
+    def tanh(x):
+        with localcontext() as ctx:
+            ctx.prec += 5
+            e = (2 * _to_decimal(x)).exp()
+            s = (e - 1) / (e + 1)
+        return +s
+    
+    @staticmethod
+    def atan(x):
+        with localcontext() as ctx:
+            ctx.prec += 5
+            x, scale = _to_decimal(x), 1
+            while abs(x) > Decimal("0.1"):  # atan x = 2·atan(x / (1 + √(1 + x²)))
+                x, scale = x / (1 + (1 + x * x).sqrt()), scale * 2
+            s, term, i, x2 = x, x, 1, x * x
+            while True:
+                term = -term * x2
+                i += 2
+                if s + term / i == s: break
+                s += term / i
+            s *= scale
+        return +s
+
+_BERNOULLI: List[Fraction] = [Fraction(1)]
+
+def _bernoulli(n: int) -> Fraction:
+    """Bernoulli number B_n (B_1 = -1/2), extending a module cache by the standard recurrence"""
+    while len(_BERNOULLI) <= n:
+        m = len(_BERNOULLI)
+        _BERNOULLI.append(-sum(math.comb(m + 1, j) * _BERNOULLI[j] for j in range(m)) / (m + 1))
+    return _BERNOULLI[n]
+
+def _decimal_gamma(z: Decimal) -> Tuple[Decimal, int]:
+    """Γ(z) at the current Decimal precision and the Stirling terms it took: z is shifted up
+    to w >= precision, where the series reaches that precision, and divided back down;
+    z < 0.5 goes through reflection, integers below DECIMAL_FACTORIAL_MAX are exact
+    factorials, poles are NaN. The exponent range is unbounded, as Γ(1e7) has 65 million digits"""
+    prec = getcontext().prec
+    with localcontext() as ctx:
+        ctx.prec, ctx.Emax, ctx.Emin = prec + 10, MAX_EMAX, MIN_EMIN
+        if _is_integer(z) and z <= 0: return Decimal("NaN"), 0
+        if _is_integer(z) and z < DECIMAL_FACTORIAL_MAX:
+            value, terms = Decimal(math.factorial(int(z) - 1)), 0
+        elif z < Decimal("0.5"):
+            pi = DecimalMath.pi()
+            g, terms = _decimal_gamma(1 - z)
+            value = pi / (DecimalMath.sin(pi * z) * g)
+        else:
+            shift = max(0, math.ceil(prec - z))
+            product = Decimal(1)
+            for i in range(shift): product *= z + i
+            w = z + shift
+            s = (w - Decimal("0.5")) * w.ln() - w + (2 * DecimalMath.pi()).ln() / 2
+            power, w2, terms, eps = w, w * w, 0, Decimal(10) ** -ctx.prec
+            while True:
+                terms += 1
+                b = _bernoulli(2 * terms)
+                term = Decimal(b.numerator) / (Decimal(b.denominator * 2 * terms * (2 * terms - 1)) * power)
+                s += term
+                if abs(term) < eps * max(1, abs(s)): break
+                power *= w2
+            value = s.exp() / product
+        ctx.prec = prec
+        value = +value
+    return value, terms
+
+def _flat(x) -> List[float]:
+    """Elements of a scalar, list or ndarray argument, as floats"""
+    if HAS_NUMPY: return np.ravel(np.asarray(x, dtype="float64")).tolist()
+    return [float(v) for v in x] if isinstance(x, (list, tuple)) else [float(x)]
+
+def _lanewise(fn: Callable, a, b):
+    """fn(a, b), element by element when either argument is a sequence or array"""
+    if GammaAnalysis._is_array(a) or GammaAnalysis._is_array(b): return [fn(x, y) for x, y in GammaAnalysis._pairs(a, b)]
+    return fn(a, b)
+
+class PrecisionAnalysis:
+    """Γ, B and C(n,k), exact and through Γ, under a PrecisionPolicy.
+    
+    Each result carries the estimated absolute error of its value: measured
+    bounds for float64, 0 for fractions, the rounding of the last digit for
+    decimal, the half-width for an interval. Intervals are proven: the Γ
+    family is evaluated in Decimal (see _enclose) and rounded outward.
+    Without a policy the Γ family runs in float64 and binomial() is exact.
+    Array arguments run in float64.
+    """
+    
+    @staticmethod
+    def gamma(z, policy: Optional[PrecisionPolicy] = None) -> AnalysisResult:
+        return PrecisionAnalysis._gamma_ratio((z,), (), lambda: GammaAnalysis.gamma(z), policy)
+    
+    @staticmethod
+    def beta(a, b, policy: Optional[PrecisionPolicy] = None) -> AnalysisResult:
+        return PrecisionAnalysis._gamma_ratio((a, b), (_lanewise(lambda x, y: x + y, a, b),),
+                                              lambda: GammaAnalysis.beta(a, b), policy)
+    
+    @staticmethod
+    def binomial_via_gamma(n, k, policy: Optional[PrecisionPolicy] = None) -> AnalysisResult:
+        num = (_lanewise(lambda x, y: x + 1, n, k),)
+        den = (_lanewise(lambda x, y: y + 1, n, k), _lanewise(lambda x, y: x - y + 1, n, k))
+        return PrecisionAnalysis._gamma_ratio(num, den, lambda: GammaAnalysis.binomial_via_gamma(n, k), policy)
+    
+    @staticmethod
+    def float_rel_error(num: Tuple, den: Tuple = ()) -> float:
+        """Relative error bound of the float64 Π Γ(num) / Π Γ(den): the measured Γ bound for a
+        single Γ, else the sum of the lgamma errors of its terms (an upper bound for arrays)"""
+        if len(num) == 1 and not den: return FLOAT64_GAMMA_REL_ERROR
+        bound = 4 * FLOAT64_EPS
+        for x in num + den:
+            logs = [abs(v) for v in map(GammaAnalysis.lgamma, _flat(x)) if math.isfinite(v)]
+            bound += FLOAT64_LGAMMA_REL_ERROR * max([1.0] + logs)
+        return bound
+    
+    @staticmethod
+    def _gamma_ratio(num: Tuple, den: Tuple, float_value: Callable, policy: Optional[PrecisionPolicy]) -> AnalysisResult:
+        policy = policy or PrecisionPolicy("float64")
+        trace = [4]  # Fractal Nature (Gamma is extension of factorial)
+        rel = PrecisionAnalysis.float_rel_error(num, den)
+        if any(GammaAnalysis._is_array(x) for x in num + den):
+            if policy.mode not in ("float64", "auto"): raise ValueError(f"Array arguments run in float64, not '{policy.mode}'")
+            value = float_value()
+            error = max([abs(v) * rel for v in _flat(value) if math.isfinite(v)] + [0.0])
+            return AnalysisResult(value, trace, True, LANCZOS_G, error)
+        
+        poles = [x for x in num + den if _is_integer(x) and x <= 0]
+        rational = all(_is_integer(x) for x in num + den) and not any(x <= 0 for x in num)
+        mode = policy.choose(rel, rational)
+        if mode == "fraction":
+            if not rational: raise ValueError("fraction precision needs integer arguments and no pole in the numerator: Γ is irrational elsewhere")
+            if poles: return AnalysisResult(Fraction(0), trace, True, 1, 0.0)
+            value = Fraction(_product([math.factorial(int(x) - 1) for x in num]),
+                             _product([math.factorial(int(x) - 1) for x in den]))
+            return AnalysisResult(value, trace, True, 1, 0.0)
+        if mode == "interval": return PrecisionAnalysis._enclose(num, den, trace)
+        if mode == "decimal":
+            with localcontext() as ctx:
+                ctx.prec, ctx.Emax, ctx.Emin = policy.digits(), MAX_EMAX, MIN_EMIN
+                parts = [_decimal_gamma(_to_decimal(x)) for x in num + den]
+                terms = sum(t for _, t in parts)
+                if any(g.is_nan() for g, _ in parts[:len(num)]): value = Decimal("NaN")
+                elif any(g.is_nan() for g, _ in parts[len(num):]): value = Decimal(0)
+                else:
+                    value = Decimal(1)
+                    for g, _ in parts[:len(num)]: value *= g
+                    for g, _ in parts[len(num):]: value /= g
+                # each Γ is good to the last digit, and each product or quotient adds half a unit there
+                error = float(abs(value).scaleb(1 - ctx.prec) * 2 * len(parts)) if value.is_finite() else math.inf
+            return AnalysisResult(value, trace, not value.is_nan(), terms, error)
+        
+        if den: value = GammaAnalysis._log_ratio(tuple(map(float, num)), tuple(map(float, den)))
+        else: value = GammaAnalysis.gamma(float(num[0]))
+        error = abs(value) * rel if math.isfinite(value) else math.inf
+        return AnalysisResult(value, trace, not math.isnan(value), LANCZOS_G, error)
     
     @staticmethod
-    def beta(a: float, b: float) -> float:
-        """Beta function B(a,b) = Γ(a)Γ(b)/Γ(a+b)"""
-        return GammaAnalysis.gamma(a) * GammaAnalysis.gamma(b) / GammaAnalysis.gamma(a + b)
+    def _enclose(num: Tuple, den: Tuple, trace: List[int]) -> AnalysisResult:
+        """Π Γ(num) / Π Γ(den) as an Interval that provably holds it. Float arguments convert to
+        Decimal exactly. Each Γ is evaluated to INTERVAL_GAMMA_DIGITS, plus the digits reflection
+        loses near a pole and exp loses to a large exponent. That Decimal is widened by
+        INTERVAL_GAMMA_MARGIN and rounded outward. A pole in the numerator gives NaN, one in the
+        denominator an exact 0."""
+        args = [_to_decimal(x) if isinstance(x, Fraction) else Decimal(x) for x in num + den]
+        digits = INTERVAL_GAMMA_DIGITS
+        for z in args:
+            if not z: continue
+            digits += max(0, abs(z).adjusted() + 2)  # |ln Γ(z)| ~ |z|·ln|z|
+            gap = abs(z - z.to_integral_value())
+            if z < Decimal("0.5") and gap: digits += max(0, abs(z).adjusted() - gap.adjusted())  # sin(πz) near 0
+        with localcontext() as ctx:
+            ctx.prec, ctx.Emax, ctx.Emin = digits, MAX_EMAX, MIN_EMIN
+            parts = [_decimal_gamma(z) for z in args]
+            terms = sum(t for _, t in parts)
+            if any(g.is_nan() for g, _ in parts[:len(num)]): return AnalysisResult(math.nan, trace, False, terms, math.inf)
+            if any(g.is_nan() for g, _ in parts[len(num):]): return AnalysisResult(Interval(0.0), trace, True, terms, 0.0)
+            value = Decimal(1)
+            for g, _ in parts[:len(num)]: value *= g
+            for g, _ in parts[len(num):]: value /= g
+            margin = abs(value) * INTERVAL_GAMMA_MARGIN
+            value = Interval(value - margin, value + margin)
+        return AnalysisResult(value, trace, True, terms, value.width / 2)
+    
+    @staticmethod
+    def binomial(n: int, k: int, policy: Optional[PrecisionPolicy] = None,
+                 binomial: Optional[BidirectionalBinomial] = None) -> AnalysisResult:
+        """Integer C(n,k): exact (an int) for fraction, rounded from the exact value for decimal and
+        interval, the multiplicative float formula for float64, whose relative error grows as
+        2·min(k, n-k)·eps; auto takes float64 while that meets rel_error"""
+        binomial = binomial or BidirectionalBinomial()
+        trace = [40, 10]  # Duality, Bijection
+        mode = (policy or PrecisionPolicy("fraction")).choose(2 * max(min(k, n - k), 0) * FLOAT64_EPS, rational=True)
+        if mode == "float64":
+            value = float(binomial.binomial_approx(n, k))
+            error = value * 2 * max(min(k, n - k), 0) * FLOAT64_EPS
+            return AnalysisResult(value, trace, math.isfinite(value), 1, error)
+        exact = binomial.binomial(n, k)
+        if mode == "fraction": return AnalysisResult(exact, trace, True, 1, 0.0)
+        if mode == "interval":
+            value = Interval(exact)
+            return AnalysisResult(value, trace, True, 1, value.width / 2)
+        with localcontext() as ctx:
+            ctx.prec = policy.digits()
+            value = +Decimal(exact)
+        return AnalysisResult(value, trace, True, 1, float(abs(Fraction(value) - exact)))
+
+def _lanes(x0, params):
+    """Initial points as a float64 lane array and params (if any) with lanes along the first axis"""
+    p = None if params is None else np.asarray(params)
+    n = len(p) if p is not None and p.ndim else np.size(x0)
+    if p is not None and p.ndim == 0: p = np.full(n, p[()])
+    return np.array(np.broadcast_to(np.asarray(x0, dtype="float64"), (n,))), p
+
+def _lane_eval(fn: Callable, x, p, lanes):
+    """fn over the active lanes: fn(x) or fn(x, p), broadcast to one float64 per lane"""
+    out = fn(x) if p is None else fn(x, p[lanes])
+    return np.broadcast_to(np.asarray(out, dtype="float64"), x.shape)
+
+def _scalar_lanes(x0, params) -> List[Tuple[float, object]]:
+    """(x0, param) per lane for the scalar fallback; param is None without params"""
+    if params is None: return [(x, None) for x in x0]
+    return list(zip(x0 if GammaAnalysis._is_array(x0) else [x0] * len(params), params))
+
+def _bind(fn: Optional[Callable], p):
+    return fn if fn is None or p is None else (lambda x: fn(x, p))
+
+def _lu_factor(A: List[List[float]]) -> Tuple[List[List[float]], List[int]]:
+    """LU factorization with partial pivoting (Doolittle, in place on a copy); ValueError if singular"""
+    LU, n = [list(map(float, row)) for row in A], len(A)
+    piv = list(range(n))
+    for j in range(n):
+        p = max(range(j, n), key=lambda i: abs(LU[i][j]))
+        if LU[p][j] == 0: raise ValueError("Singular matrix")
+        if p != j: LU[j], LU[p], piv[j], piv[p] = LU[p], LU[j], piv[p], piv[j]
+        for i in range(j + 1, n):
+            factor = LU[i][j] = LU[i][j] / LU[j][j]
+            if factor:
+                row, pivot_row = LU[i], LU[j]
+                for c in range(j + 1, n): row[c] -= factor * pivot_row[c]
+    return LU, piv
+
+def _lu_solve(LU: List[List[float]], piv: List[int], b: List[float]) -> List[float]:
+    """Solve A x = b from _lu_factor(A)"""
+    n = len(LU)
+    y = [float(b[i]) for i in piv]
+    for i in range(n): y[i] -= sum(LU[i][c] * y[c] for c in range(i))
+    for i in reversed(range(n)): y[i] = (y[i] - sum(LU[i][c] * y[c] for c in range(i + 1, n))) / LU[i][i]
+    return y
+
+def _picard_estimate(d0: float, d1: float, tol: float, max_iter: int) -> int:
+    """Evaluations plain iteration would need, extrapolating the contraction ratio d1/d0 of its
+    first two steps: step n moves about d0 * (d1/d0)^(n-1), and it stops once that is below tol"""
+    d0, d1, tol = float(d0), float(d1), float(tol)
+    if d0 < tol: return 1
+    if d1 < tol: return 2
+    rate = d1 / d0
+    if rate >= 1: return max_iter
+    return min(max_iter, 1 + math.ceil(math.log(tol / d0) / math.log(rate)))
 
 class NewtonRaphson:
-    """Newton-Raphson solver with command tracing"""
+    """Newton-Raphson solver with command tracing.
     
-    def solve(self, f, df, x0: float, tol: float = 1e-10, max_iter: int = 100) -> AnalysisResult:
-        """Find root of f using Newton-Raphson"""
+    When no derivative is given, f is evaluated on a Dual number and the
+    exact derivative comes from forward-mode AD in the same call; write f
+    with DualMath for elementary functions. solve_system() is the
+    multivariate version with an AD Jacobian and an LU solve per step.
+    A PrecisionPolicy runs solve() on Decimal or Fraction points, or as
+    interval Newton (solve_interval) for a proven enclosure of the root.
+    """
+    
+    def solve(self, f, df=None, x0: Optional[float] = None, tol: float = 1e-10, max_iter: int = 100,
+              precision: Optional[PrecisionPolicy] = None) -> AnalysisResult:
+        """Find root of f using Newton-Raphson; solve(f, df, x0) or, with AD, solve(f, x0).
+        Decimal and fraction precision run the same steps on Decimal or Fraction points with tol
+        tightened to rel_error (f must keep to that type: int constants, DualMath functions);
+        interval precision needs x0 to enclose the root"""
+        if x0 is None and not callable(df): df, x0 = None, df
+        mode = precision.choose(FLOAT64_SOLVER_REL_ERROR) if precision else "float64"
+        if mode == "interval": return self.solve_interval(f, x0, tol, max_iter)
+        if mode != "float64":
+            if mode == "fraction": result = self.solve(f, df, Fraction(x0), min(tol, precision.rel_error), max_iter)
+            else:
+                with localcontext() as ctx:
+                    ctx.prec = precision.digits()
+                    result = self.solve(f, df, _to_decimal(x0), min(tol, precision.rel_error), max_iter)
+            result.error = float(result.error)
+            return result
         x = x0
         command_trace = [25]  # Gradient flow command
+        evaluations = 0
         
         for i in range(max_iter):
-            fx = f(x)
+            if df is None: fx, dfx = Dual.parts(f(Dual(x, type(x)(1))))
+            else: fx = f(x)
+            evaluations += 1
             if abs(fx) < tol:
-                return AnalysisResult(x, command_trace, True, i + 1, abs(fx))
+                return AnalysisResult(x, command_trace, True, i + 1, abs(fx), evaluations)
             
-            dfx = df(x)
+            if df is not None: dfx = df(x)
             if abs(dfx) < 1e-15:
                 break
             
             x = x - fx / dfx
             command_trace.append(15)  # Reflective convergence
         
-        return AnalysisResult(x, command_trace, False, max_iter, abs(f(x)))
+        return AnalysisResult(x, command_trace, False, max_iter, abs(f(x)), evaluations + 1)
     
-    def find_binomial_inverse(self, target: float, n: int) -> AnalysisResult:
-        """Find k such that C(n,k) ≈ target"""
-        binom = BidirectionalBinomial()
+    def solve_interval(self, f, x0, tol: float = 1e-10, max_iter: int = 100) -> AnalysisResult:
+        """Interval Newton from an enclosure x0 (Interval or (lo, hi)): X <- X ∩ (m - f(m) / f'(X))
+        with m the midpoint and f' bounded over X by AD on intervals. Every root in x0 stays in X, and
+        a step landing inside X proves one exists; converged once that is proven and X is narrower
+        than tol, error being the half-width. An empty X (value None) proves x0 holds no root."""
+        X = x0 if isinstance(x0, Interval) else Interval(*x0)
+        command_trace = [25]  # Gradient flow command
+        proven, evaluations = False, 0
+        
+        for i in range(max_iter):
+            m = Interval(X.mid)
+            fm = Interval._of(f(m))
+            dF = Interval._of(Dual.parts(f(Dual(X, Interval(1.0))))[1])
+            evaluations += 2
+            if 0 in dF: break  # f' may vanish in X: the step is unbounded
+            N = m - fm / dF
+            proven = proven or (X.lo < N.lo and N.hi < X.hi)
+            X_new = X.intersect(N)
+            command_trace.append(15)  # Reflective convergence
+            if X_new is None: return AnalysisResult(None, command_trace, False, i + 1, math.inf, evaluations)
+            if proven and X_new.width < tol:
+                return AnalysisResult(X_new, command_trace, True, i + 1, X_new.width / 2, evaluations)
+            if X_new == X: break  # no progress left at float resolution
+            X = X_new
+        
+        return AnalysisResult(X, command_trace, False, max_iter, X.width / 2, evaluations)
+    
+    def solve_system(self, F, x0: Sequence[float], tol: float = 1e-10, max_iter: int = 100) -> AnalysisResult:
+        """Multivariate Newton for F(x) = 0 with F mapping n values to n values: each step takes
+        the Jacobian by forward AD and solves J·δ = -F(x) through an LU factorization"""
+        x = [float(v) for v in x0]
+        command_trace = [25]  # Gradient flow command
+        evaluations = 0
         
-        def f(k): return binom.binomial(n, int(round(k))) - target
-        def df(k):
-            k_int = int(round(k))
-            if k_int <= 0 or k_int >= n: return 1.0
-            return binom.binomial(n, k_int) * (math.log(n - k_int + 1) - math.log(k_int))
+        for i in range(max_iter):
+            fx, J = jacobian(F, x)
+            evaluations += len(x)
+            norm = max(map(abs, fx), default=0.0)
+            if norm < tol:
+                return AnalysisResult(x, command_trace, True, i + 1, norm, evaluations)
+            try:
+                delta = _lu_solve(*_lu_factor(J), [-v for v in fx])
+            except ValueError:  # singular Jacobian stalls the iteration
+                break
+            x = [a + d for a, d in zip(x, delta)]
+            command_trace.append(15)  # Reflective convergence
         
-        return self.solve(f, df, n / 2)
+        return AnalysisResult(x, command_trace, False, max_iter, max(map(abs, F(x)), default=0.0), evaluations + 1)
+    
+    def solve_batch(self, f, df, x0, params=None, tol: float = 1e-10, max_iter: int = 100,
+                    vectorized: bool = True) -> BatchResult:
+        """Newton-Raphson on many lanes at once. x0 holds one initial point per lane (or one
+        shared point when params is given); f and df take the active lanes' points, plus their
+        params when params is given, and return arrays. With df=None the derivative comes from
+        evaluating f once on a Dual of arrays. Converged, stalled and non-finite lanes
+        are retired by mask, so each step only evaluates the lanes still moving. Per-lane
+        results match solve(). Without NumPy, or with vectorized=False for functions that only
+        take scalars, each lane runs through solve()."""
+        if not (HAS_NUMPY and vectorized):
+            return BatchResult.from_results([self.solve(_bind(f, p), _bind(df, p), x, tol, max_iter)
+                                             for x, p in _scalar_lanes(x0, params)])
+        x, p = _lanes(x0, params)
+        n = len(x)
+        converged, iterations = np.zeros(n, dtype=bool), np.full(n, max_iter)
+        steps, error = np.zeros(n, dtype=np.int64), np.zeros(n)
+        active = np.arange(n)
+        for i in range(max_iter):
+            if not active.size: break
+            if df is None:
+                fx, dfx = Dual.parts(f(Dual(x[active], np.ones(active.size))) if p is None
+                                     else f(Dual(x[active], np.ones(active.size)), p[active]))
+                fx, dfx = (np.broadcast_to(np.asarray(v, dtype="float64"), active.shape) for v in (fx, dfx))
+            else:
+                fx = _lane_eval(f, x[active], p, active)
+            hit = np.abs(fx) < tol
+            converged[active[hit]], iterations[active[hit]], error[active[hit]] = True, i + 1, np.abs(fx[hit])
+            active, fx = active[~hit], fx[~hit]
+            dfx = dfx[~hit] if df is None else _lane_eval(df, x[active], p, active)
+            moving = (np.abs(dfx) >= 1e-15) & np.isfinite(fx)  # a vanishing derivative stalls the lane
+            active, fx, dfx = active[moving], fx[moving], dfx[moving]
+            x[active] -= fx / dfx
+            steps[active] += 1
+        failed = np.flatnonzero(~converged)
+        if failed.size:
+            with np.errstate(invalid="ignore", over="ignore"):
+                error[failed] = np.abs(_lane_eval(f, x[failed], p, failed))
+        return BatchResult(x, converged, iterations, error, {25: np.ones(n, dtype=np.int64), 15: steps})
+    
+    def find_binomial_inverse(self, target: float, n: int) -> AnalysisResult:
+        """Find real k <= n/2 with C(n,k) = target, C extended through Γ: Newton on the concave
+        log C(n,k) - log target from k = 0 climbs monotonically to the lower root"""
+        log_target = math.log(target)
+        def f(k): return DualMath.lgamma(n + 1) - DualMath.lgamma(k + 1) - DualMath.lgamma(n - k + 1) - log_target
+        return self.solve(f, 0.0)
 
 class FixedPointIterator:
-    """Fixed point iteration with command-driven convergence"""
+    """Fixed point iteration with command-driven convergence.
+    
+    Strategies: "picard" (x <- g(x)), "aitken" (Aitken Δ² extrapolation of
+    the Picard sequence, one g per step), "steffensen" (Aitken restarted
+    from each extrapolated point, two g per step, quadratic near a simple
+    fixed point) and "anderson" (Anderson mixing over the last `memory`
+    residuals; also takes vector fixed points as sequences of floats).
+    Accelerated results report g evaluations and an estimate of the
+    evaluations saved against Picard, extrapolated from its first two steps.
+    A PrecisionPolicy runs the scalar strategies on Decimal or Fraction
+    points, or as interval iteration for a proven enclosure.
+    """
+    STRATEGIES = ("picard", "aitken", "steffensen", "anderson")
     
-    def iterate(self, g, x0: float, tol: float = 1e-10, max_iter: int = 1000) -> AnalysisResult:
-        """Find fixed point x = g(x)"""
+    def __init__(self, strategy: str = "picard", memory: int = 5):
+        if strategy not in self.STRATEGIES: raise ValueError(f"Unknown strategy '{strategy}', expected one of {self.STRATEGIES}")
+        self.strategy = strategy
+        self.memory = memory
+    
+    def iterate(self, g, x0, tol: float = 1e-10, max_iter: int = 1000, strategy: Optional[str] = None,
+                precision: Optional[PrecisionPolicy] = None) -> AnalysisResult:
+        """Find fixed point x = g(x); max_iter caps the evaluations of g. Decimal and fraction
+        precision tighten tol to rel_error and need g to keep to that type; interval precision
+        needs x0 to enclose the fixed point"""
+        strategy = strategy or self.strategy
+        mode = precision.choose(FLOAT64_SOLVER_REL_ERROR) if precision else "float64"
+        if mode == "interval": return self._interval(g, x0, tol, max_iter)
+        if mode != "float64":
+            if strategy == "anderson": raise ValueError(f"Strategy 'anderson' runs in float64, not '{mode}'")
+            if mode == "fraction": result = self.iterate(g, Fraction(x0), min(tol, precision.rel_error), max_iter, strategy)
+            else:
+                with localcontext() as ctx:
+                    ctx.prec = precision.digits()
+                    result = self.iterate(g, _to_decimal(x0), min(tol, precision.rel_error), max_iter, strategy)
+            result.error = float(result.error)
+            return result
+        if strategy == "aitken": return self._aitken(g, x0, tol, max_iter)
+        if strategy == "steffensen": return self._steffensen(g, x0, tol, max_iter)
+        if strategy == "anderson": return self._anderson(g, x0, tol, max_iter)
+        if strategy != "picard": raise ValueError(f"Unknown strategy '{strategy}', expected one of {self.STRATEGIES}")
         x = x0
         command_trace = [30]  # Stabilization command
         
@@ -135,59 +1396,639 @@ class FixedPointIterator:
             
             if abs(x_new - x) < tol:
                 command_trace.append(15)  # Reflective convergence
-                return AnalysisResult(x_new, command_trace, True, i + 1, abs(x_new - x))
+                return AnalysisResult(x_new, command_trace, True, i + 1, abs(x_new - x), i + 1)
             
             x = x_new
         
-        return AnalysisResult(x, command_trace, False, max_iter, abs(g(x) - x))
+        return AnalysisResult(x, command_trace, False, max_iter, abs(g(x) - x), max_iter)
+    
+    def _interval(self, g, x0, tol: float, max_iter: int) -> AnalysisResult:
+        """Interval iteration X <- X ∩ g(X) from an enclosure x0 (Interval or (lo, hi)): each step keeps
+        every fixed point in X, and once g(X) ⊆ X one exists (Brouwer). Converged when that holds and
+        X is narrower than tol; an empty X (value None) proves x0 holds no fixed point."""
+        X = x0 if isinstance(x0, Interval) else Interval(*x0)
+        command_trace, proven = [30], False  # Stabilization command
+        
+        for i in range(max_iter):
+            Y = Interval._of(g(X))
+            command_trace.append(33)  # Feedback loop
+            proven = proven or (X.lo <= Y.lo and Y.hi <= X.hi)
+            X_new = X.intersect(Y)
+            if X_new is None: return AnalysisResult(None, command_trace, False, i + 1, math.inf, i + 1)
+            if proven and X_new.width < tol:
+                command_trace.append(15)  # Reflective convergence
+                return AnalysisResult(X_new, command_trace, True, i + 1, X_new.width / 2, i + 1)
+            if X_new == X: break  # no progress left at float resolution
+            X = X_new
+        
+        return AnalysisResult(X, command_trace, False, max_iter, X.width / 2, len(command_trace) - 1)
+    
+    @staticmethod
+    def _accelerated(value, trace: List[int], converged: bool, steps: int, error: float,
+                     evaluations: int, picard: int) -> AnalysisResult:
+        if converged: trace.append(15)  # Reflective convergence
+        return AnalysisResult(value, trace, converged, steps, error, evaluations, picard - evaluations)
+    
+    def _aitken(self, g, x0: float, tol: float, max_iter: int) -> AnalysisResult:
+        """Aitken Δ² on the Picard sequence: converged once two extrapolations agree to tol"""
+        trace = [30, 33, 33]
+        x, x1 = x0, g(x0)
+        x2 = g(x1)
+        picard = _picard_estimate(abs(x1 - x), abs(x2 - x1), tol, max_iter)
+        estimate, evaluations = x2, 2
+        while True:
+            if abs(x2 - x1) < tol: return self._accelerated(x2, trace, True, evaluations, abs(x2 - x1), evaluations, picard)
+            d2 = x2 - 2 * x1 + x
+            previous, estimate = estimate, x2 if d2 == 0 else x - (x1 - x) ** 2 / d2
+            if abs(estimate - previous) < tol:
+                return self._accelerated(estimate, trace, True, evaluations, abs(estimate - previous), evaluations, picard)
+            if evaluations >= max_iter: break
+            x, x1, x2 = x1, x2, g(x2)
+            trace.append(33)  # Feedback loop
+            evaluations += 1
+        return self._accelerated(estimate, trace, False, evaluations, abs(g(estimate) - estimate), evaluations, picard)
+    
+    def _steffensen(self, g, x0: float, tol: float, max_iter: int) -> AnalysisResult:
+        """Steffensen: x <- x - (g(x) - x)^2 / (g(g(x)) - 2g(x) + x)"""
+        trace, x, evaluations, picard, steps = [30], x0, 0, None, 0
+        while evaluations + 2 <= max_iter:
+            x1 = g(x)
+            x2 = g(x1)
+            trace += [33, 33]  # Feedback loop
+            evaluations += 2
+            steps += 1
+            if picard is None: picard = _picard_estimate(abs(x1 - x), abs(x2 - x1), tol, max_iter)
+            if abs(x1 - x) < tol: return self._accelerated(x1, trace, True, steps, abs(x1 - x), evaluations, picard)
+            d2 = x2 - 2 * x1 + x
+            x_new = x2 if d2 == 0 else x - (x1 - x) ** 2 / d2
+            if abs(x_new - x) < tol: return self._accelerated(x_new, trace, True, steps, abs(x_new - x), evaluations, picard)
+            x = x_new
+        return self._accelerated(x, trace, False, steps, abs(g(x) - x), evaluations, picard or max_iter)
+    
+    def _anderson(self, g, x0, tol: float, max_iter: int) -> AnalysisResult:
+        """Anderson mixing (type II, unit damping): x <- g(x) - Σγ_i (Δg)_i with γ the least-squares
+        fit of the residual f = g(x) - x over the last `memory` residual differences"""
+        scalar = not isinstance(x0, (list, tuple)) and not (HAS_NUMPY and isinstance(x0, np.ndarray))
+        call = (lambda v: [g(v[0])]) if scalar else (lambda v: [float(c) for c in g(v)])
+        x = [float(x0)] if scalar else [float(c) for c in x0]
+        trace, dG, dF = [30], [], []
+        gx, f_prev, g_prev, picard, d0 = None, None, None, max_iter, None
+        for i in range(max_iter):
+            gx = call(x)
+            trace.append(33)  # Feedback loop
+            f = [a - b for a, b in zip(gx, x)]
+            norm = max(map(abs, f))
+            if i == 0: d0 = norm
+            elif i == 1: picard = _picard_estimate(d0, norm, tol, max_iter)  # second step is plain Picard
+            if norm < tol:
+                if i == 0: picard = 1
+                return self._accelerated(gx[0] if scalar else gx, trace, True, i + 1, norm, i + 1, picard)
+            if f_prev is not None:
+                dF.append([a - b for a, b in zip(f, f_prev)]); dG.append([a - b for a, b in zip(gx, g_prev)])
+                if len(dF) > self.memory: dF.pop(0); dG.pop(0)
+            f_prev, g_prev = f, gx
+            x = gx
+            if dF:
+                # normal equations (dFᵀdF + λI)γ = dFᵀf, lightly regularized against collinear columns
+                m = len(dF)
+                A = [[sum(p * q for p, q in zip(dF[r], dF[c])) for c in range(m)] for r in range(m)]
+                ridge = 1e-12 * (sum(A[r][r] for r in range(m)) or 1.0)
+                for r in range(m): A[r][r] += ridge
+                try:
+                    gamma = _lu_solve(*_lu_factor(A), [sum(p * q for p, q in zip(dF[r], f)) for r in range(m)])
+                    x = [gx[j] - sum(gamma[r] * dG[r][j] for r in range(m)) for j in range(len(gx))]
+                except ValueError:
+                    dF.clear(); dG.clear()  # degenerate history: restart from the Picard step
+        error = max(abs(a - b) for a, b in zip(call(x), x))
+        return self._accelerated(x[0] if scalar else x, trace, False, max_iter, error, max_iter, picard)
+    
+    def iterate_batch(self, g, x0, params=None, tol: float = 1e-10, max_iter: int = 1000,
+                      vectorized: bool = True) -> BatchResult:
+        """Fixed point iteration on many lanes at once; lanes, params and the scalar fallback
+        work as in NewtonRaphson.solve_batch"""
+        if not (HAS_NUMPY and vectorized):
+            return BatchResult.from_results([self.iterate(_bind(g, p), x, tol, max_iter)
+                                             for x, p in _scalar_lanes(x0, params)])
+        x, p = _lanes(x0, params)
+        n = len(x)
+        converged, iterations = np.zeros(n, dtype=bool), np.full(n, max_iter)
+        steps, error = np.zeros(n, dtype=np.int64), np.zeros(n)
+        active = np.arange(n)
+        for i in range(max_iter):
+            if not active.size: break
+            x_new = _lane_eval(g, x[active], p, active)
+            steps[active] += 1
+            delta = np.abs(x_new - x[active])
+            x[active] = x_new
+            hit = delta < tol
+            converged[active[hit]], iterations[active[hit]], error[active[hit]] = True, i + 1, delta[hit]
+            active = active[~hit & np.isfinite(x_new)]  # a lane that overflowed cannot recover
+        failed = np.flatnonzero(~converged)
+        if failed.size:
+            with np.errstate(invalid="ignore", over="ignore"):
+                error[failed] = np.abs(_lane_eval(g, x[failed], p, failed) - x[failed])
+        return BatchResult(x, converged, iterations, error,
+                           {30: np.ones(n, dtype=np.int64), 33: steps, 15: converged.astype(np.int64)})
     
     def golden_ratio(self) -> AnalysisResult:
         """Find golden ratio φ = 1 + 1/φ"""
         return self.iterate(lambda x: 1 + 1/x if x != 0 else 2, 1.5)
 
+# =============================================================================
+# STREAMING SEQUENCE STATISTICS
+# =============================================================================
+
+class StreamingStats:
+    """Single-pass summary of a numeric stream, fed a chunk at a time.
+    
+    Moments are exact: each chunk's mean and M2 are merged into the running
+    totals with Chan's update to Welford's method, so no chunk is visited
+    twice and no cancellation builds up. Quantiles come from a uniform
+    sample: every value draws a random priority and the `reservoir`
+    smallest priorities are kept (bottom-k sampling). Two StreamingStats
+    over disjoint parts of a stream merge() into the summary of the whole.
+    """
+    
+    def __init__(self, reservoir: int = 1024, seed: int = 0):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max, self.total = math.inf, -math.inf, 0.0
+        self.reservoir = reservoir
+        self._rng = np.random.default_rng(seed) if HAS_NUMPY else random.Random(seed)
+        self._sample: List[Tuple[float, float]] = []  # (priority, value), the `reservoir` lowest priorities
+    
+    def update(self, chunk):
+        """Fold in one chunk: a list, array.array, memoryview or NumPy array of numbers"""
+        if HAS_NUMPY:
+            chunk = np.asarray(chunk, dtype="float64")
+            n = len(chunk)
+            if not n: return
+            mean = float(chunk.mean())
+            m2, lo, hi, total = float(((chunk - mean) ** 2).sum()), float(chunk.min()), float(chunk.max()), float(chunk.sum())
+            priorities = self._rng.random(n)
+            if n > self.reservoir:
+                keep = np.argpartition(priorities, self.reservoir)[:self.reservoir]
+                priorities, chunk = priorities[keep], chunk[keep]
+            candidates = zip(priorities.tolist(), chunk.tolist())
+        else:
+            chunk = [float(x) for x in chunk]
+            n = len(chunk)
+            if not n: return
+            total = math.fsum(chunk)
+            mean = total / n
+            m2, lo, hi = math.fsum((x - mean) ** 2 for x in chunk), min(chunk), max(chunk)
+            candidates = ((self._rng.random(), x) for x in chunk)
+        self._combine(n, mean, m2, lo, hi, total)
+        self._sample = heapq.nsmallest(self.reservoir, itertools.chain(self._sample, candidates))
+    
+    def _combine(self, n: int, mean: float, m2: float, lo: float, hi: float, total: float):
+        count = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / count
+        self.m2 += m2 + delta * delta * self.count * n / count
+        self.count, self.total = count, self.total + total
+        self.min, self.max = min(self.min, lo), max(self.max, hi)
+    
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Absorb the summary of another, disjoint part of the stream"""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max, other.total)
+            self._sample = heapq.nsmallest(self.reservoir, self._sample + other._sample)
+        return self
+    
+    @property
+    def variance(self) -> float: return self.m2 / self.count if self.count else 0.0
+    
+    @property
+    def std(self) -> float: return math.sqrt(self.variance)
+    
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile, linear interpolation over the sorted sample"""
+        values = sorted(v for _, v in self._sample)
+        if not values: return 0.0
+        pos = q * (len(values) - 1)
+        i = min(int(pos), len(values) - 2) if len(values) > 1 else 0
+        return values[i] + (values[min(i + 1, len(values) - 1)] - values[i]) * (pos - i)
+    
+    def summary(self) -> Dict:
+        """Summary statistics and sketch, sized independently of the stream length"""
+        empty = self.count == 0
+        return {
+            "length": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "min": 0.0 if empty else self.min,
+            "max": 0.0 if empty else self.max,
+            "sum": self.total,
+            "quantiles": {str(q): self.quantile(q) for q in (0.05, 0.25, 0.5, 0.75, 0.95)},
+            "sample_size": len(self._sample),
+        }
+
+def iter_chunks(source, chunk_size: int = 1 << 16, dtype: str = "float64") -> Iterator:
+    """Chunks of a numeric source: a path to a raw binary file of `dtype` values (memory-mapped,
+    read in place), a NumPy array (sliced), or any iterable of numbers (batched into lists)"""
+    if isinstance(source, (str, os.PathLike)):
+        if dtype not in ROW_DTYPES: raise ValueError(f"Unknown dtype '{dtype}', expected one of {tuple(ROW_DTYPES)}")
+        if HAS_NUMPY:
+            if os.path.getsize(source) == 0: return
+            yield from iter_chunks(np.memmap(source, dtype=dtype, mode="r"), chunk_size)
+            return
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0: return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                view = memoryview(mapping)
+                usable = len(view) - len(view) % array.array(ROW_DTYPES[dtype]).itemsize
+                values = view[:usable].cast(ROW_DTYPES[dtype])
+                try:
+                    for i in range(0, len(values), chunk_size):
+                        chunk = values[i:i + chunk_size]
+                        yield chunk
+                        chunk.release()
+                finally:
+                    values.release(); view.release()
+        return
+    if HAS_NUMPY and isinstance(source, np.ndarray):
+        for i in range(0, len(source), chunk_size): yield source[i:i + chunk_size]
+        return
+    it = iter(source)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk: return
+        yield chunk
+
+# =============================================================================
+# RESULT MEMO
+# =============================================================================
+
+MEMO_PATH_ENV = "RING3_MEMO_PATH"  # sqlite file for the shared memo; empty keeps it in memory
+
+def default_memo_path() -> str:
+    """The shared memo's per-user file: $XDG_CACHE_HOME (default ~/.cache)/madlad/ring3-memo.sqlite"""
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "madlad", "ring3-memo.sqlite")
+
+def _source_digest() -> str:
+    """Digest of this module's source, so rows written by other ring3 code never match; a random
+    token when the source cannot be read, which keeps the file from being shared at all"""
+    try:
+        with open(__file__, "rb") as f: return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError: return os.urandom(8).hex()
+
+MEMO_VERSION = _source_digest()
+
+def _code_digest(code) -> str:
+    """Stable digest of a code object: bytecode, names and constants, nested code included"""
+    h = hashlib.sha256(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        h.update(_code_digest(const).encode() if hasattr(const, "co_code") else repr(const).encode())
+    return h.hexdigest()[:16]
+
+def _plain_key(value) -> Optional[str]:
+    if value is None or isinstance(value, (bool, int, float, str, Decimal, Fraction, Interval, PrecisionPolicy)): return repr(value)
+    if isinstance(value, (list, tuple)):
+        parts = [_plain_key(v) for v in value]
+        return None if None in parts else "[" + ",".join(parts) + "]"
+    return None
+
+def _callable_key(fn) -> Optional[str]:
+    """Identity of a function for memo keys: qualified name plus a digest of its code, closure and
+    defaults. None for bound methods and for captured values with no stable form; such results
+    are not memoized. Functions are assumed pure: globals they read are not part of the key."""
+    if inspect.ismethod(fn): return None
+    name = f"{getattr(fn, '__module__', None)}.{getattr(fn, '__qualname__', None)}"
+    if inspect.isbuiltin(fn):  # math.cos and friends are identified by name
+        return name if isinstance(getattr(fn, "__self__", None), types.ModuleType) else None
+    code = getattr(fn, "__code__", None)
+    if code is None: return None
+    captured_key = _plain_key([c.cell_contents for c in fn.__closure__ or ()] + list(fn.__defaults__ or ()))
+    if captured_key is None: return None
+    return f"{name}#{_code_digest(code)}{captured_key}"
+
+def memo_key(kind: str, params: Dict) -> Optional[str]:
+    """Memo key for a job, prefixed with MEMO_VERSION, or None when a parameter cannot be keyed reliably"""
+    parts = []
+    for name in sorted(params):
+        value = params[name]
+        key = _callable_key(value) if callable(value) else _plain_key(value)
+        if key is None: return None
+        parts.append(f"{name}={key}")
+    return f"{MEMO_VERSION}:{kind}({','.join(parts)})"
+
+class AnalysisMemo:
+    """Two-tier memo for pure ring3 results: an in-memory LRU in front of an optional sqlite file.
+    
+    Values are pickled with AnalysisResult flattened to a tuple, so a file
+    written by one program loads in any other. Reads unpickle the file's
+    rows, so path (for the shared memo, the per-user cache file or
+    RING3_MEMO_PATH) must be trusted like code. Keys carry MEMO_VERSION, so rows from other ring3 code are
+    never read. Values stored with persist=False stay in memory. Disk hits
+    are promoted to memory. The file is opened in WAL mode, one connection
+    per process, so concurrent rings and pool workers can share it. Past
+    max_disk_entries the least recently used rows are pruned.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 4096, max_disk_entries: int = 1_000_000):
+        self.path, self.max_entries, self.max_disk_entries = path, max_entries, max_disk_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self.memory_hits = self.disk_hits = self.misses = self.stores = self.evictions = 0
+    
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None: return None
+        if self._conn is None or self._pid != os.getpid():  # a forked child must not reuse the parent's connection
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, value BLOB NOT NULL, used REAL NOT NULL)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+    
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, AnalysisResult): return pickle.dumps(("AnalysisResult", dataclasses.astuple(value)))
+        return pickle.dumps(("value", value))
+    
+    @staticmethod
+    def _decode(blob: bytes):
+        tag, payload = pickle.loads(blob)
+        return AnalysisResult(*payload) if tag == "AnalysisResult" else payload
+    
+    @staticmethod
+    def _copy(value):
+        """Callers may mutate a result's trace; hand out copies so the memo stays intact"""
+        if isinstance(value, AnalysisResult): return dataclasses.replace(value, command_trace=list(value.command_trace))
+        return value
+    
+    def _remember(self, key: str, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False); self.evictions += 1
+    
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key); self.memory_hits += 1
+                return self._copy(self._entries[key])
+            db = self._db()
+            row = db.execute("SELECT value FROM memo WHERE key = ?", (key,)).fetchone() if db else None
+            if row is not None:
+                try:
+                    value = self._decode(row[0])
+                except Exception:  # written by an incompatible version: drop it
+                    db.execute("DELETE FROM memo WHERE key = ?", (key,))
+                else:
+                    db.execute("UPDATE memo SET used = ? WHERE key = ?", (time.time(), key))
+                    self._remember(key, value); self.disk_hits += 1
+                    return self._copy(value)
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, value, persist: bool = True):
+        with self._lock:
+            self._remember(key, self._copy(value))
+            self.stores += 1
+            db = self._db() if persist else None
+            if db is None: return
+            db.execute("INSERT OR REPLACE INTO memo (key, value, used) VALUES (?, ?, ?)", (key, self._encode(value), time.time()))
+            if self.stores % 1024 == 0: self._prune(db)
+    
+    def _prune(self, db: sqlite3.Connection):
+        excess = db.execute("SELECT COUNT(*) FROM memo").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            db.execute("DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY used LIMIT ?)", (excess,))
+    
+    def __len__(self) -> int: return len(self._entries)
+    
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._entries.clear()
+            db = self._db() if disk else None
+            if db: db.execute("DELETE FROM memo")
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid(): self._conn.close()
+            self._conn = None
+    
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            db = self._db()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "stores": self.stores, "evictions": self.evictions, "entries": len(self._entries),
+                    "disk_entries": db.execute("SELECT COUNT(*) FROM memo").fetchone()[0] if db else 0,
+                    "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0}
+
+_shared_memo: Optional[AnalysisMemo] = None
+
+def shared_memo() -> AnalysisMemo:
+    """The process-wide memo every AnalyticalEngine uses unless given its own, persisted to
+    default_memo_path(). RING3_MEMO_PATH names another sqlite file, which must be trusted (its rows
+    are unpickled); set it empty to keep the memo in memory. An unwritable cache directory does too."""
+    global _shared_memo
+    if _shared_memo is None:
+        path = os.environ.get(MEMO_PATH_ENV)
+        if path is None:
+            path = default_memo_path()
+            try: os.makedirs(os.path.dirname(path), exist_ok=True)
+            except OSError: path = None
+            if path and not os.access(os.path.dirname(path), os.W_OK): path = None
+        _shared_memo = AnalysisMemo(path or None)
+    return _shared_memo
+
+# =============================================================================
+# ANALYSIS JOBS
+# =============================================================================
+
+JOB_KINDS = ("binomial", "gamma", "beta", "binomial_via_gamma", "newton", "fixed_point", "binomial_inverse")
+# Jobs that take functions: a key covers their code, closure and defaults but not the globals or
+# helpers they call, so their results are memoized in memory only and never written to disk
+MEMORY_ONLY_KINDS = ("newton", "fixed_point")
+
+def run_job(kind: str, params: Dict, binomial: Optional[BidirectionalBinomial] = None,
+            memo: Optional[AnalysisMemo] = None) -> AnalysisResult:
+    """One analysis job, looked up in and stored to memo when given. params per kind: binomial
+    {n, k}; gamma {z}; beta {a, b}; binomial_via_gamma {n, k}; newton {f, x0, df?, tol?, max_iter?};
+    fixed_point {g, x0, strategy?, tol?, max_iter?}; binomial_inverse {target, n}. All but
+    binomial_inverse also take precision (a PrecisionPolicy or mode name) and rel_error.
+    Functions sent to a process pool must be picklable (module-level, not lambdas)."""
+    key = memo_key(kind, params) if memo is not None else None
+    if key is not None:
+        cached = memo.get(key)
+        if cached is not None: return cached
+    result = _compute_job(kind, params, binomial)
+    if key is not None: memo.put(key, result, persist=kind not in MEMORY_ONLY_KINDS)
+    return result
+
+def _compute_job(kind: str, params: Dict, binomial: Optional[BidirectionalBinomial] = None) -> AnalysisResult:
+    policy = _job_policy(params)
+    if kind == "binomial": return PrecisionAnalysis.binomial(params["n"], params["k"], policy, binomial)
+    if kind == "gamma": return PrecisionAnalysis.gamma(params["z"], policy)
+    if kind == "beta": return PrecisionAnalysis.beta(params["a"], params["b"], policy)
+    if kind == "binomial_via_gamma": return PrecisionAnalysis.binomial_via_gamma(params["n"], params["k"], policy)
+    options = {key: params[key] for key in ("tol", "max_iter") if key in params}
+    if kind == "newton": return NewtonRaphson().solve(params["f"], params.get("df"), params["x0"], precision=policy, **options)
+    if kind == "fixed_point":
+        return FixedPointIterator().iterate(params["g"], params["x0"], strategy=params.get("strategy"), precision=policy, **options)
+    if kind == "binomial_inverse": return NewtonRaphson().find_binomial_inverse(params["target"], params["n"])
+    raise ValueError(f"Unknown job kind '{kind}', expected one of {JOB_KINDS}")
+
+_worker_binomial: Optional[BidirectionalBinomial] = None
+
+def _run_job_chunk(kind: str, chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, AnalysisResult]]:
+    """Process-pool worker: run a chunk of jobs, keeping the caller's indices; the binomial
+    cache lives for the worker's lifetime. Memo lookups and stores stay with the caller."""
+    global _worker_binomial
+    if _worker_binomial is None: _worker_binomial = BidirectionalBinomial()
+    return [(i, _compute_job(kind, params, _worker_binomial)) for i, params in chunk]
+
 class AnalyticalEngine:
-    """Main analysis engine integrating all components"""
+    """Main analysis engine integrating all components.
+    
+    Jobs (see run_job) can be submitted one at a time or mapped over a
+    parameter list. With processes > 1 they run on a process pool in
+    chunks, and results stream back as chunks finish. Otherwise they run
+    in this process. Fewer than PARALLEL_MIN_JOBS jobs always run here,
+    because they cost less than the round trip to a worker. Job results
+    are memoized in `memo`, which defaults to the process-wide
+    shared_memo(). Cached results return at once, and only misses are
+    sent to workers. `precision` is the PrecisionPolicy for jobs that do
+    not set their own.
+    """
+    PARALLEL_MIN_JOBS = 64
     
-    def __init__(self):
+    def __init__(self, processes: int = 0, memo: Optional[AnalysisMemo] = None,
+                 precision: Optional[PrecisionPolicy] = None):
         self.kernel = ReflectologyKernel()
         self.binomial = BidirectionalBinomial()
-        self.gamma = GammaAnalysis()
+        self.gamma_analysis = GammaAnalysis()  # not self.gamma: that is the IDL method
         self.newton = NewtonRaphson()
         self.fixed_point = FixedPointIterator()
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.memo = memo if memo is not None else shared_memo()
+        self.precision = precision
         
         # Register with TX-RX Bus
         bus.register_ring("ring3", self)
     
+    # === Job API ===
+    
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes <= 1: return None
+        if self._pool is None: self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._pool
+    
+    def _params(self, params: Dict) -> Dict:
+        """params with the engine's precision, unless the job sets its own"""
+        if self.precision is None or "precision" in params: return params
+        return {**params, "precision": self.precision}
+    
+    def submit(self, kind: str, params: Dict) -> Future:
+        """Start one job; the future resolves to its AnalysisResult"""
+        if kind not in JOB_KINDS: raise ValueError(f"Unknown job kind '{kind}', expected one of {JOB_KINDS}")
+        params = self._params(params)
+        pool = self._executor()
+        key = memo_key(kind, params)
+        cached = self.memo.get(key) if key is not None and pool is not None else None
+        if pool is not None and cached is None:
+            future = pool.submit(_compute_job, kind, params)
+            if key is not None:
+                persist = kind not in MEMORY_ONLY_KINDS
+                future.add_done_callback(lambda f: f.exception() or self.memo.put(key, f.result(), persist))
+            return future
+        future = Future()
+        try: future.set_result(cached if cached is not None else run_job(kind, params, self.binomial, self.memo))
+        except Exception as e: future.set_exception(e)
+        return future
+    
+    def stream(self, kind: str, param_list: Sequence[Dict], chunksize: Optional[int] = None) -> Iterator[Tuple[int, AnalysisResult]]:
+        """(index, result) pairs in completion order: memo hits first, then the rest a chunk at a time.
+        Repeats of a job within the batch run once."""
+        if kind not in JOB_KINDS: raise ValueError(f"Unknown job kind '{kind}', expected one of {JOB_KINDS}")
+        jobs, keys, repeats, first = [], {}, defaultdict(list), {}
+        for i, params in enumerate(map(self._params, param_list)):
+            key = memo_key(kind, params)
+            if key in first: repeats[first[key]].append(i); continue
+            cached = self.memo.get(key) if key is not None else None
+            if cached is not None: yield i, cached; continue
+            jobs.append((i, params)); keys[i] = key
+            if key is not None: first[key] = i
+        
+        def finished(i: int, result: AnalysisResult):
+            if keys[i] is not None: self.memo.put(keys[i], result, persist=kind not in MEMORY_ONLY_KINDS)
+            yield i, result
+            for j in repeats.get(i, ()): yield j, AnalysisMemo._copy(result)
+        
+        pool = self._executor() if len(jobs) >= self.PARALLEL_MIN_JOBS else None
+        if pool is None:
+            for i, params in jobs: yield from finished(i, _compute_job(kind, params, self.binomial))
+            return
+        chunksize = chunksize or max(1, math.ceil(len(jobs) / (4 * self.processes)))
+        futures = [pool.submit(_run_job_chunk, kind, jobs[i:i + chunksize]) for i in range(0, len(jobs), chunksize)]
+        try:
+            for future in as_completed(futures):
+                for i, result in future.result(): yield from finished(i, result)
+        finally:
+            for future in futures: future.cancel()  # a consumer that stops early drops queued chunks
+    
+    def map(self, kind: str, param_list: Sequence[Dict], chunksize: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """Results in input order, each yielded as soon as everything before it has finished"""
+        ready: Dict[int, AnalysisResult] = {}
+        next_index = 0
+        for i, result in self.stream(kind, param_list, chunksize):
+            ready[i] = result
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+    
+    def shutdown(self):
+        """Stop the worker pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+    
     # === IDL Interface Implementation ===
     
     def bidirectionalBinomial(self, n: int, k: int) -> AnalysisResult:
         """IDL: Promise<AnalysisResult> bidirectionalBinomial(long n, long k);"""
-        fwd, rev = self.binomial.bidirectional(n, k)
-        # Return as AnalysisResult for consistency
-        return AnalysisResult(
-            value=fwd,
-            command_trace=[40, 10], # Duality, Bijection
-            convergence=True,
-            iterations=1,
-            error=0.0
-        )
+        return run_job("binomial", self._params({"n": n, "k": k}), self.binomial, self.memo)
         
     def gamma(self, z: float) -> AnalysisResult:
         """IDL: Promise<AnalysisResult> gamma(double z);"""
-        val = self.gamma.gamma(z)
-        return AnalysisResult(
-            value=val,
-            command_trace=[4], # Fractal Nature (Gamma is extension of factorial)
-            convergence=True,
-            iterations=7, # Lanczos g=7
-            error=1e-10
-        )
+        return run_job("gamma", self._params({"z": z}), memo=self.memo)
+        
+    def bidirectionalBinomialBatch(self, pairs: Sequence) -> List[AnalysisResult]:
+        """IDL: Promise<object> bidirectionalBinomialBatch(sequence<object> pairs); pairs are [n, k] or {n, k}"""
+        return list(self.map("binomial", [p if isinstance(p, dict) else {"n": p[0], "k": p[1]} for p in pairs]))
+        
+    def gammaBatch(self, values: Sequence[float]) -> List[AnalysisResult]:
+        """IDL: Promise<object> gammaBatch(sequence<double> values);"""
+        return list(self.map("gamma", [{"z": z} for z in values]))
+        
+    def analysisBatch(self, kind: str, params: Sequence[Dict]) -> List[AnalysisResult]:
+        """IDL: Promise<object> analysisBatch(DOMString kind, sequence<object> params);"""
+        return list(self.map(kind, params))
+        
+    def setPrecision(self, mode: str, relError: float = PrecisionPolicy.rel_error) -> bool:
+        """IDL: Promise<boolean> setPrecision(DOMString mode, double relError);"""
+        self.precision = PrecisionPolicy(mode, relError)
+        return True
+        
+    def cacheStats(self) -> Dict:
+        """IDL: Promise<object> cacheStats();"""
+        return {"memo": self.memo.stats(), "binomial": self.binomial.cache_stats()}
         
     def verifySymmetry(self, data: Dict) -> bool:
         """IDL: Promise<boolean> verifySymmetry(object data);"""
         # Generic symmetry check based on data type
-        if "n" in data and "k" in data:
-            return self.binomial.validate_symmetry(data["n"], data["k"])
+        if "n" in data:
+            return self.binomial.validate_symmetry(data["n"], data.get("k"))
         return False
 
     # === End IDL Interface ===
@@ -207,10 +2048,27 @@ class AnalyticalEngine:
         
         return omega
     
+    def analyze_stream(self, source, chunk_size: int = 1 << 16, dtype: str = "float64",
+                       reservoir: int = 1024, seed: int = 0) -> OmegaState:
+        """analyze_sequence for sequences too large to hold as a list: source is an iterator, a
+        NumPy array or the path of a raw binary file of dtype values, consumed in chunks. Only
+        StreamingStats.summary() goes into omega, so the commands work on a fixed-size state."""
+        stats = StreamingStats(reservoir, seed)
+        for chunk in iter_chunks(source, chunk_size, dtype): stats.update(chunk)
+        omega = self.kernel.initialize()
+        omega.data.update(stats.summary())
+        
+        # Apply command sequence
+        omega = self.kernel.apply_command(16, omega)  # Entropy
+        omega = self.kernel.apply_command(9, omega)   # Complexity
+        omega = self.kernel.apply_command(13, omega)  # Loss
+        
+        return omega
+    
     def binomial_analysis(self, n: int, k: int) -> Dict:
         """Complete binomial analysis with reflective properties"""
         fwd, rev = self.binomial.bidirectional(n, k)
-        gamma_val = self.gamma.binomial_via_gamma(n, k)
+        gamma_val = self.gamma_analysis.binomial_via_gamma(n, k)
         
         omega = self.kernel.initialize()
         omega.data = {"n": n, "k": k, "binomial": fwd, "reflected": rev, "gamma_form": gamma_val}
@@ -226,9 +2084,9 @@ class AnalyticalEngine:
             "omega_checksum": omega.checksum()[:16]
         }
     
-    def convergence_analysis(self, initial: float, target_fn) -> AnalysisResult:
+    def convergence_analysis(self, initial: float, target_fn, strategy: Optional[str] = None) -> AnalysisResult:
         """Analyze convergence using command-driven iteration"""
-        return self.fixed_point.iterate(target_fn, initial)
+        return self.fixed_point.iterate(target_fn, initial, strategy=strategy)
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -245,21 +2103,74 @@ if __name__ == "__main__":
     print(f"Symmetric: {result['symmetric']}")
     print(f"Gamma form: {result['gamma_form']:.6f}")
     
+    print(f"C(1000,500) exact: {len(str(analyzer.binomial.binomial(1000, 500)))} digits, "
+          f"C(10^18, 123456789) mod 1000003 = {analyzer.binomial.binomial_mod(10**18, 123456789, 1000003)}")
+    print(f"Binomial cache: {analyzer.binomial.cache_stats()}")
+    print(f"Row 10: {analyzer.binomial.row(10)}, row 2000 symmetric: {analyzer.binomial.validate_symmetry(2000)}")
+    print(f"Table to 60 (float64): C(60,30) = {analyzer.binomial.table(60, 'float64')[60, 30]:.6e}"
+          f" ({'numpy' if HAS_NUMPY else 'array'} buffer)")
+    
     # Test gamma function
     print("\n--- Gamma Function ---")
     print(f"Γ(5) = {GammaAnalysis.gamma(5)} (should be 24)")
     print(f"Γ(0.5) = {GammaAnalysis.gamma(0.5):.6f} (should be √π ≈ 1.7725)")
+    print(f"Γ([-2.5, 0.5, 171.5]) = {GammaAnalysis.gamma([-2.5, 0.5, 171.5])}")
+    print(f"lgamma(1e5) = {GammaAnalysis.lgamma(1e5):.6f}, C(1000.5, 500) via Γ = {GammaAnalysis.binomial_via_gamma(1000.5, 500):.6e}")
     
     # Test fixed point iteration
     print("\n--- Fixed Point: Golden Ratio ---")
     phi = analyzer.fixed_point.golden_ratio()
     print(f"φ = {phi.value:.10f} (actual: 1.6180339887...)")
     print(f"Converged: {phi.convergence}, iterations: {phi.iterations}")
+    for strategy in ("aitken", "steffensen", "anderson"):
+        r = analyzer.fixed_point.iterate(math.cos, 1.0, strategy=strategy)
+        print(f"cos fixed point ({strategy}): {r.value:.10f} in {r.evaluations} evaluations, "
+              f"~{r.saved_evaluations} saved vs Picard")
+    
+    # Newton with forward-mode AD: no hand-written derivatives
+    print("\n--- Newton-Raphson (automatic differentiation) ---")
+    root = analyzer.newton.solve(lambda x: x ** 3 - 2 * x - 5, 2.0)
+    print(f"x³ - 2x - 5 = 0: x = {root.value:.12f} in {root.iterations} iterations")
+    inverse = analyzer.newton.find_binomial_inverse(1e100, 1000)
+    print(f"C(1000, k) = 1e100 at k = {inverse.value:.6f}")
+    system = analyzer.newton.solve_system(lambda v: [v[0] ** 2 + v[1] ** 2 - 4, DualMath.exp(v[0]) + v[1] - 1], [1.0, -1.0])
+    print(f"x² + y² = 4, eˣ + y = 1: {[round(v, 10) for v in system.value]} (converged: {system.convergence})")
+    
+    # Batch solvers: one lane per root problem
+    print("\n--- Batch Newton-Raphson: √p for 10,000 p ---")
+    targets = np.linspace(1, 1e4, 10000) if HAS_NUMPY else [1.0 + i for i in range(10000)]
+    batch = analyzer.newton.solve_batch(lambda x, p: x * x - p, lambda x, p: 2 * x, 1.0, params=targets)
+    print(f"Converged lanes: {batch.converged}/{len(batch)}, lane 9999 = {batch[9999].value:.6f}, "
+          f"commands: {batch.command_counts}")
+    
+    # Job API: the same calls fan out over a process pool with AnalyticalEngine(processes=N)
+    print("\n--- Analysis Jobs ---")
+    jobs = list(analyzer.map("binomial", [{"n": 100, "k": k} for k in range(101)]))
+    print(f"{len(jobs)} binomial jobs, C(100,50) = {jobs[50].value}; "
+          f"Γ(6) job = {analyzer.submit('gamma', {'z': 6}).result().value:.6f}")
+    list(analyzer.map("binomial", [{"n": 100, "k": k} for k in range(101)]))  # served by the memo
+    print(f"Memo after a repeat: {analyzer.cacheStats()['memo']}")
+    
+    # Precision policy: auto picks the cheapest arithmetic that meets the requested error
+    print("\n--- Precision Policy ---")
+    for rel_error in (1e-12, 1e-40):
+        r = PrecisionAnalysis.gamma(0.5, PrecisionPolicy("auto", rel_error))
+        print(f"Γ(0.5) to {rel_error:g}: {r.value} ± {r.error:.1e} ({type(r.value).__name__})")
+    r = PrecisionAnalysis.binomial_via_gamma(60, 30, PrecisionPolicy("auto", 1e-20))
+    print(f"C(60,30) via Γ to 1e-20: {r.value} ({type(r.value).__name__}), float64 would be ± "
+          f"{PrecisionAnalysis.binomial_via_gamma(60, 30).error:.1e}")
+    r = analyzer.newton.solve(lambda x: x ** 3 - 2 * x - 5, Interval(2, 3), precision=PrecisionPolicy("interval"))
+    print(f"x³ - 2x - 5 = 0: x ∈ [{r.value.lo!r}, {r.value.hi!r}] (proven: {r.convergence})")
+    r = analyzer.fixed_point.iterate(lambda x: 1 + 1 / x, 1, precision=PrecisionPolicy("fraction", 1e-20))
+    print(f"φ as a fraction: {r.value} after {r.iterations} iterations")
     
     # Test sequence analysis
     print("\n--- Sequence Analysis ---")
     seq_result = analyzer.analyze_sequence([1, 2, 3, 5, 8, 13, 21])
     print(f"Mean: {seq_result.data['mean']:.2f}")
     print(f"Entropy: {seq_result.data.get('_entropy', 0):.4f}")
+    streamed = analyzer.analyze_stream(math.sin(i / 100) for i in range(1_000_000))
+    print(f"Streamed 1,000,000 values: mean {streamed.data['mean']:.6f}, std {streamed.data['std']:.6f}, "
+          f"median ≈ {streamed.data['quantiles']['0.5']:.3f}, state size {streamed.data['_complexity']} chars")
     
     print("\n✓ All analytical engine components working")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Ring 3 numerics against independent references: math.gamma, math.lgamma,
+math.comb and exact Fraction arithmetic.
+
+Run: python test_ring3_numerics.py   (or pytest)
+"""
+
+import math
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from pathlib import Path
+
+rings_root = Path(__file__).resolve().parent.parent
+for ring in ['ring0-math-kernel', 'ring3-analysis-logic']:
+    sys.path.insert(0, str(rings_root / ring))
+
+import ring3_analysis
+from ring0_kernel import bus
+from ring3_analysis import (AnalyticalEngine, AnalysisMemo, MEMO_PATH_ENV, default_memo_path, shared_memo, DecimalMath, DualMath, Dual, GammaAnalysis, Interval, NewtonRaphson,
+                            PrecisionAnalysis, PrecisionPolicy, FLOAT64_EPS, FLOAT64_GAMMA_REL_ERROR,
+                            FLOAT64_LGAMMA_REL_ERROR)
+
+GAMMA_POINTS = [0.001, 0.5, 1.0, 1.5, 2.5, 3.7, 10.0, 25.25, 100.1, 170.5, -0.5, -1.5, -2.999999, -40.3, -170.5]
+COMB_POINTS = [(10, 3), (20, 10), (50, 25), (100, 1), (170, 85), (1000, 3)]
+
+def close(a, b, rel):
+    return abs(a - b) <= rel * abs(b)
+
+def lgamma_bound(z):
+    """Absolute error bound of log|Γ(z)|, and so the relative error of exp(lgamma) (the array path)"""
+    return FLOAT64_LGAMMA_REL_ERROR * max(1.0, abs(math.lgamma(z))) + 4 * FLOAT64_EPS
+
+def test_gamma_against_math():
+    for z in GAMMA_POINTS:
+        assert close(GammaAnalysis.gamma(z), math.gamma(z), FLOAT64_GAMMA_REL_ERROR), z
+        assert abs(GammaAnalysis.lgamma(z) - math.lgamma(z)) <= lgamma_bound(z), z
+    assert all(math.isnan(GammaAnalysis.gamma(z)) for z in (0.0, -1.0, -7.0))
+    assert all(close(g, math.gamma(z), lgamma_bound(z)) for g, z in zip(GammaAnalysis.gamma(GAMMA_POINTS), GAMMA_POINTS))
+    print("✅ Γ and log|Γ| match math.gamma and math.lgamma, scalars and arrays")
+
+def test_beta_and_binomial_against_math():
+    for a, b in ((0.5, 0.5), (2.5, 3.5), (10.0, 20.0), (-0.5, 3.0)):
+        assert close(GammaAnalysis.beta(a, b), math.gamma(a) * math.gamma(b) / math.gamma(a + b), 1e-12), (a, b)
+    for n, k in COMB_POINTS:
+        assert close(GammaAnalysis.binomial_via_gamma(n, k), math.comb(n, k), 1e-11), (n, k)
+    assert math.isfinite(GammaAnalysis.binomial_via_gamma(1000.5, 500))
+    print("✅ B(a,b) and C(n,k) via Γ match math.gamma and math.comb")
+
+def test_dual_derivatives():
+    x = 0.7
+    for fn, d in ((DualMath.sin, math.cos(x)), (DualMath.exp, math.exp(x)), (DualMath.log, 1 / x),
+                  (DualMath.sqrt, 0.5 / math.sqrt(x)), (DualMath.atan, 1 / (1 + x * x)),
+                  (lambda v: v * v * v - 2 * v, 3 * x * x - 2), (lambda v: 1 / (1 + v), -1 / (1 + x) ** 2)):
+        assert close(Dual.parts(fn(Dual(x, 1.0)))[1], d, 1e-14)
+    h = 1e-6  # ψ = (log Γ)' against a central difference of math.lgamma
+    for z in (0.3, 2.5, 12.0):
+        assert close(Dual.parts(DualMath.lgamma(Dual(z, 1.0)))[1], (math.lgamma(z + h) - math.lgamma(z - h)) / (2 * h), 1e-7)
+    print("✅ forward-mode derivatives match the analytic ones")
+
+def test_newton_with_ad():
+    newton = NewtonRaphson()
+    f = lambda v: v * v * v - 2 * v - 5
+    ad, explicit = newton.solve(f, 2.0), newton.solve(f, lambda v: 3 * v * v - 2, 2.0)
+    assert ad.convergence and close(ad.value, explicit.value, 1e-15) and abs(f(ad.value)) < 1e-10
+    system = newton.solve_system(lambda p: [p[0] * p[0] + p[1] * p[1] - 4, p[0] - p[1]], [1.0, 0.5])
+    assert system.convergence and all(close(v, math.sqrt(2), 1e-12) for v in system.value)
+    k = newton.find_binomial_inverse(1e100, 1000)
+    assert k.convergence and close(math.lgamma(1001) - math.lgamma(k.value + 1) - math.lgamma(1001 - k.value), 100 * math.log(10), 1e-12)
+    print("✅ Newton with AD, multivariate Newton and the binomial inverse converge")
+
+def test_fraction_precision_is_exact():
+    exact = PrecisionPolicy("fraction")
+    for n, k in COMB_POINTS:
+        assert PrecisionAnalysis.binomial(n, k, exact).value == math.comb(n, k)
+        assert PrecisionAnalysis.binomial_via_gamma(n, k, exact).value == Fraction(math.comb(n, k))
+    assert PrecisionAnalysis.gamma(12, exact).value == Fraction(math.factorial(11))
+    assert PrecisionAnalysis.beta(3, 4, exact).value == Fraction(math.factorial(2) * math.factorial(3), math.factorial(6))
+    root = NewtonRaphson().solve(lambda v: v * v - 2, Fraction(3, 2), precision=PrecisionPolicy("fraction", 1e-30))
+    assert isinstance(root.value, Fraction) and abs(root.value * root.value - 2) < Fraction(1, 10 ** 29)
+    print("✅ fraction precision is exact against math.comb and factorials")
+
+def test_decimal_precision():
+    policy = PrecisionPolicy("decimal", 1e-40)
+    with localcontext() as ctx:
+        ctx.prec = 60
+        sqrt_pi = DecimalMath.pi().sqrt()
+    r = PrecisionAnalysis.gamma(0.5, policy)
+    assert abs(r.value - sqrt_pi) <= abs(sqrt_pi) * Decimal("1e-40") and r.error <= 1e-39
+    assert PrecisionAnalysis.gamma(30, policy).value == math.factorial(29)
+    assert PrecisionAnalysis.binomial_via_gamma(100, 50, policy).value == math.comb(100, 50)
+    start = time.perf_counter()
+    big = PrecisionAnalysis.gamma(1e7, PrecisionPolicy("decimal"))  # Stirling, not a 65-million-digit factorial
+    assert time.perf_counter() - start < 5
+    assert close(float(big.value.log10()), math.lgamma(1e7) / math.log(10), 1e-14)
+    print("✅ decimal precision meets rel_error; Γ(1e7) takes the Stirling path")
+
+def test_interval_precision_encloses():
+    policy = PrecisionPolicy("interval")
+    for z in GAMMA_POINTS:
+        r = PrecisionAnalysis.gamma(z, policy)
+        assert isinstance(r.value, Interval) and r.convergence
+        assert close(r.value.mid, math.gamma(z), FLOAT64_GAMMA_REL_ERROR) and r.value.width <= abs(r.value.mid) * 1e-15, z
+    for z in (1, 5, 21, 170):
+        assert Fraction(math.factorial(z - 1)) in PrecisionAnalysis.gamma(z, policy).value
+    for n, k in COMB_POINTS:
+        assert math.comb(n, k) in PrecisionAnalysis.binomial_via_gamma(n, k, policy).value
+    beta = PrecisionAnalysis.beta(3, 4, policy).value
+    assert Fraction(1, 60) in beta
+    with localcontext() as ctx:  # Γ(0.5)² = π, from DecimalMath rather than the Γ code
+        ctx.prec = 50
+        pi = DecimalMath.pi()
+    half = PrecisionAnalysis.gamma(0.5, policy).value
+    assert Fraction(half.lo) ** 2 <= Fraction(pi) <= Fraction(half.hi) ** 2
+    assert not PrecisionAnalysis.gamma(-3.0, policy).convergence
+    assert PrecisionAnalysis.gamma(200.0, policy).value.hi == math.inf
+    print("✅ interval Γ, B and C(n,k) enclose the exact values")
+
+def test_set_precision_over_the_bus():
+    engine = AnalyticalEngine()
+    assert bus.tx("ring7", "ring3", "setPrecision", mode="auto", relError=1e-20)
+    assert engine.precision == PrecisionPolicy("auto", 1e-20)
+    print("✅ setPrecision takes the IDL's relError")
+
+def test_gamma_over_the_bus():
+    engine = AnalyticalEngine()
+    assert close(bus.tx("ring7", "ring3", "gamma", z=5).value, 24.0, FLOAT64_GAMMA_REL_ERROR)
+    assert close(engine.binomial_analysis(10, 3)["gamma_form"], 120, 1e-12)
+    print("✅ the gamma IDL method answers over the bus")
+
+def test_shared_memo_persists_per_user():
+    saved = (ring3_analysis._shared_memo, os.environ.get("XDG_CACHE_HOME"), os.environ.pop(MEMO_PATH_ENV, None))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["XDG_CACHE_HOME"], ring3_analysis._shared_memo = tmp, None
+            memo = shared_memo()
+            assert memo.path == default_memo_path() == os.path.join(tmp, "madlad", "ring3-memo.sqlite")
+            AnalyticalEngine().gamma(7); memo.close()
+            reread = AnalysisMemo(memo.path)
+            assert reread.stats()["disk_entries"] >= 1; reread.close()
+            os.environ[MEMO_PATH_ENV], ring3_analysis._shared_memo = "", None
+            assert shared_memo().path is None  # an empty override keeps the memo in memory
+    finally:
+        ring3_analysis._shared_memo = saved[0]
+        for name, value in (("XDG_CACHE_HOME", saved[1]), (MEMO_PATH_ENV, saved[2])):
+            if value is None: os.environ.pop(name, None)
+            else: os.environ[name] = value
+    print("✅ the shared memo persists to a per-user cache file unless RING3_MEMO_PATH overrides it")
+
+if __name__ == "__main__":
+    test_gamma_against_math()
+    test_beta_and_binomial_against_math()
+    test_dual_derivatives()
+    test_newton_with_ad()
+    test_fraction_precision_is_exact()
+    test_decimal_precision()
+    test_interval_precision_encloses()
+    test_set_precision_over_the_bus()
+    test_gamma_over_the_bus()
+    test_shared_memo_persists_per_user()
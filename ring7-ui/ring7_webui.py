@@ -18,6 +18,8 @@ import sys
 import os
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
 
 # Try Tkinter (may not be available in all environments)
 try:
@@ -32,6 +34,12 @@ from ring1_vm import MadladVM, OpCode, Instruction
 from ring2_compiler import MadladCompiler
 from ring6_extension import WebscapeWanderer, build_sample_omega
 
+def _json_value(value):
+    """A ring3 result value as JSON can carry it: Decimal and Fraction as exact strings, an Interval as [lo, hi]"""
+    if isinstance(value, (Decimal, Fraction)): return str(value)
+    if hasattr(value, "lo") and hasattr(value, "hi"): return [value.lo, value.hi]
+    return value
+
 # =============================================================================
 # WEB-BASED GUI (Always Available)
 # =============================================================================
@@ -90,7 +98,7 @@ class ReflectologyWebGUI:
                     "cost": round(self.omega.cost, 6), "bytecode_preview": [str(b) for b in bytecode[:5]]}
         except Exception as e:
             self.log(f"Compile error: {e}")
-            return {"ok": False, "error": str(e)}
+            return {"ok": False, "error": str(e), "errors": [str(d) for d in self.compiler.diagnose(source)]}
     
     def get_omega_data(self) -> Dict:
         """Get current omega state"""
@@ -434,7 +442,9 @@ print(z)</textarea>
                     <div>Result: <strong>${{result.result}}</strong></div>
                     <div>Ω cost after: ${{result.cost}}</div>`;
             }} else {{
-                el.innerHTML = `<div style="color: #f44336;">✗ Error: ${{result.error}}</div>`;
+                el.innerHTML = result.errors?.length
+                    ? `<div style="color: #f44336;">✗ ${{result.errors.length}} error(s):</div><pre>${{result.errors.join('\\n')}}</pre>`
+                    : `<div style="color: #f44336;">✗ Error: ${{result.error}}</div>`;
             }}
             updateState();
             addLog(result.ok ? `Executed ${{result.instructions}} instructions` : `Compile error`);
@@ -448,7 +458,9 @@ print(z)</textarea>
                 el.innerHTML = `<div style="color: #2196F3;">Bytecode (${{result.bytecode.length}} instructions):</div>
                     <pre>${{result.bytecode.join('\\n')}}</pre>`;
             }} else {{
-                el.innerHTML = `<div style="color: #f44336;">✗ Error: ${{result.error}}</div>`;
+                el.innerHTML = result.errors?.length
+                    ? `<div style="color: #f44336;">✗ ${{result.errors.length}} error(s):</div><pre>${{result.errors.join('\\n')}}</pre>`
+                    : `<div style="color: #f44336;">✗ Error: ${{result.error}}</div>`;
             }}
             addLog(`Compiled to ${{result.bytecode?.length || 0}} instructions`);
         }}
@@ -686,7 +698,7 @@ print(z)</textarea>
                         bytecode = gui.compiler.compile(source)
                         result = {"ok": True, "bytecode": [str(b) for b in bytecode]}
                     except Exception as e:
-                        result = {"ok": False, "error": str(e)}
+                        result = {"ok": False, "error": str(e), "errors": [str(d) for d in gui.compiler.diagnose(source)]}
                 elif endpoint == 'parse':
                     # Parse MADLAD code
                     source = unquote(params.get('source', [''])[0])
@@ -726,8 +738,7 @@ print(z)</textarea>
                     x0 = float(params.get('x0', ['2.0'])[0])
                     try:
                         from ring3_analysis import NewtonRaphson
-                        nr = NewtonRaphson(lambda x: x*x - 2, lambda x: 2*x)
-                        res = nr.solve(x0)
+                        res = NewtonRaphson().solve(lambda x: x*x - 2, x0)  # derivative by forward AD
                         result = {"ok": True, "value": round(res.value, 10), "iterations": res.iterations, "converged": res.convergence}
                         gui.log(f"Newton-Raphson: √2 ≈ {res.value}")
                     except Exception as e:
@@ -736,19 +747,25 @@ print(z)</textarea>
                     x0 = float(params.get('x0', ['1.0'])[0])
                     try:
                         from ring3_analysis import FixedPointIterator
-                        fpi = FixedPointIterator(lambda x: (x + 2/x) / 2)  # Converges to sqrt(2)
-                        res = fpi.iterate(x0)
+                        res = FixedPointIterator().iterate(lambda x: (x + 2/x) / 2, x0)  # Converges to sqrt(2)
                         result = {"ok": True, "value": round(res.value, 10), "iterations": res.iterations, "converged": res.convergence}
                         gui.log(f"Fixed-point: {res.value}")
                     except Exception as e:
                         result = {"ok": False, "error": str(e)}
                 elif endpoint == 'analysis/binomial':
                     n = int(params.get('n', ['10'])[0])
-                    k = int(params.get('k', ['5'])[0])
+                    k = params.get('k', ['5'])[0]  # one k, or a comma-separated list run as one batch
                     try:
-                        from ring3_analysis import BidirectionalBinomial
-                        bb = BidirectionalBinomial()
-                        val = bb.compute(n, k)
+                        ks = [int(v) for v in k.split(',')]
+                        if "ring3" in bus.handlers:
+                            vals = [r.value for r in bus.tx("ring7", "ring3", "bidirectionalBinomialBatch",
+                                                            pairs=[[n, kk] for kk in ks])]
+                        else:
+                            from ring3_analysis import BidirectionalBinomial
+                            bb = BidirectionalBinomial()
+                            vals = [bb.binomial(n, kk) for kk in ks]
+                        vals = [_json_value(v) for v in vals]  # setPrecision may make them Decimal or Interval
+                        val = vals[0] if len(vals) == 1 else vals
                         result = {"ok": True, "value": val}
                         gui.log(f"C({n},{k}) = {val}")
                     except Exception as e: